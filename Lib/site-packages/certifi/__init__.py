@@ -1,4 +1,4 @@
-from .core import contents, where
+from .core import cadata, contents, load_into, where
 
-__all__ = ["contents", "where"]
+__all__ = ["cadata", "contents", "load_into", "where"]
 __version__ = "2025.10.05"
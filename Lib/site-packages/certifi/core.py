@@ -4,8 +4,17 @@ certifi.py
 
 This module returns the installation location of cacert.pem or its contents.
 """
+import base64
+import hashlib
+import os
+import re
 import sys
 import atexit
+import threading
+from typing import TYPE_CHECKING, Optional
+
+if TYPE_CHECKING:
+    import ssl
 
 def exit_cacert_ctx() -> None:
     _CACERT_CTX.__exit__(None, None, None)  # type: ignore[union-attr]
@@ -81,3 +90,63 @@ else:
 
     def contents() -> str:
         return read_text("certifi", "cacert.pem", encoding="ascii")
+
+
+_PEM_CERT_RE = re.compile(
+    r"-----BEGIN CERTIFICATE-----(.+?)-----END CERTIFICATE-----", re.DOTALL
+)
+
+_CADATA: Optional[bytes] = None
+_CADATA_LOCK = threading.Lock()
+
+
+def _pem_to_der(pem: str) -> bytes:
+    return b"".join(base64.b64decode(cert) for cert in _PEM_CERT_RE.findall(pem))
+
+
+def _cached_der(pem: str, cache_dir: str) -> bytes:
+    digest = hashlib.sha256(pem.encode("ascii")).hexdigest()
+    path = os.path.join(cache_dir, f"cacert-{digest[:32]}.der")
+    try:
+        with open(path, "rb") as f:
+            return f.read()
+    except OSError:
+        pass
+
+    der = _pem_to_der(pem)
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(der)
+        os.replace(tmp_path, path)
+    except OSError:
+        pass
+    return der
+
+
+def cadata(cache_dir: Optional[str] = None) -> bytes:
+    """
+    The certificates of the bundle in DER form, concatenated, as accepted by
+    ``SSLContext.load_verify_locations(cadata=...)``. The bundle is read and
+    converted once per process. With ``cache_dir``, the conversion is also
+    stored there, under the hash of the bundle, and reused by the next
+    processes.
+    """
+    global _CADATA
+    with _CADATA_LOCK:
+        if _CADATA is None:
+            pem = contents()
+            if cache_dir is not None:
+                _CADATA = _cached_der(pem, cache_dir)
+            else:
+                _CADATA = _pem_to_der(pem)
+        return _CADATA
+
+
+def load_into(context: "ssl.SSLContext", cache_dir: Optional[str] = None) -> None:
+    """
+    Loads the bundle into ``context`` as trusted CA certificates, from
+    :func:`cadata` rather than by parsing the PEM file at :func:`where`.
+    """
+    context.load_verify_locations(cadata=cadata(cache_dir))
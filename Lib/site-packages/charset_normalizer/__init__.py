@@ -23,7 +23,14 @@ from __future__ import annotations
 
 import logging
 
-from .api import from_bytes, from_fp, from_path, is_binary
+from .api import (
+    IncrementalDetector,
+    from_bytes,
+    from_fp,
+    from_path,
+    from_stream,
+    is_binary,
+)
 from .legacy import detect
 from .models import CharsetMatch, CharsetMatches
 from .utils import set_logging_handler
@@ -33,10 +40,12 @@ __all__ = (
     "from_fp",
     "from_path",
     "from_bytes",
+    "from_stream",
     "is_binary",
     "detect",
     "CharsetMatch",
     "CharsetMatches",
+    "IncrementalDetector",
     "__version__",
     "VERSION",
     "set_logging_handler",
@@ -1,8 +1,9 @@
 from __future__ import annotations
 
 import logging
+from codecs import getincrementaldecoder
 from os import PathLike
-from typing import BinaryIO
+from typing import BinaryIO, Iterable
 
 from .cd import (
     coherence_ratio,
@@ -603,6 +604,244 @@ def from_path(
         )
 
 
+class IncrementalDetector:
+    """
+    Detect the encoding of a payload that arrives in chunks, without holding on to more than `window` bytes.
+    Feed chunks until feed() returns True (or the input ends), then call close() to get the matches.
+    The detection settles early on a BOM/SIG, on a declared encoding that decodes the data seen so far with
+    (almost) no mess, or once `window` bytes were decoded as clean UTF-8. Otherwise, the buffered window is
+    handed over to from_bytes, which gives the same verdict as before for payloads that fit in it.
+    """
+
+    def __init__(
+        self,
+        window: int = 65536,
+        steps: int = 5,
+        chunk_size: int = 512,
+        threshold: float = 0.20,
+        cp_isolation: list[str] | None = None,
+        cp_exclusion: list[str] | None = None,
+        preemptive_behaviour: bool = True,
+        explain: bool = False,
+        language_threshold: float = 0.1,
+        enable_fallback: bool = True,
+    ):
+        self.window: int = window
+        self._options = (
+            steps,
+            chunk_size,
+            threshold,
+            cp_isolation,
+            cp_exclusion,
+            preemptive_behaviour,
+            explain,
+            language_threshold,
+            enable_fallback,
+        )
+        self._isolation: list[str] = [
+            iana_name(cp, False) for cp in cp_isolation or []
+        ]
+        self._exclusion: list[str] = [
+            iana_name(cp, False) for cp in cp_exclusion or []
+        ]
+
+        self._buffer: bytearray = bytearray()
+        self._sig_checked: bool = False
+        # Length of the buffer the last time we looked for a declaration, None once given up.
+        self._declaration_checked: int | None = 0
+        self._utf8_decoder = getincrementaldecoder("utf_8")()
+        self._utf8_clean: bool = True
+        self._result: CharsetMatches | None = None
+
+    @property
+    def done(self) -> bool:
+        return self._result is not None
+
+    def feed(self, chunk: bytes | bytearray) -> bool:
+        """
+        Add the next chunk of the payload. Return True as soon as the detection is settled, further chunks
+        are then ignored.
+        """
+        if self._result is not None:
+            return True
+
+        chunk = chunk[: self.window - len(self._buffer)]
+        self._buffer += chunk
+
+        if self._utf8_clean and chunk:
+            try:
+                self._utf8_decoder.decode(chunk)
+            except UnicodeDecodeError:
+                self._utf8_clean = False
+
+        window_full: bool = len(self._buffer) >= self.window
+
+        if not self._sig_checked and (len(self._buffer) >= 5 or window_full):
+            self._sig_checked = True
+            if self._settle_on_sig():
+                return True
+
+        if self._declaration_checked is not None and (
+            window_full
+            or len(self._buffer) - self._declaration_checked >= 512
+            or len(self._buffer) >= 8192
+        ):
+            if self._settle_on_declaration():
+                return True
+
+        if window_full:
+            if self._utf8_clean and self._allowed("utf_8"):
+                logger.debug(
+                    "Encoding detection: %i bytes decoded as clean utf_8, stop here.",
+                    len(self._buffer),
+                )
+                self._settle("utf_8", False)
+            else:
+                self._result = from_bytes(bytes(self._buffer), *self._options)
+            return True
+
+        return False
+
+    def close(self) -> CharsetMatches:
+        """
+        Signal the end of the payload (if it came before the detection settled) and return the matches.
+        """
+        if self._result is None:
+            self._result = from_bytes(bytes(self._buffer), *self._options)
+        return self._result
+
+    def _allowed(self, encoding: str) -> bool:
+        if self._isolation and encoding not in self._isolation:
+            return False
+        return encoding not in self._exclusion
+
+    def _settle(
+        self,
+        encoding: str,
+        has_sig_or_bom: bool,
+        offset: int = 0,
+        mess: float = 0.0,
+        declared: str | None = None,
+    ) -> bool:
+        # The window may end in the middle of a character, leave it out of the decoded payload.
+        decoded: str = getincrementaldecoder(encoding)(errors="ignore").decode(
+            bytes(self._buffer[offset:])
+        )
+        self._result = CharsetMatches(
+            [
+                CharsetMatch(
+                    bytes(self._buffer),
+                    encoding,
+                    mess,
+                    has_sig_or_bom,
+                    [],
+                    decoded,
+                    preemptive_declaration=declared,
+                )
+            ]
+        )
+        return True
+
+    def _settle_on_sig(self) -> bool:
+        sig_encoding, sig_payload = identify_sig_or_bom(bytes(self._buffer[:5]))
+
+        if sig_encoding is None or not self._allowed(sig_encoding):
+            return False
+
+        logger.debug(
+            "Encoding detection: %s is most likely the one as we detected a BOM or SIG within "
+            "the beginning of the stream.",
+            sig_encoding,
+        )
+        return self._settle(
+            sig_encoding,
+            True,
+            len(sig_payload) if should_strip_sig_or_bom(sig_encoding) else 0,
+        )
+
+    def _settle_on_declaration(self) -> bool:
+        buffered: bytes = bytes(self._buffer)
+        specified_encoding: str | None = any_specified_encoding(buffered)
+
+        if specified_encoding is None:
+            self._declaration_checked = (
+                None if len(buffered) >= 8192 else len(buffered)
+            )
+            return False
+
+        # Whatever the outcome, the declaration is not going to change.
+        self._declaration_checked = None
+
+        if not self._allowed(specified_encoding):
+            return False
+
+        try:
+            decoded: str = getincrementaldecoder(specified_encoding)().decode(buffered)
+        except (UnicodeDecodeError, LookupError):
+            logger.debug(
+                "Encoding detection: declared %s does not fit the beginning of the stream.",
+                specified_encoding,
+            )
+            return False
+
+        mean_mess_ratio: float = mess_ratio(decoded, 0.1)
+
+        if mean_mess_ratio >= 0.1:
+            return False
+
+        logger.debug(
+            "Encoding detection: %s is most likely the one as it was declared and decodes cleanly.",
+            specified_encoding,
+        )
+        return self._settle(
+            specified_encoding, False, mess=mean_mess_ratio, declared=specified_encoding
+        )
+
+
+def from_stream(
+    stream: BinaryIO | Iterable[bytes],
+    window: int = 65536,
+    steps: int = 5,
+    chunk_size: int = 512,
+    threshold: float = 0.20,
+    cp_isolation: list[str] | None = None,
+    cp_exclusion: list[str] | None = None,
+    preemptive_behaviour: bool = True,
+    explain: bool = False,
+    language_threshold: float = 0.1,
+    enable_fallback: bool = True,
+) -> CharsetMatches:
+    """
+    Same thing than the function from_bytes but consuming a file pointer or an iterable of bytes chunks
+    only up to the point where the detection settles, and never more than `window` bytes of it.
+    See IncrementalDetector. Will not close the file pointer.
+    """
+    detector = IncrementalDetector(
+        window,
+        steps,
+        chunk_size,
+        threshold,
+        cp_isolation,
+        cp_exclusion,
+        preemptive_behaviour,
+        explain,
+        language_threshold,
+        enable_fallback,
+    )
+
+    chunks: Iterable[bytes] = (
+        iter(lambda: stream.read(8192), b"")  # type: ignore[union-attr]
+        if hasattr(stream, "read")
+        else stream
+    )
+
+    for chunk in chunks:
+        if detector.feed(chunk):
+            break
+
+    return detector.close()
+
+
 def is_binary(
     fp_or_path_or_payload: PathLike | str | BinaryIO | bytes,  # type: ignore[type-arg]
     steps: int = 5,
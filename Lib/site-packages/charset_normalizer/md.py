@@ -7,6 +7,7 @@ from .constant import (
     COMMON_SAFE_ASCII_CHARACTERS,
     TRACE,
     UNICODE_SECONDARY_RANGE_KEYWORD,
+    UTF8_MAXIMAL_ALLOCATION,
 )
 from .utils import (
     is_accentuated,
@@ -29,6 +30,35 @@ from .utils import (
     is_cjk_uncommon,
 )
 
+# Character classes used by the single pass engine, see _character_class().
+_PRINTABLE = 1
+_ALPHA = 1 << 1
+_SPACE = 1 << 2
+_DIGIT = 1 << 3
+_UPPER = 1 << 4
+_LOWER = 1 << 5
+_ASCII = 1 << 6
+_COMMON_SAFE = 1 << 7
+_PUNCTUATION = 1 << 8
+_SYMBOL = 1 << 9
+_EMOTICON = 1 << 10
+_ACCENTUATED = 1 << 11
+_LATIN = 1 << 12
+_UNPRINTABLE = 1 << 13
+_GLYPH = 1 << 14  # CJK, Hangul, Katakana, Hiragana or Thai
+_SEPARATOR = 1 << 15
+_CASE_VARIABLE = 1 << 16
+_CJK = 1 << 17
+_CJK_UNCOMMON = 1 << 18
+_ARABIC = 1 << 19
+_ARABIC_ISOLATED_FORM = 1 << 20
+# Combinations of the above tested as one bit in the hot loop.
+_PUNCTUATION_SYMBOL = 1 << 21  # counted as a symbol by the punctuation check
+_WORD_SYMBOL = 1 << 22  # makes the current word bad for the weird word check
+_RANGE_BREAK = 1 << 23  # space, punctuation or common safe ASCII
+_WORD_BREAK = 1 << 24  # space, punctuation or separator
+_CASED_LETTER = 1 << 25  # alphabetic and case variable
+
 
 class MessDetectorPlugin:
     """
@@ -579,28 +609,118 @@ def is_suspiciously_successive_range(
     return True
 
 
-@lru_cache(maxsize=2048)
-def mess_ratio(
-    decoded_sequence: str, maximum_threshold: float = 0.2, debug: bool = False
-) -> float:
+def _character_class(character: str) -> tuple[int, str | None]:
     """
-    Compute a mess ratio given a decoded bytes sequence. The maximum threshold does stop the computation earlier.
+    Classify a character once for every check made by the built-in detectors.
+    Returns the class bits and the Unicode range of the character.
     """
+    flags: int = 0
+    if character.isprintable():
+        flags |= _PRINTABLE
+    if character.isalpha():
+        flags |= _ALPHA
+    if character.isspace():
+        flags |= _SPACE
+    if character.isdigit():
+        flags |= _DIGIT
+    if character.isupper():
+        flags |= _UPPER
+    if character.islower():
+        flags |= _LOWER
+    if character.isascii():
+        flags |= _ASCII
+    if character in COMMON_SAFE_ASCII_CHARACTERS:
+        flags |= _COMMON_SAFE
+    if is_punctuation(character):
+        flags |= _PUNCTUATION
+    if is_symbol(character):
+        flags |= _SYMBOL
+    if is_emoticon(character):
+        flags |= _EMOTICON
+    if is_accentuated(character):
+        flags |= _ACCENTUATED
+    if is_latin(character):
+        flags |= _LATIN
+    if is_unprintable(character):
+        flags |= _UNPRINTABLE
+    if (
+        is_cjk(character)
+        or is_hangul(character)
+        or is_katakana(character)
+        or is_hiragana(character)
+        or is_thai(character)
+    ):
+        flags |= _GLYPH
+    if is_separator(character):
+        flags |= _SEPARATOR
+    if is_case_variable(character):
+        flags |= _CASE_VARIABLE
+    if is_cjk(character):
+        flags |= _CJK
+        if is_cjk_uncommon(character):
+            flags |= _CJK_UNCOMMON
+    if is_arabic(character):
+        flags |= _ARABIC
+        if is_arabic_isolated_form(character):
+            flags |= _ARABIC_ISOLATED_FORM
+
+    if not flags & (_DIGIT | _EMOTICON) and flags & _SYMBOL:
+        flags |= _PUNCTUATION_SYMBOL
+    if (
+        character not in {"<", ">", "-", "=", "~", "|", "_"}
+        and not flags & _DIGIT
+        and flags & _SYMBOL
+    ):
+        flags |= _WORD_SYMBOL
+    if flags & (_SPACE | _PUNCTUATION | _COMMON_SAFE):
+        flags |= _RANGE_BREAK
+    if flags & (_SPACE | _PUNCTUATION | _SEPARATOR):
+        flags |= _WORD_BREAK
+    if flags & _ALPHA and flags & _CASE_VARIABLE:
+        flags |= _CASED_LETTER
 
-    detectors: list[MessDetectorPlugin] = [
-        md_class() for md_class in MessDetectorPlugin.__subclasses__()
-    ]
+    return flags, unicode_range(character)
 
-    length: int = len(decoded_sequence) + 1
 
-    mean_mess_ratio: float = 0.0
+class _CharacterClasses(dict):  # type: ignore[type-arg]
+    """
+    Table of the classes of every character seen so far, filled on lookup.
+    """
 
-    if length < 512:
-        intermediary_mean_mess_ratio_calc: int = 32
-    elif length <= 1024:
-        intermediary_mean_mess_ratio_calc = 64
-    else:
-        intermediary_mean_mess_ratio_calc = 128
+    def __missing__(self, character: str) -> tuple[int, str | None]:
+        if len(self) >= UTF8_MAXIMAL_ALLOCATION:
+            self.clear()
+        classified = self[character] = _character_class(character)
+        return classified
+
+
+_CHARACTER_CLASSES: dict[str, tuple[int, str | None]] = _CharacterClasses()
+
+
+_BUILTIN_DETECTORS: tuple[type, ...] = (
+    TooManySymbolOrPunctuationPlugin,
+    TooManyAccentuatedPlugin,
+    UnprintablePlugin,
+    SuspiciousDuplicateAccentPlugin,
+    SuspiciousRange,
+    SuperWeirdWordPlugin,
+    CjkUncommonPlugin,
+    ArchaicUpperLowerPlugin,
+    ArabicIsolatedFormPlugin,
+)
+
+
+def _plugins_mess_ratio(
+    decoded_sequence: str,
+    maximum_threshold: float,
+    detectors: list[MessDetectorPlugin],
+    intermediary_mean_mess_ratio_calc: int,
+) -> float:
+    """
+    Feed every character to every detector, one call at a time.
+    """
+    length: int = len(decoded_sequence) + 1
+    mean_mess_ratio: float = 0.0
 
     for character, index in zip(decoded_sequence + "\n", range(length)):
         for detector in detectors:
@@ -615,6 +735,322 @@ def mess_ratio(
             if mean_mess_ratio >= maximum_threshold:
                 break
 
+    return mean_mess_ratio
+
+
+def _single_pass_mess_ratio(
+    decoded_sequence: str,
+    maximum_threshold: float,
+    intermediary_mean_mess_ratio_calc: int,
+) -> float:
+    """
+    Same computation as the built-in detectors fed by _plugins_mess_ratio(),
+    with their states kept in locals and every character classified once
+    through a table instead of going through each detector.
+    The ratios are summed in detector order so the results are identical.
+    """
+    classes = _CHARACTER_CLASSES
+
+    # TooManySymbolOrPunctuationPlugin
+    sp_character_count: int = 0
+    sp_punctuation_count: int = 0
+    sp_symbol_count: int = 0
+    sp_last_printable_char: str | None = None
+    # TooManyAccentuatedPlugin
+    ta_character_count: int = 0
+    ta_accentuated_count: int = 0
+    # UnprintablePlugin
+    up_unprintable_count: int = 0
+    # SuspiciousDuplicateAccentPlugin
+    da_character_count: int = 0
+    da_successive_count: int = 0
+    da_last_latin_character: str | None = None
+    da_last_flags: int = 0
+    # SuspiciousRange
+    sr_character_count: int = 0
+    sr_suspicious_count: int = 0
+    sr_last_range: str | None = None
+    sr_has_last: bool = False
+    # SuperWeirdWordPlugin, its word buffer reduced to what is checked of it.
+    ww_word_count: int = 0
+    ww_bad_word_count: int = 0
+    ww_foreign_long_count: int = 0
+    ww_is_current_word_bad: bool = False
+    ww_foreign_long_watch: bool = False
+    ww_character_count: int = 0
+    ww_bad_character_count: int = 0
+    ww_buffer_length: int = 0
+    ww_buffer_upper_count: int = 0
+    ww_buffer_last_flags: int = 0
+    ww_buffer_accent_count: int = 0
+    ww_buffer_glyph_count: int = 0
+    # CjkUncommonPlugin
+    cu_character_count: int = 0
+    cu_uncommon_count: int = 0
+    # ArchaicUpperLowerPlugin
+    au_buf: bool = False
+    au_count_since_last_sep: int = 0
+    au_successive_count: int = 0
+    au_successive_count_final: int = 0
+    au_character_count: int = 0
+    au_last_alpha_flags: int = -1
+    au_current_ascii_only: bool = True
+    # ArabicIsolatedFormPlugin
+    ar_character_count: int = 0
+    ar_isolated_form_count: int = 0
+
+    length: int = len(decoded_sequence) + 1
+    mean_mess_ratio: float = 0.0
+
+    for index, character in enumerate(decoded_sequence + "\n"):
+        flags, character_range = classes[character]
+
+        if flags & _UNPRINTABLE:
+            up_unprintable_count += 1
+
+        if flags & _PRINTABLE:
+            sp_character_count += 1
+            if character != sp_last_printable_char and not flags & _COMMON_SAFE:
+                if flags & _PUNCTUATION:
+                    sp_punctuation_count += 1
+                elif flags & _PUNCTUATION_SYMBOL:
+                    sp_symbol_count += 2
+            sp_last_printable_char = character
+
+            sr_character_count += 1
+            if flags & _RANGE_BREAK:
+                sr_has_last = False
+            elif not sr_has_last:
+                sr_has_last = True
+                sr_last_range = character_range
+            else:
+                if (
+                    character_range is None or character_range != sr_last_range
+                ) and is_suspiciously_successive_range(sr_last_range, character_range):
+                    sr_suspicious_count += 1
+                sr_last_range = character_range
+
+        if flags & _ALPHA:
+            ta_character_count += 1
+            if flags & _ACCENTUATED:
+                ta_accentuated_count += 1
+                ww_buffer_accent_count += 1
+
+            if flags & _LATIN:
+                da_character_count += 1
+                if (
+                    flags & _ACCENTUATED
+                    and da_last_flags & _ACCENTUATED
+                    and da_last_latin_character is not None
+                ):
+                    if flags & _UPPER and da_last_flags & _UPPER:
+                        da_successive_count += 1
+                    if remove_accent(character) == remove_accent(
+                        da_last_latin_character
+                    ):
+                        da_successive_count += 1
+                da_last_latin_character = character
+                da_last_flags = flags
+
+            # SuperWeirdWordPlugin
+            ww_buffer_length += 1
+            if flags & _UPPER:
+                ww_buffer_upper_count += 1
+            ww_buffer_last_flags = flags
+            if flags & _GLYPH:
+                ww_buffer_glyph_count += 1
+            elif (
+                ww_foreign_long_watch is False
+                and (not flags & _LATIN or flags & _ACCENTUATED)
+            ):
+                ww_foreign_long_watch = True
+        elif ww_buffer_length:
+            if flags & _WORD_BREAK:
+                ww_word_count += 1
+                ww_character_count += ww_buffer_length
+
+                if ww_buffer_length >= 4:
+                    if ww_buffer_accent_count / ww_buffer_length >= 0.5:
+                        ww_is_current_word_bad = True
+                    elif (
+                        ww_buffer_last_flags & _ACCENTUATED
+                        and ww_buffer_last_flags & _UPPER
+                        and ww_buffer_upper_count != ww_buffer_length
+                    ):
+                        ww_foreign_long_count += 1
+                        ww_is_current_word_bad = True
+                    elif ww_buffer_glyph_count == 1:
+                        ww_is_current_word_bad = True
+                        ww_foreign_long_count += 1
+                if ww_buffer_length >= 24 and ww_foreign_long_watch:
+                    # Unless probably camel cased.
+                    if not (
+                        ww_buffer_upper_count
+                        and ww_buffer_upper_count / ww_buffer_length <= 0.3
+                    ):
+                        ww_foreign_long_count += 1
+                        ww_is_current_word_bad = True
+
+                if ww_is_current_word_bad:
+                    ww_bad_word_count += 1
+                    ww_bad_character_count += ww_buffer_length
+                    ww_is_current_word_bad = False
+
+                ww_foreign_long_watch = False
+                ww_buffer_length = 0
+                ww_buffer_upper_count = 0
+                ww_buffer_accent_count = 0
+                ww_buffer_glyph_count = 0
+            elif flags & _WORD_SYMBOL:
+                ww_is_current_word_bad = True
+                ww_buffer_length += 1
+                if flags & _UPPER:
+                    ww_buffer_upper_count += 1
+                ww_buffer_last_flags = flags
+
+        if flags & (_CJK | _ARABIC):
+            if flags & _CJK:
+                cu_character_count += 1
+                if flags & _CJK_UNCOMMON:
+                    cu_uncommon_count += 1
+            if flags & _ARABIC:
+                ar_character_count += 1
+                if flags & _ARABIC_ISOLATED_FORM:
+                    ar_isolated_form_count += 1
+
+        # ArchaicUpperLowerPlugin
+        if au_count_since_last_sep and not flags & _CASED_LETTER:
+            if (
+                au_count_since_last_sep <= 64
+                and not flags & _DIGIT
+                and au_current_ascii_only is False
+            ):
+                au_successive_count_final += au_successive_count
+
+            au_successive_count = 0
+            au_count_since_last_sep = 0
+            au_last_alpha_flags = -1
+            au_buf = False
+            au_character_count += 1
+            au_current_ascii_only = True
+        else:
+            if au_current_ascii_only is True and not flags & _ASCII:
+                au_current_ascii_only = False
+
+            if au_last_alpha_flags != -1:
+                if (flags & _UPPER and au_last_alpha_flags & _LOWER) or (
+                    flags & _LOWER and au_last_alpha_flags & _UPPER
+                ):
+                    if au_buf is True:
+                        au_successive_count += 2
+                        au_buf = False
+                    else:
+                        au_buf = True
+                else:
+                    au_buf = False
+
+            au_character_count += 1
+            au_count_since_last_sep += 1
+            au_last_alpha_flags = flags
+
+        if (
+            index > 0 and index % intermediary_mean_mess_ratio_calc == 0
+        ) or index == length - 1:
+            ratios: list[float] = []
+
+            if sp_character_count == 0:
+                ratios.append(0.0)
+            else:
+                ratio = (sp_punctuation_count + sp_symbol_count) / sp_character_count
+                ratios.append(ratio if ratio >= 0.3 else 0.0)
+
+            if ta_character_count < 8:
+                ratios.append(0.0)
+            else:
+                ratio = ta_accentuated_count / ta_character_count
+                ratios.append(ratio if ratio >= 0.35 else 0.0)
+
+            ratios.append((up_unprintable_count * 8) / (index + 1))
+
+            if da_character_count == 0:
+                ratios.append(0.0)
+            else:
+                ratios.append((da_successive_count * 2) / da_character_count)
+
+            if sr_character_count <= 13:
+                ratios.append(0.0)
+            else:
+                ratios.append((sr_suspicious_count * 2) / sr_character_count)
+
+            if ww_word_count <= 10 and ww_foreign_long_count == 0:
+                ratios.append(0.0)
+            else:
+                ratios.append(ww_bad_character_count / ww_character_count)
+
+            if cu_character_count < 8:
+                ratios.append(0.0)
+            else:
+                ratio = cu_uncommon_count / cu_character_count
+                ratios.append(ratio / 10 if ratio > 0.5 else 0.0)
+
+            if au_character_count == 0:
+                ratios.append(0.0)
+            else:
+                ratios.append(au_successive_count_final / au_character_count)
+
+            if ar_character_count < 8:
+                ratios.append(0.0)
+            else:
+                ratios.append(ar_isolated_form_count / ar_character_count)
+
+            mean_mess_ratio = sum(ratios)
+
+            if mean_mess_ratio >= maximum_threshold:
+                break
+
+    return mean_mess_ratio
+
+
+@lru_cache(maxsize=2048)
+def mess_ratio(
+    decoded_sequence: str, maximum_threshold: float = 0.2, debug: bool = False
+) -> float:
+    """
+    Compute a mess ratio given a decoded bytes sequence. The maximum threshold does stop the computation earlier.
+    """
+
+    length: int = len(decoded_sequence) + 1
+
+    if length < 512:
+        intermediary_mean_mess_ratio_calc: int = 32
+    elif length <= 1024:
+        intermediary_mean_mess_ratio_calc = 64
+    else:
+        intermediary_mean_mess_ratio_calc = 128
+
+    detector_classes = MessDetectorPlugin.__subclasses__()
+
+    # Only the built-in detectors are known to the single pass engine, and
+    # the extended analysis needs to report each of them separately.
+    if debug is False and tuple(detector_classes) == _BUILTIN_DETECTORS:
+        return round(
+            _single_pass_mess_ratio(
+                decoded_sequence, maximum_threshold, intermediary_mean_mess_ratio_calc
+            ),
+            3,
+        )
+
+    detectors: list[MessDetectorPlugin] = [
+        md_class() for md_class in detector_classes
+    ]
+
+    mean_mess_ratio: float = _plugins_mess_ratio(
+        decoded_sequence,
+        maximum_threshold,
+        detectors,
+        intermediary_mean_mess_ratio_calc,
+    )
+
     if debug:
         logger = getLogger("charset_normalizer")
 
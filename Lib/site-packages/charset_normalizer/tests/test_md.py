@@ -0,0 +1,81 @@
+import random
+
+import pytest
+
+from charset_normalizer.md import (
+    _BUILTIN_DETECTORS,
+    _plugins_mess_ratio,
+    _single_pass_mess_ratio,
+)
+
+SAMPLES = [
+    "The quick brown fox jumps over the lazy dog. It's 12:30, isn't it?",
+    "Voix ambiguë d'un cœur qui, au zéphyr, préfère les jattes de kiwis.",
+    "Falsches Üben von Xylophonmusik quält jeden größeren Zwerg.",
+    "Съешь же ещё этих мягких французских булок, да выпей чаю.",
+    "Τάχιστη αλώπηξ βαφής ψημένη γη, δρασκελίζει υπέρ νωθρού κυνός.",
+    "نص حكيم له سر قاطع وذو شأن عظيم مكتوب على ثوب أخضر ومغلف بجلد أزرق.",
+    "דג סקרן שט בים מאוכזב ולפתע מצא חברה.",
+    "いろはにほへと　ちりぬるを　わかよたれそ　つねならむ。",
+    "我能吞下玻璃而不伤身体。天地玄黄，宇宙洪荒。",
+    "다람쥐 헌 쳇바퀴에 타고파. 키스의 고유조건은 입술끼리 만나야 하고.",
+    "เป็นมนุษย์สุดประเสริฐเลิศคุณค่า กว่าบรรดาฝูงสัตว์เดรัจฉาน",
+    "Pijamalı hasta yağız şoföre çabucak güvendi. ½ € © ™ «»",
+]
+CODECS = [
+    "utf_8",
+    "utf_16",
+    "latin_1",
+    "cp1252",
+    "cp1251",
+    "cp1253",
+    "cp1256",
+    "iso8859_8",
+    "koi8_r",
+    "shift_jis",
+    "gb18030",
+    "euc_kr",
+    "cp874",
+    "mac_roman",
+]
+THRESHOLDS = [0.1, 0.2, 0.5, 1.0]
+
+
+def corpus():
+    rng = random.Random(0)
+    for sample in SAMPLES:
+        text = (sample + "\n") * rng.randint(1, 12)
+        yield text
+        for encoding in CODECS:
+            try:
+                payload = text.encode(encoding)
+            except UnicodeEncodeError:
+                payload = text.encode("utf_8")
+            for decoding in CODECS:
+                yield payload.decode(decoding, errors="replace")
+    for _ in range(100):
+        payload = bytes(rng.randrange(256) for _ in range(rng.randint(1, 2000)))
+        yield payload.decode(rng.choice(CODECS), errors="replace")
+    for _ in range(100):
+        yield "".join(
+            chr(rng.randrange(0x20, 0x3000)) for _ in range(rng.randint(1, 600))
+        )
+
+
+@pytest.mark.parametrize("maximum_threshold", THRESHOLDS)
+def test_single_pass_matches_plugins(maximum_threshold):
+    mismatches = []
+    for sequence in corpus():
+        length = len(sequence) + 1
+        if length < 512:
+            calc = 32
+        elif length <= 1024:
+            calc = 64
+        else:
+            calc = 128
+        detectors = [cls() for cls in _BUILTIN_DETECTORS]
+        expected = _plugins_mess_ratio(sequence, maximum_threshold, detectors, calc)
+        actual = _single_pass_mess_ratio(sequence, maximum_threshold, calc)
+        if actual != expected:
+            mismatches.append((sequence[:40], expected, actual))
+    assert not mismatches
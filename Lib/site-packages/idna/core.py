@@ -1,7 +1,7 @@
 import bisect
 import re
 import unicodedata
-from typing import Optional, Union
+from typing import Callable, Optional, Tuple, Union
 
 from . import idnadata
 from .intranges import intranges_contain
@@ -329,20 +329,30 @@ def ulabel(label: Union[str, bytes, bytearray]) -> str:
     return label
 
 
+def _uts46data_lookup(code_point: int) -> Tuple[str, Optional[str]]:
+    from .uts46data import uts46data
+
+    uts46row = uts46data[code_point if code_point < 256 else bisect.bisect_left(uts46data, (code_point, "Z")) - 1]
+    return uts46row[1], uts46row[2] if len(uts46row) == 3 else None  # type: ignore[misc]
+
+
+def _uts46_lookup() -> Callable[[int], Tuple[str, Optional[str]]]:
+    from .uts46table import load_table
+
+    table = load_table()
+    return table.lookup if table is not None else _uts46data_lookup
+
+
 def uts46_remap(domain: str, std3_rules: bool = True, transitional: bool = False) -> str:
     """Re-map the characters in the string according to UTS46 processing."""
-    from .uts46data import uts46data
+    lookup = _uts46_lookup()
 
     output = ""
 
     for pos, char in enumerate(domain):
         code_point = ord(char)
         try:
-            uts46row = uts46data[code_point if code_point < 256 else bisect.bisect_left(uts46data, (code_point, "Z")) - 1]
-            status = uts46row[1]
-            replacement: Optional[str] = None
-            if len(uts46row) == 3:
-                replacement = uts46row[2]
+            status, replacement = lookup(code_point)
             if (
                 status == "V"
                 or (status == "D" and not transitional)
@@ -0,0 +1,227 @@
+"""
+Compact lookup table for the UTS46 mapping data.
+
+The rows of uts46data are stored in uts46data.bin as a two-level table:
+the high bits of a code point select a block, the low bits an entry within
+it, and the entry is an index into the distinct (status, replacement) rows.
+Identical blocks are stored once. Loading it is a handful of
+array.frombytes() calls, and a lookup is two array indexings instead of a
+bisection of the 8k-row tuple.
+
+Regenerate the table after updating uts46data.py with:
+
+    python -m idna.uts46table build
+
+and compare it to the tuple table with:
+
+    python -m idna.uts46table benchmark
+"""
+
+import os
+import struct
+import sys
+from array import array
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from .idnadata import __version__ as _unicode_version
+
+_MAGIC = b"IDNAUTS46\x00\x01\x00"
+_HEADER = struct.Struct("<12s16sIIII")
+_SHIFT = 7
+_BLOCK_SIZE = 1 << _SHIFT
+_BLOCK_MASK = _BLOCK_SIZE - 1
+_MAX_CODE_POINT = 0x110000
+_HAS_REPLACEMENT = 0x80
+
+_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "uts46data.bin")
+
+Row = Tuple[str, Optional[str]]
+
+
+class Uts46Table:
+    """O(1) lookup of the UTS46 (status, replacement) row for a code point."""
+
+    __slots__ = ("version", "_index", "_blocks", "_rows")
+
+    def __init__(self, version: str, index: Sequence[int], blocks: Sequence[int], rows: List[Row]):
+        self.version = version
+        self._index = index
+        self._blocks = blocks
+        self._rows = rows
+
+    def lookup(self, code_point: int) -> Row:
+        """Return the (status, replacement) row for the code point. Raises
+        IndexError for values outside of the Unicode range."""
+        if code_point < 0:
+            raise IndexError(code_point)
+        return self._rows[self._blocks[self._index[code_point >> _SHIFT] << _SHIFT | code_point & _BLOCK_MASK]]
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "Uts46Table":
+        magic, version, index_len, blocks_len, rows_len, pool_len = _HEADER.unpack_from(data)
+        if magic != _MAGIC:
+            raise ValueError("Not a UTS46 table")
+
+        offset = _HEADER.size
+        index = array("H")
+        index.frombytes(data[offset : offset + index_len * 2])
+        offset += index_len * 2
+        blocks = array("H")
+        blocks.frombytes(data[offset : offset + blocks_len * 2])
+        offset += blocks_len * 2
+        starts = array("I")
+        starts.frombytes(data[offset : offset + (rows_len + 1) * 4])
+        offset += (rows_len + 1) * 4
+        statuses = data[offset : offset + rows_len]
+        offset += rows_len
+        pool = data[offset : offset + pool_len].decode("utf-8")
+
+        if sys.byteorder == "big":
+            index.byteswap()
+            blocks.byteswap()
+            starts.byteswap()
+
+        rows: List[Row] = []
+        for i, status in enumerate(statuses):
+            replacement: Optional[str] = None
+            if status & _HAS_REPLACEMENT:
+                replacement = pool[starts[i] : starts[i + 1]]
+            rows.append((chr(status & ~_HAS_REPLACEMENT), replacement))
+
+        return cls(version.rstrip(b"\x00").decode("ascii"), index, blocks, rows)
+
+    def to_bytes(self) -> bytes:
+        pool: List[str] = []
+        starts = array("I", [0])
+        statuses = bytearray()
+        for status, replacement in self._rows:
+            if replacement is None:
+                statuses.append(ord(status))
+            else:
+                statuses.append(ord(status) | _HAS_REPLACEMENT)
+                pool.append(replacement)
+            starts.append(starts[-1] + len(replacement or ""))
+
+        index = array("H", self._index)
+        blocks = array("H", self._blocks)
+        if sys.byteorder == "big":
+            index.byteswap()
+            blocks.byteswap()
+            starts.byteswap()
+
+        encoded_pool = "".join(pool).encode("utf-8")
+        header = _HEADER.pack(
+            _MAGIC,
+            self.version.encode("ascii"),
+            len(index),
+            len(blocks),
+            len(self._rows),
+            len(encoded_pool),
+        )
+        return b"".join(
+            (header, index.tobytes(), blocks.tobytes(), starts.tobytes(), bytes(statuses), encoded_pool)
+        )
+
+    @classmethod
+    def from_uts46data(cls) -> "Uts46Table":
+        """Build the table from the rows of uts46data."""
+        from .uts46data import __version__ as version
+        from .uts46data import uts46data
+
+        row_ids: Dict[Row, int] = {}
+        code_point_rows = array("H")
+        for i, uts46row in enumerate(uts46data):
+            end = uts46data[i + 1][0] if i + 1 < len(uts46data) else _MAX_CODE_POINT
+            row: Row = (uts46row[1], uts46row[2] if len(uts46row) == 3 else None)  # type: ignore[misc]
+            row_id = row_ids.setdefault(row, len(row_ids))
+            code_point_rows.extend([row_id] * (end - uts46row[0]))
+
+        block_ids: Dict[bytes, int] = {}
+        index = array("H")
+        blocks = array("H")
+        for start in range(0, _MAX_CODE_POINT, _BLOCK_SIZE):
+            block = code_point_rows[start : start + _BLOCK_SIZE]
+            key = block.tobytes()
+            if key not in block_ids:
+                block_ids[key] = len(block_ids)
+                blocks.extend(block)
+            index.append(block_ids[key])
+
+        return cls(version, index, blocks, list(row_ids))
+
+
+_table: Optional[Uts46Table] = None
+_loaded = False
+
+
+def load_table() -> Optional[Uts46Table]:
+    """Load uts46data.bin on first use. Returns None when it is missing or
+    does not match the Unicode version of idnadata, in which case callers
+    fall back to uts46data."""
+    global _table, _loaded
+    if not _loaded:
+        try:
+            with open(_PATH, "rb") as f:
+                table: Optional[Uts46Table] = Uts46Table.from_bytes(f.read())
+        except (OSError, ValueError, struct.error):
+            table = None
+        if table is not None and table.version == _unicode_version:
+            _table = table
+        _loaded = True
+    return _table
+
+
+def build(path: str = _PATH) -> None:
+    with open(path, "wb") as f:
+        f.write(Uts46Table.from_uts46data().to_bytes())
+
+
+_BENCHMARK_SETUP = """
+import idna, idna.uts46table
+if {tuple_table}:
+    idna.uts46table._PATH = ""
+names = ["example.com", "www.Example.COM", "bücher.example", "ПРИМЕР.рф", "ｅｘａｍｐｌｅ．ｊｐ", "straße.de", "日本語.jp"] * 2000
+"""
+
+_BENCHMARK_RUN = """
+import resource, time
+t = time.perf_counter()
+for name in names:
+    idna.encode(name, uts46=True)
+elapsed = time.perf_counter() - t
+print(len(names) / elapsed, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+"""
+
+
+def benchmark() -> None:
+    """Compare this table with the uts46data tuples: time to import idna and
+    encode the first name, maximum RSS, and idna.encode(uts46=True) rate.
+    Each measurement runs in a fresh interpreter (RSS needs the resource
+    module, so it is POSIX only)."""
+    import subprocess
+    import time
+
+    for label, tuple_table in (("uts46data.py", True), ("uts46data.bin", False)):
+        setup = _BENCHMARK_SETUP.format(tuple_table=tuple_table)
+        first_use = []
+        for _ in range(5):
+            start = time.perf_counter()
+            subprocess.run([sys.executable, "-c", setup + "idna.encode('bücher.example', uts46=True)"], check=True)
+            first_use.append(time.perf_counter() - start)
+        output = subprocess.run(
+            [sys.executable, "-c", setup + _BENCHMARK_RUN], check=True, capture_output=True, text=True
+        ).stdout.split()
+        print(
+            "{:14} start+first encode {:6.1f} ms  max RSS {:6d} KiB  {:9.0f} encodes/s".format(
+                label, min(first_use) * 1000, int(output[1]), float(output[0])
+            )
+        )
+
+
+if __name__ == "__main__":
+    if sys.argv[1:] == ["build"]:
+        build()
+    elif sys.argv[1:] == ["benchmark"]:
+        benchmark()
+    else:
+        sys.exit("usage: python -m idna.uts46table build|benchmark")
@@ -11,6 +11,7 @@ import socket  # noqa: F401
 import typing
 import warnings
 
+from urllib3._collections import HTTPHeaderDict
 from urllib3.exceptions import ClosedPoolError, ConnectTimeoutError
 from urllib3.exceptions import HTTPError as _HTTPError
 from urllib3.exceptions import InvalidHeader as _InvalidHeader
@@ -44,7 +45,7 @@ from .exceptions import (
     SSLError,
 )
 from .models import Response
-from .structures import CaseInsensitiveDict
+from .structures import CaseInsensitiveDict, HTTPHeaderDictView
 from .utils import (
     DEFAULT_CA_BUNDLE_PATH,
     extract_zipped_paths,
@@ -81,9 +82,13 @@ def _urllib3_request_context(
 ) -> "(typing.Dict[str, typing.Any], typing.Dict[str, typing.Any])":
     host_params = {}
     pool_kwargs = {}
-    parsed_request_url = urlparse(request.url)
-    scheme = parsed_request_url.scheme.lower()
+    parsed_request_url = request.parsed_url
+    scheme = parsed_request_url.scheme
     port = parsed_request_url.port
+    host = parsed_request_url.host
+    if host and host.startswith("["):
+        # Like urlparse().hostname, without the brackets of IPv6 addresses.
+        host = host[1:-1]
 
     cert_reqs = "CERT_REQUIRED"
     if verify is False:
@@ -104,7 +109,7 @@ def _urllib3_request_context(
             pool_kwargs["cert_file"] = client_cert
     host_params = {
         "scheme": scheme,
-        "host": parsed_request_url.hostname,
+        "host": host,
         "port": port,
     }
     return host_params, pool_kwargs
@@ -348,8 +353,12 @@ class HTTPAdapter(BaseAdapter):
         # Fallback to None if there's no status_code, for whatever reason.
         response.status_code = getattr(resp, "status", None)
 
-        # Make headers case-insensitive.
-        response.headers = CaseInsensitiveDict(getattr(resp, "headers", {}))
+        # Make headers case-insensitive, sharing urllib3's when possible.
+        headers = getattr(resp, "headers", {})
+        if isinstance(headers, HTTPHeaderDict):
+            response.headers = HTTPHeaderDictView(headers)
+        else:
+            response.headers = CaseInsensitiveDict(headers)
 
         # Set encoding.
         response.encoding = get_encoding_from_headers(response.headers)
@@ -535,7 +544,7 @@ class HTTPAdapter(BaseAdapter):
         :rtype: str
         """
         proxy = select_proxy(request.url, proxies)
-        scheme = urlparse(request.url).scheme
+        scheme = request.parsed_url.scheme
 
         is_proxied_http_request = proxy and scheme != "https"
         using_socks_proxy = False
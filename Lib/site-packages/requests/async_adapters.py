@@ -0,0 +1,757 @@
+"""
+requests.async_adapters
+~~~~~~~~~~~~~~~~~~~~~~~
+
+This module contains the asyncio transport adapter used by
+:class:`AsyncSession <requests.async_sessions.AsyncSession>`.
+
+Requests are serialized with urllib3's regular :class:`HTTPConnection`
+machinery and written to a non-blocking asyncio stream. Each response message
+is read off the stream according to its framing and then handed to
+:class:`http.client.HTTPResponse` and :class:`urllib3.response.HTTPResponse`,
+so header parsing, chunked transfer decoding, content decoding and cookie
+extraction behave exactly like they do for :class:`HTTPAdapter`.
+"""
+
+import asyncio
+import collections
+import contextlib
+import http.client
+import io
+import logging
+import socket
+import ssl
+
+from urllib3._collections import RecentlyUsedContainer
+from urllib3.connection import HTTPConnection, HTTPSConnection, _headers_from_message
+from urllib3.exceptions import ClosedPoolError, ConnectTimeoutError
+from urllib3.exceptions import HTTPError as _HTTPError
+from urllib3.exceptions import InvalidHeader as _InvalidHeader
+from urllib3.exceptions import (
+    LocationValueError,
+    MaxRetryError,
+    NameResolutionError,
+    NewConnectionError,
+    ProtocolError,
+)
+from urllib3.exceptions import ProxyError as _ProxyError
+from urllib3.exceptions import ReadTimeoutError, ResponseError
+from urllib3.exceptions import SSLError as _SSLError
+from urllib3.response import HTTPResponse
+from urllib3.util import Timeout as TimeoutSauce
+from urllib3.util import parse_url
+from urllib3.util.retry import Retry
+from urllib3.util.ssl_ import (
+    ALPN_PROTOCOLS,
+    create_urllib3_context,
+    resolve_cert_reqs,
+    resolve_ssl_version,
+)
+
+from .adapters import DEFAULT_POOLBLOCK, HTTPAdapter
+from .exceptions import (
+    ConnectionError,
+    ConnectTimeout,
+    InvalidHeader,
+    InvalidProxyURL,
+    InvalidURL,
+    ProxyError,
+    ReadTimeout,
+    RetryError,
+    SSLError,
+)
+from .utils import prepend_scheme_if_needed, select_proxy
+
+log = logging.getLogger(__name__)
+
+#: Upper bound for a single line of a response head, matching http.client.
+_MAXLINE = 65536
+
+
+class _BufferedSocket:
+    """Stand-in socket that serves an already received response message to
+    :class:`http.client.HTTPResponse`."""
+
+    def __init__(self, data):
+        self._data = data
+
+    def makefile(self, mode, *args, **kwargs):
+        return io.BytesIO(self._data)
+
+
+class _AsyncIOMixin:
+    """Replaces the blocking socket of a urllib3 connection with asyncio
+    streams. Must be mixed in before :class:`HTTPConnection`."""
+
+    _reader = None
+    _writer = None
+
+    def _init_async(self):
+        self._reader = None
+        self._writer = None
+        self._outgoing = []
+        self._read_timeout = None
+
+    def _ssl_context(self):
+        return None
+
+    @property
+    def is_closed(self):
+        return self._writer is None
+
+    @property
+    def is_connected(self):
+        return self._writer is not None and not self._reader.at_eof()
+
+    async def aconnect(self):
+        """Open the TCP (and TLS) connection without blocking the event loop."""
+        context = self._ssl_context()
+        kwargs = {"limit": _MAXLINE}
+        if context is not None:
+            kwargs["ssl"] = context
+            kwargs["server_hostname"] = self._server_hostname()
+        if self.source_address:
+            kwargs["local_addr"] = self.source_address
+
+        try:
+            self._reader, self._writer = await asyncio.wait_for(
+                asyncio.open_connection(self._dns_host, self.port, **kwargs),
+                self.timeout,
+            )
+        except asyncio.TimeoutError as e:
+            raise ConnectTimeoutError(
+                self,
+                f"Connection to {self.host} timed out. (connect timeout={self.timeout})",
+            ) from e
+        except ssl.SSLError as e:
+            raise _SSLError(e) from e
+        except socket.gaierror as e:
+            raise NameResolutionError(self.host, self, e) from e
+        except OSError as e:
+            raise NewConnectionError(
+                self, f"Failed to establish a new connection: {e}"
+            ) from e
+
+        sock = self._writer.get_extra_info("socket")
+        if sock is not None:
+            for opt in self.socket_options or ():
+                sock.setsockopt(*opt)
+
+    def send(self, data):
+        # Called by http.client while serializing the request: collect the
+        # bytes here, they are written out by ``arequest``.
+        if hasattr(data, "read"):
+            while True:
+                block = data.read(self.blocksize)
+                if not block:
+                    break
+                if isinstance(block, str):
+                    block = block.encode("iso-8859-1")
+                self._outgoing.append(block)
+        elif isinstance(data, (bytes, bytearray, memoryview)):
+            self._outgoing.append(bytes(data))
+        else:
+            for block in data:
+                self._outgoing.append(bytes(block))
+
+    async def arequest(self, method, url, body=None, headers=None, **kwargs):
+        """Send a request. Accepts the same arguments as
+        :meth:`urllib3.connection.HTTPConnection.request`."""
+        if self.is_closed:
+            await self.aconnect()
+
+        self._outgoing = []
+        self.request(method, url, body=body, headers=headers, **kwargs)
+        data, self._outgoing = b"".join(self._outgoing), []
+
+        self._writer.write(data)
+        await self._wait(self._writer.drain())
+
+    async def _wait(self, aw):
+        if self._read_timeout is None:
+            return await aw
+        return await asyncio.wait_for(aw, self._read_timeout)
+
+    async def _read_head(self):
+        head = await self._wait(self._reader.readuntil(b"\r\n\r\n"))
+        status_line, _, header_block = head.partition(b"\r\n")
+        try:
+            status = int(status_line.split(None, 2)[1])
+        except (IndexError, ValueError):
+            raise http.client.BadStatusLine(status_line.decode("latin-1"))
+        return head, status, header_block
+
+    async def _read_message(self, method):
+        """Read one complete response message off the stream.
+
+        :returns: the raw message bytes and whether the connection must be
+            closed afterwards because the body was delimited by EOF.
+        """
+        parts = []
+        # Interim 1xx responses are kept so http.client can skip them itself.
+        while True:
+            head, status, header_block = await self._read_head()
+            parts.append(head)
+            if not 100 <= status < 200 or status == 101:
+                break
+
+        msg = http.client.parse_headers(io.BytesIO(header_block))
+        transfer_encoding = msg.get("transfer-encoding", "").lower()
+        content_length = msg.get("content-length")
+        reader = self._reader
+
+        if method == "HEAD" or status in (204, 304) or 100 <= status < 200:
+            return b"".join(parts), False
+
+        if "chunked" in transfer_encoding:
+            while True:
+                line = await self._wait(reader.readline())
+                parts.append(line)
+                try:
+                    size = int(line.split(b";", 1)[0], 16)
+                except ValueError:
+                    raise http.client.IncompleteRead(b"".join(parts[1:]))
+                if size == 0:
+                    break
+                parts.append(await self._wait(reader.readexactly(size + 2)))
+            # Trailer section, terminated by an empty line.
+            while True:
+                line = await self._wait(reader.readline())
+                parts.append(line)
+                if line in (b"\r\n", b"\n", b""):
+                    break
+            return b"".join(parts), False
+
+        if content_length is not None:
+            try:
+                length = int(content_length.split(",")[0])
+            except ValueError:
+                length = None
+            if length is not None and length >= 0:
+                parts.append(await self._wait(reader.readexactly(length)))
+                return b"".join(parts), False
+
+        parts.append(await self._wait(reader.read()))
+        return b"".join(parts), True
+
+    async def agetresponse(self):
+        """Receive the response to the last request sent with
+        :meth:`arequest` and return it as a fully received
+        :class:`urllib3.response.HTTPResponse`."""
+        if self._response_options is None:
+            raise http.client.ResponseNotReady()
+
+        resp_options = self._response_options
+        self._response_options = None
+        # http.client only returns to the idle state inside its own
+        # getresponse(), which this class never calls.
+        self._HTTPConnection__state = http.client._CS_IDLE
+
+        data, read_to_eof = await self._read_message(resp_options.request_method)
+
+        httplib_response = self.response_class(
+            _BufferedSocket(data), method=resp_options.request_method
+        )
+        httplib_response.begin()
+        if read_to_eof or httplib_response.will_close:
+            self.close()
+
+        headers = _headers_from_message(httplib_response.msg)
+
+        return HTTPResponse(
+            body=httplib_response,
+            headers=headers,
+            status=httplib_response.status,
+            version=httplib_response.version,
+            version_string=getattr(self, "_http_vsn_str", "HTTP/?"),
+            reason=httplib_response.reason,
+            preload_content=False,
+            decode_content=resp_options.decode_content,
+            original_response=httplib_response,
+            enforce_content_length=resp_options.enforce_content_length,
+            request_method=resp_options.request_method,
+            request_url=resp_options.request_url,
+        )
+
+    def close(self):
+        writer, self._writer, self._reader = self._writer, None, None
+        self._outgoing = []
+        if writer is not None:
+            writer.close()
+        super().close()
+
+
+class AsyncHTTPConnection(_AsyncIOMixin, HTTPConnection):
+    """:class:`urllib3.connection.HTTPConnection` driven by asyncio streams."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._init_async()
+
+
+class AsyncHTTPSConnection(_AsyncIOMixin, HTTPSConnection):
+    """:class:`urllib3.connection.HTTPSConnection` driven by asyncio streams."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._init_async()
+
+    def _server_hostname(self):
+        return (self.server_hostname or self.host).rstrip(".")
+
+    def _ssl_context(self):
+        default_ssl_context = self.ssl_context is None
+        if default_ssl_context:
+            context = create_urllib3_context(
+                ssl_version=resolve_ssl_version(self.ssl_version),
+                ssl_minimum_version=self.ssl_minimum_version,
+                ssl_maximum_version=self.ssl_maximum_version,
+                cert_reqs=resolve_cert_reqs(self.cert_reqs),
+            )
+        else:
+            context = self.ssl_context
+
+        context.verify_mode = resolve_cert_reqs(self.cert_reqs)
+        if self.assert_hostname is False or context.verify_mode == ssl.CERT_NONE:
+            context.check_hostname = False
+
+        if self.ca_certs or self.ca_cert_dir or self.ca_cert_data:
+            context.load_verify_locations(
+                self.ca_certs, self.ca_cert_dir, self.ca_cert_data
+            )
+        elif default_ssl_context:
+            context.load_default_certs()
+
+        if self.cert_file:
+            context.load_cert_chain(self.cert_file, self.key_file, self.key_password)
+
+        context.set_alpn_protocols(ALPN_PROTOCOLS)
+        self.is_verified = context.verify_mode == ssl.CERT_REQUIRED
+        return context
+
+
+class AsyncHTTPConnectionPool:
+    """Connection pool for one origin, used from a single event loop.
+
+    Mirrors :class:`urllib3.HTTPConnectionPool`: up to ``maxsize`` idle
+    connections are kept for reuse and, if ``block`` is set, no more than
+    ``maxsize`` requests are in flight at a time.
+    """
+
+    scheme = "http"
+    ConnectionCls = AsyncHTTPConnection
+
+    def __init__(self, host, port=None, maxsize=1, block=False, **conn_kw):
+        self.host = host
+        self.port = port
+        self.maxsize = maxsize
+        self.block = block
+        self.conn_kw = conn_kw
+        self.num_connections = 0
+        self.num_requests = 0
+
+        self._idle = collections.deque()
+        self._loop = None
+        self._slots = None
+        self._closed = False
+
+    def __str__(self):
+        return f"{type(self).__name__}(host={self.host!r}, port={self.port!r})"
+
+    def _bind_loop(self):
+        # asyncio streams and semaphores belong to the loop that created
+        # them; connections left over from a previous loop are dropped.
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            self._close_idle()
+            self._loop = loop
+            self._slots = asyncio.Semaphore(self.maxsize) if self.block else None
+
+    def _new_conn(self):
+        self.num_connections += 1
+        log.debug(
+            "Starting new %s connection (%d): %s:%s",
+            self.scheme.upper(),
+            self.num_connections,
+            self.host,
+            self.port or HTTPConnection.default_port,
+        )
+        return self.ConnectionCls(host=self.host, port=self.port, **self.conn_kw)
+
+    def _get_conn(self):
+        if self._closed:
+            raise ClosedPoolError(self, "Pool is closed.")
+
+        while self._idle:
+            conn = self._idle.pop()
+            if conn.is_connected:
+                return conn
+            log.debug("Resetting dropped connection: %s", self.host)
+            conn.close()
+        return self._new_conn()
+
+    def _put_conn(self, conn):
+        if self._closed or conn.is_closed or len(self._idle) >= self.maxsize:
+            conn.close()
+        else:
+            self._idle.append(conn)
+
+    def _close_idle(self):
+        while self._idle:
+            self._idle.pop().close()
+
+    def close(self):
+        """Close all pooled connections and disable the pool."""
+        self._closed = True
+        self._close_idle()
+
+    async def _make_request(self, conn, method, url, timeout, **kwargs):
+        self.num_requests += 1
+        conn.timeout = TimeoutSauce.resolve_default_timeout(timeout.connect_timeout)
+        conn._read_timeout = None
+        if conn.is_closed:
+            await conn.aconnect()
+
+        conn._read_timeout = TimeoutSauce.resolve_default_timeout(timeout.read_timeout)
+        try:
+            await conn.arequest(method, url, **kwargs)
+            response = await conn.agetresponse()
+        except asyncio.TimeoutError as e:
+            raise ReadTimeoutError(
+                self, url, f"Read timed out. (read timeout={conn._read_timeout})"
+            ) from e
+        except ssl.SSLError as e:
+            raise _SSLError(e) from e
+        except (
+            OSError,
+            asyncio.IncompleteReadError,
+            asyncio.LimitOverrunError,
+            http.client.HTTPException,
+        ) as e:
+            raise ProtocolError("Connection aborted.", e) from e
+
+        log.debug(
+            '%s://%s:%s "%s %s %s" %s %s',
+            self.scheme,
+            self.host,
+            self.port,
+            method,
+            url,
+            response.version_string,
+            response.status,
+            response.length_remaining,
+        )
+        return response
+
+    async def urlopen(
+        self,
+        method,
+        url,
+        body=None,
+        headers=None,
+        retries=None,
+        timeout=None,
+        chunked=False,
+        decode_content=True,
+    ):
+        """Send a request on a pooled connection and receive the complete
+        response. ``retries`` is honoured like in
+        :meth:`urllib3.HTTPConnectionPool.urlopen`, redirects excepted."""
+        if not isinstance(retries, Retry):
+            retries = Retry.from_int(retries, redirect=False)
+        if not isinstance(timeout, TimeoutSauce):
+            timeout = TimeoutSauce.from_float(timeout)
+
+        self._bind_loop()
+        while True:
+            slot = self._slots or contextlib.nullcontext()
+            conn = None
+            try:
+                async with slot:
+                    conn = self._get_conn()
+                    response = await self._make_request(
+                        conn,
+                        method,
+                        url,
+                        timeout,
+                        body=body,
+                        headers=headers,
+                        chunked=chunked,
+                        decode_content=decode_content,
+                    )
+                    self._put_conn(conn)
+                    conn = None
+            except (
+                ConnectTimeoutError,
+                ProtocolError,
+                ReadTimeoutError,
+                _SSLError,
+            ) as e:
+                if conn is not None:
+                    conn.close()
+                retries = retries.increment(method, url, error=e, _pool=self)
+                log.warning(
+                    "Retrying (%r) after connection broken by '%r': %s",
+                    retries,
+                    e,
+                    url,
+                )
+                await asyncio.sleep(retries.get_backoff_time())
+                continue
+            except BaseException:
+                # Cancellation included: the connection is in an unknown
+                # state mid-request, so it must not go back to the pool.
+                if conn is not None:
+                    conn.close()
+                raise
+
+            response.retries = retries
+            has_retry_after = bool(response.headers.get("Retry-After"))
+            if not retries.is_retry(method, response.status, has_retry_after):
+                return response
+
+            try:
+                retries = retries.increment(method, url, response=response, _pool=self)
+            except MaxRetryError:
+                if retries.raise_on_status:
+                    raise
+                return response
+
+            log.debug("Retry: %s", url)
+            delay = None
+            if retries.respect_retry_after_header:
+                delay = retries.get_retry_after(response)
+            if delay is None:
+                delay = retries.get_backoff_time()
+            await asyncio.sleep(delay)
+
+
+class AsyncHTTPSConnectionPool(AsyncHTTPConnectionPool):
+    """Same as :class:`AsyncHTTPConnectionPool`, but HTTPS."""
+
+    scheme = "https"
+    ConnectionCls = AsyncHTTPSConnection
+
+    cert_reqs = None
+    ca_certs = None
+    ca_cert_dir = None
+    cert_file = None
+    key_file = None
+
+    def _new_conn(self):
+        conn = super()._new_conn()
+        conn.cert_reqs = self.cert_reqs
+        conn.ca_certs = self.ca_certs
+        conn.ca_cert_dir = self.ca_cert_dir
+        conn.cert_file = self.cert_file
+        conn.key_file = self.key_file
+        return conn
+
+
+pool_classes_by_scheme = {
+    "http": AsyncHTTPConnectionPool,
+    "https": AsyncHTTPSConnectionPool,
+}
+
+
+class AsyncHTTPAdapter(HTTPAdapter):
+    """The asyncio transport adapter.
+
+    A drop-in counterpart of :class:`HTTPAdapter <requests.adapters.HTTPAdapter>`
+    whose :meth:`send` is a coroutine. Connections are pooled per origin and
+    per event loop; one process can keep hundreds of requests in flight
+    without a thread per request.
+
+    Response bodies are received completely before :meth:`send` returns, so
+    ``stream=True`` only defers content decoding, not the network transfer.
+    Plain HTTP proxies are supported; HTTPS tunnelling through a proxy is not.
+
+    Usage::
+
+      >>> from requests.async_adapters import AsyncHTTPAdapter
+      >>> from requests.async_sessions import AsyncSession
+      >>> s = AsyncSession()
+      >>> s.mount('https://', AsyncHTTPAdapter(max_retries=3))
+    """
+
+    def init_poolmanager(
+        self, connections, maxsize, block=DEFAULT_POOLBLOCK, **pool_kwargs
+    ):
+        """Initializes the per-origin pool container.
+
+        This method should not be called from user code, and is only
+        exposed for use when subclassing the
+        :class:`AsyncHTTPAdapter <requests.async_adapters.AsyncHTTPAdapter>`.
+        """
+        self._pool_connections = connections
+        self._pool_maxsize = maxsize
+        self._pool_block = block
+
+        self.poolmanager = RecentlyUsedContainer(
+            connections, dispose_func=lambda pool: pool.close()
+        )
+
+    def get_connection_with_tls_context(self, request, verify, proxies=None, cert=None):
+        """Returns an :class:`AsyncHTTPConnectionPool` for the given request
+        and TLS settings. This should not be called from user code, and is
+        only exposed for use when subclassing the
+        :class:`AsyncHTTPAdapter <requests.async_adapters.AsyncHTTPAdapter>`.
+
+        :rtype: AsyncHTTPConnectionPool
+        """
+        proxy = select_proxy(request.url, proxies)
+        try:
+            host_params, pool_kwargs = self.build_connection_pool_key_attributes(
+                request,
+                verify,
+                cert,
+            )
+        except ValueError as e:
+            raise InvalidURL(e, request=request)
+
+        scheme = host_params["scheme"]
+        if scheme not in pool_classes_by_scheme or not host_params["host"]:
+            raise LocationValueError(f"Cannot connect to {request.url!r}")
+
+        if proxy:
+            proxy = prepend_scheme_if_needed(proxy, "http")
+            proxy_url = parse_url(proxy)
+            if not proxy_url.host:
+                raise InvalidProxyURL(
+                    "Please check proxy URL. It is malformed "
+                    "and could be missing the host."
+                )
+            if scheme != "http" or proxy_url.scheme != "http":
+                raise ProxyError(
+                    "AsyncHTTPAdapter only supports plain HTTP requests "
+                    "through plain HTTP proxies.",
+                    request=request,
+                )
+            host_params = {
+                "scheme": "http",
+                "host": proxy_url.host,
+                "port": proxy_url.port,
+            }
+            pool_kwargs = {}
+
+        key = (
+            host_params["scheme"],
+            host_params["host"].lower(),
+            host_params["port"],
+            tuple(sorted(pool_kwargs.items())),
+        )
+        with self.poolmanager.lock:
+            pool = self.poolmanager.get(key)
+            if pool is None:
+                pool_cls = pool_classes_by_scheme[host_params["scheme"]]
+                pool = pool_cls(
+                    host_params["host"],
+                    host_params["port"],
+                    maxsize=self._pool_maxsize,
+                    block=self._pool_block,
+                )
+                self.poolmanager[key] = pool
+        return pool
+
+    def close(self):
+        """Disposes of any internal state.
+
+        Currently, this closes all pools and the connections they hold.
+        """
+        self.poolmanager.clear()
+
+    async def send(
+        self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None
+    ):
+        """Sends PreparedRequest object. Returns Response object.
+
+        Accepts the same arguments as :meth:`HTTPAdapter.send
+        <requests.adapters.HTTPAdapter.send>`.
+
+        :rtype: requests.Response
+        """
+        try:
+            conn = self.get_connection_with_tls_context(
+                request, verify, proxies=proxies, cert=cert
+            )
+        except LocationValueError as e:
+            raise InvalidURL(e, request=request)
+
+        self.cert_verify(conn, request.url, verify, cert)
+        url = self.request_url(request, proxies)
+        self.add_headers(
+            request,
+            stream=stream,
+            timeout=timeout,
+            verify=verify,
+            cert=cert,
+            proxies=proxies,
+        )
+
+        headers = request.headers
+        proxy = select_proxy(request.url, proxies)
+        if proxy:
+            headers = headers.copy()
+            headers.update(self.proxy_headers(proxy))
+
+        chunked = not (request.body is None or "Content-Length" in request.headers)
+
+        if isinstance(timeout, tuple):
+            try:
+                connect, read = timeout
+                timeout = TimeoutSauce(connect=connect, read=read)
+            except ValueError:
+                raise ValueError(
+                    f"Invalid timeout {timeout}. Pass a (connect, read) timeout tuple, "
+                    f"or a single float to set both timeouts to the same value."
+                )
+        elif isinstance(timeout, TimeoutSauce):
+            pass
+        else:
+            timeout = TimeoutSauce(connect=timeout, read=timeout)
+
+        try:
+            resp = await conn.urlopen(
+                method=request.method,
+                url=url,
+                body=request.body,
+                headers=headers,
+                retries=self.max_retries,
+                timeout=timeout,
+                chunked=chunked,
+                decode_content=False,
+            )
+
+        except (ProtocolError, OSError) as err:
+            raise ConnectionError(err, request=request)
+
+        except MaxRetryError as e:
+            if isinstance(e.reason, ConnectTimeoutError):
+                if not isinstance(e.reason, NewConnectionError):
+                    raise ConnectTimeout(e, request=request)
+
+            if isinstance(e.reason, ResponseError):
+                raise RetryError(e, request=request)
+
+            if isinstance(e.reason, _ProxyError):
+                raise ProxyError(e, request=request)
+
+            if isinstance(e.reason, _SSLError):
+                raise SSLError(e, request=request)
+
+            raise ConnectionError(e, request=request)
+
+        except ClosedPoolError as e:
+            raise ConnectionError(e, request=request)
+
+        except (_SSLError, _HTTPError) as e:
+            if isinstance(e, _SSLError):
+                raise SSLError(e, request=request)
+            elif isinstance(e, ReadTimeoutError):
+                raise ReadTimeout(e, request=request)
+            elif isinstance(e, _InvalidHeader):
+                raise InvalidHeader(e, request=request)
+            else:
+                raise
+
+        return self.build_response(request, resp)
@@ -0,0 +1,202 @@
+"""
+requests.async_sessions
+~~~~~~~~~~~~~~~~~~~~~~~
+
+This module provides an asyncio flavour of :class:`Session` that keeps many
+requests in flight on a single thread.
+"""
+from datetime import timedelta
+
+from .async_adapters import AsyncHTTPAdapter
+from .compat import urlparse
+from .cookies import extract_cookies_to_jar
+from .hooks import dispatch_hook
+from .models import Request
+from .sessions import Session, SessionRedirectMixin, preferred_clock
+
+
+class AsyncSession(Session):
+    """A Requests session whose I/O is awaited instead of blocking.
+
+    Everything that does not touch the network -- request preparation,
+    environment merging, cookies, auth, hooks and redirect rebuilding -- is
+    shared with :class:`Session`. The request methods are coroutines.
+
+    Basic Usage::
+
+      >>> import asyncio
+      >>> from requests.async_sessions import AsyncSession
+      >>> async def main():
+      ...     async with AsyncSession() as s:
+      ...         return await asyncio.gather(
+      ...             s.get('https://httpbin.org/get'),
+      ...             s.get('https://httpbin.org/ip'),
+      ...         )
+      >>> asyncio.run(main())
+      [<Response [200]>, <Response [200]>]
+    """
+
+    def __init__(self):
+        super().__init__()
+
+        # Default connection adapters.
+        for adapter in self.adapters.values():
+            adapter.close()
+        self.mount("https://", AsyncHTTPAdapter())
+        self.mount("http://", AsyncHTTPAdapter())
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        self.close()
+
+    # The batch and download helpers of Session drive send() from threads
+    # and cannot await it.
+
+    def map(self, *args, **kwargs):
+        raise TypeError(
+            "AsyncSession does not support map(); await the requests with "
+            "asyncio.gather() instead."
+        )
+
+    def imap_unordered(self, *args, **kwargs):
+        raise TypeError(
+            "AsyncSession does not support imap_unordered(); await the "
+            "requests with asyncio.as_completed() instead."
+        )
+
+    def download(self, *args, **kwargs):
+        raise TypeError(
+            "AsyncSession does not support download(); use a Session, for "
+            "example in asyncio.to_thread()."
+        )
+
+    async def send(self, request, **kwargs):
+        """Send a given PreparedRequest.
+
+        :rtype: requests.Response
+        """
+        # Set defaults that the hooks can utilize to ensure they always have
+        # the correct parameters to reproduce the previous request.
+        kwargs.setdefault("stream", self.stream)
+        kwargs.setdefault("verify", self.verify)
+        kwargs.setdefault("cert", self.cert)
+        if "proxies" not in kwargs:
+            kwargs["proxies"] = self._resolve_proxies(request, self.proxies)
+
+        # It's possible that users might accidentally send a Request object.
+        # Guard against that specific failure case.
+        if isinstance(request, Request):
+            raise ValueError("You can only send PreparedRequests.")
+
+        # Set up variables needed for resolve_redirects and dispatching of hooks
+        allow_redirects = kwargs.pop("allow_redirects", True)
+        stream = kwargs.get("stream")
+        hooks = request.hooks
+
+        # Get the appropriate adapter to use
+        adapter = self.get_adapter(url=request.url)
+
+        # Start time (approximately) of the request
+        start = preferred_clock()
+
+        # Send the request
+        r = await adapter.send(request, **kwargs)
+
+        # Total elapsed time of the request (approximately)
+        elapsed = preferred_clock() - start
+        r.elapsed = timedelta(seconds=elapsed)
+        r.json_codec = self.json_codec
+
+        # Response manipulation hooks
+        r = dispatch_hook("response", hooks, r, **kwargs)
+
+        # Persist cookies
+        if r.history:
+            # If the hooks create history then we want those cookies too
+            for resp in r.history:
+                extract_cookies_to_jar(self.cookies, resp.request, resp.raw)
+
+        extract_cookies_to_jar(self.cookies, request, r.raw)
+
+        # Resolve redirects if allowed.
+        if allow_redirects:
+            # Redirect resolving generator.
+            gen = self.resolve_redirects(r, request, **kwargs)
+            history = [resp async for resp in gen]
+        else:
+            history = []
+
+        # Shuffle things around if there's history.
+        if history:
+            # Insert the first (original) request at the start
+            history.insert(0, r)
+            # Get the last request made
+            r = history.pop()
+            r.history = history
+
+        # If redirects aren't being followed, store the response on the Request for Response.next().
+        if not allow_redirects:
+            try:
+                r._next = next(
+                    SessionRedirectMixin.resolve_redirects(
+                        self, r, request, yield_requests=True, **kwargs
+                    )
+                )
+            except StopIteration:
+                pass
+
+        if not stream:
+            r.content
+
+        return r
+
+    async def resolve_redirects(
+        self,
+        resp,
+        req,
+        stream=False,
+        timeout=None,
+        verify=True,
+        cert=None,
+        proxies=None,
+        yield_requests=False,
+        **adapter_kwargs,
+    ):
+        """Receives a Response. Returns an async generator of Responses or
+        Requests."""
+
+        hist = []  # keep track of history
+
+        url = self.get_redirect_target(resp)
+        previous_fragment = urlparse(req.url).fragment
+        while url:
+            # Update history and keep track of redirects.
+            # resp.history must ignore the original request in this loop
+            hist.append(resp)
+            resp.history = hist[1:]
+
+            req, previous_fragment, proxies = self.prepare_redirect(
+                resp, req, url, previous_fragment, proxies
+            )
+
+            if yield_requests:
+                yield req
+            else:
+                resp = await self.send(
+                    req,
+                    stream=stream,
+                    timeout=timeout,
+                    verify=verify,
+                    cert=cert,
+                    proxies=proxies,
+                    allow_redirects=False,
+                    **adapter_kwargs,
+                )
+
+                extract_cookies_to_jar(self.cookies, req, resp.raw)
+
+                # extract redirect url, if any, for the next loop
+                url = self.get_redirect_target(resp)
+                yield resp
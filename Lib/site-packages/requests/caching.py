@@ -0,0 +1,534 @@
+"""
+requests.caching
+~~~~~~~~~~~~~~~~
+
+This module contains a transport adapter that keeps an HTTP cache (RFC 9111)
+in front of the network, and the storage backends it can use.
+"""
+
+import email.utils
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import struct
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from io import BytesIO
+
+from urllib3.response import HTTPResponse
+
+from .adapters import HTTPAdapter
+from .structures import CaseInsensitiveDict
+
+#: Status codes that may be stored without explicit freshness information.
+HEURISTICALLY_CACHEABLE = frozenset(
+    {200, 203, 204, 300, 301, 308, 404, 405, 410, 414, 501}
+)
+
+#: Methods that invalidate the stored response for their target URI.
+INVALIDATING_METHODS = frozenset({"POST", "PUT", "PATCH", "DELETE"})
+
+# Headers that describe one particular transfer of the body.
+_HOP_HEADERS = frozenset(
+    {
+        "connection",
+        "content-encoding",
+        "content-length",
+        "keep-alive",
+        "set-cookie",
+        "transfer-encoding",
+    }
+)
+
+_ENTRY_HEADER = struct.Struct("!I")
+
+
+class BaseCache:
+    """The interface of the storage used by
+    :class:`CachingHTTPAdapter <requests.caching.CachingHTTPAdapter>`.
+    Keys are strings and values are opaque bytes."""
+
+    def get(self, key):
+        raise NotImplementedError
+
+    def set(self, key, value):
+        raise NotImplementedError
+
+    def delete(self, key):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+class MemoryCache(BaseCache):
+    """An in-memory LRU cache bounded by the total size of its values.
+
+    :param max_bytes: (optional) Size above which the least recently used
+        entries are evicted.
+    """
+
+    def __init__(self, max_bytes=64 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            value = self._data.get(key)
+            if value is not None:
+                self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        if len(value) > self.max_bytes:
+            self.delete(key)
+            return
+        with self._lock:
+            old = self._data.pop(key, None)
+            if old is not None:
+                self.size -= len(old)
+            self._data[key] = value
+            self.size += len(value)
+            while self.size > self.max_bytes:
+                _, evicted = self._data.popitem(last=False)
+                self.size -= len(evicted)
+
+    def delete(self, key):
+        with self._lock:
+            old = self._data.pop(key, None)
+            if old is not None:
+                self.size -= len(old)
+
+    def close(self):
+        with self._lock:
+            self._data.clear()
+            self.size = 0
+
+
+class FileCache(BaseCache):
+    """Stores each entry in its own file under ``directory``, sharded into
+    sub-directories by the leading characters of the key's hash.
+
+    :param directory: Root of the cache; created when missing.
+    :param shards: (optional) Number of directory levels, two hex digits each.
+    """
+
+    def __init__(self, directory, shards=2):
+        self.directory = directory
+        self.shards = shards
+
+    def _path(self, key):
+        digest = hashlib.sha256(key.encode("utf-8")).hexdigest()
+        parts = [digest[i * 2 : i * 2 + 2] for i in range(self.shards)]
+        return os.path.join(self.directory, *parts, digest)
+
+    def get(self, key):
+        try:
+            with open(self._path(key), "rb") as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def set(self, key, value):
+        path = self._path(key)
+        dirname = os.path.dirname(path)
+        os.makedirs(dirname, exist_ok=True)
+        # Write to a temporary file first so readers never see a partial entry.
+        fd, tmp = tempfile.mkstemp(dir=dirname)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(value)
+            os.replace(tmp, path)
+        except BaseException:
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+            raise
+
+    def delete(self, key):
+        try:
+            os.remove(self._path(key))
+        except OSError:
+            pass
+
+
+class SQLiteCache(BaseCache):
+    """Stores entries in a single SQLite database.
+
+    :param path: Database file, or ``":memory:"``.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        with self._db:
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS responses "
+                "(key TEXT PRIMARY KEY, value BLOB NOT NULL)"
+            )
+
+    def get(self, key):
+        with self._lock:
+            row = self._db.execute(
+                "SELECT value FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+        return bytes(row[0]) if row is not None else None
+
+    def set(self, key, value):
+        with self._lock, self._db:
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses (key, value) VALUES (?, ?)",
+                (key, sqlite3.Binary(value)),
+            )
+
+    def delete(self, key):
+        with self._lock, self._db:
+            self._db.execute("DELETE FROM responses WHERE key = ?", (key,))
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+def _parse_cache_control(value):
+    """Parses a Cache-Control header into a dict of lower-cased directives.
+
+    :rtype: dict
+    """
+    directives = {}
+    for part in (value or "").split(","):
+        name, _, arg = part.strip().partition("=")
+        if name:
+            directives[name.lower()] = arg.strip().strip('"') or None
+    return directives
+
+
+def _parse_seconds(value):
+    try:
+        return max(int(value), 0)
+    except (TypeError, ValueError):
+        return None
+
+
+def _parse_date(value):
+    if not value:
+        return None
+    try:
+        return email.utils.parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError, IndexError, OverflowError):
+        return None
+
+
+class _CacheEntry:
+    """A stored response: its status line, headers, decoded body, the time it
+    was received and the request header values named by its Vary header."""
+
+    __slots__ = ("status", "reason", "headers", "body", "received", "vary")
+
+    def __init__(self, status, reason, headers, body, received, vary):
+        self.status = status
+        self.reason = reason
+        self.headers = headers
+        self.body = body
+        self.received = received
+        self.vary = vary
+
+    def dumps(self):
+        meta = json.dumps(
+            {
+                "status": self.status,
+                "reason": self.reason,
+                "headers": list(self.headers.items()),
+                "received": self.received,
+                "vary": self.vary,
+            }
+        ).encode("utf-8")
+        return _ENTRY_HEADER.pack(len(meta)) + meta + self.body
+
+    @classmethod
+    def loads(cls, data):
+        try:
+            (size,) = _ENTRY_HEADER.unpack_from(data)
+            start = _ENTRY_HEADER.size
+            meta = json.loads(data[start : start + size].decode("utf-8"))
+            return cls(
+                meta["status"],
+                meta["reason"],
+                CaseInsensitiveDict(meta["headers"]),
+                data[start + size :],
+                meta["received"],
+                meta["vary"],
+            )
+        except (struct.error, ValueError, KeyError, TypeError):
+            # Unreadable entries (e.g. from another version) count as misses.
+            return None
+
+    def age(self, now):
+        """Current age of the response (RFC 9111, section 4.2.3)."""
+        age_value = _parse_seconds(self.headers.get("Age")) or 0
+        date = _parse_date(self.headers.get("Date"))
+        apparent_age = max(0.0, self.received - date) if date is not None else 0.0
+        return max(apparent_age, age_value) + (now - self.received)
+
+
+class CachingHTTPAdapter(HTTPAdapter):
+    """An :class:`HTTPAdapter <requests.adapters.HTTPAdapter>` that answers
+    ``GET`` requests from a private HTTP cache when it can.
+
+    Fresh responses are served without touching the network. Stale ones that
+    carry an ``ETag`` or ``Last-Modified`` validator are revalidated with a
+    conditional request and served from the cache on ``304 Not Modified``.
+    Responses served from the cache have ``from_cache`` set to ``True``.
+
+    Only non-streamed responses (``stream=False``) are stored, since storing
+    requires reading the whole body.
+
+    :param cache: (optional) A :class:`BaseCache` to store responses in.
+        Defaults to a :class:`MemoryCache`.
+    :param heuristics: (optional) Mapping or iterable of
+        ``(pattern, seconds)`` pairs. The freshness lifetime of a response
+        whose URL matches the regular expression ``pattern`` is ``seconds``,
+        regardless of what the server said. Responses with
+        ``Cache-Control: no-store`` are still never stored.
+    :param \\*\\*kwargs: Passed on to :class:`HTTPAdapter`.
+
+    Usage::
+
+      >>> import requests
+      >>> from requests.caching import CachingHTTPAdapter, SQLiteCache
+      >>> s = requests.Session()
+      >>> a = CachingHTTPAdapter(
+      ...     cache=SQLiteCache('responses.db'),
+      ...     heuristics={r'/lol/match/v5/matches/[^/]+$': 365 * 24 * 3600},
+      ... )
+      >>> s.mount('https://', a)
+    """
+
+    __attrs__ = HTTPAdapter.__attrs__ + ["cache", "heuristics"]
+
+    def __init__(self, cache=None, heuristics=None, **kwargs):
+        self.cache = cache if cache is not None else MemoryCache()
+        if hasattr(heuristics, "items"):
+            heuristics = heuristics.items()
+        self.heuristics = list(heuristics or ())
+        self._init_cache_state()
+        super().__init__(**kwargs)
+
+    def __setstate__(self, state):
+        super().__setstate__(state)
+        self._init_cache_state()
+
+    def _init_cache_state(self):
+        self._heuristics = [
+            (re.compile(pattern), seconds) for pattern, seconds in self.heuristics
+        ]
+        self._lock = threading.Lock()
+        #: Requests answered from the cache without a network round trip.
+        self.hits = 0
+        #: Requests that had no usable stored response.
+        self.misses = 0
+        #: Stale responses confirmed by a ``304 Not Modified``.
+        self.revalidations = 0
+        #: Body bytes served from the cache instead of the network.
+        self.bytes_saved = 0
+
+    def _count(self, name, body=None):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+            if body is not None:
+                self.bytes_saved += len(body)
+
+    def cache_key(self, request):
+        """Returns the key the response to ``request`` is stored under.
+
+        This should not be called from user code, and is only exposed for use
+        when subclassing the
+        :class:`CachingHTTPAdapter <requests.caching.CachingHTTPAdapter>`.
+
+        :rtype: str
+        """
+        return request.url.partition("#")[0]
+
+    def freshness_lifetime(self, url, headers):
+        """Returns how long, in seconds, a response stays fresh.
+
+        This should not be called from user code, and is only exposed for use
+        when subclassing the
+        :class:`CachingHTTPAdapter <requests.caching.CachingHTTPAdapter>`.
+
+        :param url: The URL of the request.
+        :param headers: The headers of the stored response.
+        :rtype: float
+        """
+        for pattern, seconds in self._heuristics:
+            if pattern.search(url):
+                return seconds
+
+        cc = _parse_cache_control(headers.get("Cache-Control"))
+        if "no-cache" in cc:
+            return 0
+        max_age = _parse_seconds(cc.get("max-age"))
+        if max_age is not None:
+            return max_age
+
+        date = _parse_date(headers.get("Date"))
+        if "Expires" in headers:
+            expires = _parse_date(headers["Expires"])
+            if expires is None or date is None:
+                return 0
+            return max(0.0, expires - date)
+
+        # Heuristic freshness: 10% of the time since the last modification.
+        last_modified = _parse_date(headers.get("Last-Modified"))
+        if date is not None and last_modified is not None:
+            return max(0.0, (date - last_modified) / 10)
+        return 0
+
+    def _is_storable(self, request, response):
+        if response.status_code not in HEURISTICALLY_CACHEABLE:
+            return False
+        if "no-store" in _parse_cache_control(request.headers.get("Cache-Control")):
+            return False
+        headers = response.headers
+        cc = _parse_cache_control(headers.get("Cache-Control"))
+        if "no-store" in cc or headers.get("Vary", "").strip() == "*":
+            return False
+        return bool(
+            cc.keys() & {"max-age", "no-cache", "public", "private"}
+            or "Expires" in headers
+            or "ETag" in headers
+            or "Last-Modified" in headers
+            or any(p.search(request.url) for p, _ in self._heuristics)
+        )
+
+    def _vary(self, request, headers):
+        names = [
+            name.strip().lower()
+            for name in headers.get("Vary", "").split(",")
+            if name.strip()
+        ]
+        return {name: request.headers.get(name) for name in names}
+
+    def _lookup(self, request):
+        data = self.cache.get(self.cache_key(request))
+        if data is None:
+            return None
+        entry = _CacheEntry.loads(data)
+        if entry is None or entry.vary != self._vary(request, entry.headers):
+            return None
+        return entry
+
+    def _store(self, request, response, received):
+        headers = CaseInsensitiveDict(
+            (name, value)
+            for name, value in response.headers.items()
+            if name.lower() not in _HOP_HEADERS
+        )
+        entry = _CacheEntry(
+            response.status_code,
+            response.reason,
+            headers,
+            response.content,
+            received,
+            self._vary(request, headers),
+        )
+        self.cache.set(self.cache_key(request), entry.dumps())
+
+    def _update(self, request, entry, response, received):
+        """Freshens ``entry`` with the headers of a 304 (RFC 9111, 4.3.4)."""
+        for name, value in response.headers.items():
+            if name.lower() not in _HOP_HEADERS:
+                entry.headers[name] = value
+        entry.received = received
+        self.cache.set(self.cache_key(request), entry.dumps())
+
+    def _cached_response(self, request, entry):
+        headers = dict(entry.headers)
+        headers["Content-Length"] = str(len(entry.body))
+        raw = HTTPResponse(
+            body=BytesIO(entry.body),
+            headers=headers,
+            status=entry.status,
+            reason=entry.reason,
+            preload_content=False,
+            decode_content=False,
+            request_method=request.method,
+            request_url=request.url,
+        )
+        response = self.build_response(request, raw)
+        response.from_cache = True
+        return response
+
+    def send(self, request, **kwargs):
+        """Sends PreparedRequest object, or answers it from the cache.
+        Returns Response object.
+
+        :param request: The :class:`PreparedRequest <PreparedRequest>` being sent.
+        :param \\*\\*kwargs: Passed on to :meth:`HTTPAdapter.send`.
+        :rtype: requests.Response
+        """
+        if request.method != "GET":
+            response = super().send(request, **kwargs)
+            if request.method in INVALIDATING_METHODS and response.status_code < 400:
+                self.cache.delete(self.cache_key(request))
+            response.from_cache = False
+            return response
+
+        request_cc = _parse_cache_control(request.headers.get("Cache-Control"))
+        if "no-store" in request_cc:
+            self._count("misses")
+            response = super().send(request, **kwargs)
+            response.from_cache = False
+            return response
+
+        now = time.time()
+        entry = self._lookup(request)
+        if entry is not None:
+            lifetime = self.freshness_lifetime(request.url, entry.headers)
+            max_age = _parse_seconds(request_cc.get("max-age"))
+            if max_age is not None:
+                lifetime = min(lifetime, max_age)
+            if "no-cache" not in request_cc and entry.age(now) < lifetime:
+                self._count("hits", entry.body)
+                return self._cached_response(request, entry)
+
+            validators = {}
+            if "ETag" in entry.headers:
+                validators["If-None-Match"] = entry.headers["ETag"]
+            if "Last-Modified" in entry.headers:
+                validators["If-Modified-Since"] = entry.headers["Last-Modified"]
+            if validators:
+                conditional = request.copy()
+                conditional.headers.update(validators)
+                response = super().send(conditional, **kwargs)
+                if response.status_code == 304:
+                    response.close()
+                    self._update(request, entry, response, time.time())
+                    self._count("revalidations", entry.body)
+                    return self._cached_response(request, entry)
+                response.request = request
+                self._count("misses")
+                return self._maybe_store(request, response, kwargs)
+
+        self._count("misses")
+        response = super().send(request, **kwargs)
+        return self._maybe_store(request, response, kwargs)
+
+    def _maybe_store(self, request, response, kwargs):
+        response.from_cache = False
+        if not kwargs.get("stream") and self._is_storable(request, response):
+            self._store(request, response, time.time())
+        return response
+
+    def close(self):
+        """Disposes of any internal state and closes the cache backend."""
+        super().close()
+        self.cache.close()
@@ -0,0 +1,375 @@
+"""
+requests.downloads
+~~~~~~~~~~~~~~~~~~
+
+This module implements :meth:`Session.download <requests.Session.download>`:
+streaming a response body into a file with constant memory use, resuming
+with ``Range`` requests when the connection drops, and optionally fetching
+the body as several ranges at once.
+"""
+
+import hashlib
+import os
+import re
+import threading
+from concurrent.futures import FIRST_EXCEPTION, ThreadPoolExecutor, wait
+
+from .exceptions import ChecksumMismatch, ChunkedEncodingError, ConnectionError
+from .structures import CaseInsensitiveDict
+
+#: Size of the buffer the body is read into.
+DOWNLOAD_BUFFER_SIZE = 1024 * 1024
+
+#: Bodies are not split into segments smaller than this.
+MIN_SEGMENT_SIZE = 1024 * 1024
+
+_CONTENT_RANGE = re.compile(r"bytes\s+(\d+)-(\d+)/(\d+|\*)", re.I)
+
+
+def _content_length(response):
+    """Returns the length of the body, or None when it is not known up front.
+
+    :rtype: int
+    """
+    if response.headers.get("Content-Encoding", "identity") != "identity":
+        return None
+    try:
+        length = int(response.headers["Content-Length"])
+    except (KeyError, ValueError):
+        return None
+    return length if length >= 0 else None
+
+
+def _content_range_start(response):
+    match = _CONTENT_RANGE.match(response.headers.get("Content-Range", ""))
+    return int(match.group(1)) if match else None
+
+
+def _preallocate(fd, size):
+    """Reserves ``size`` bytes for the file so that writes never have to grow
+    it (and, where supported, so that running out of disk fails early)."""
+    if hasattr(os, "posix_fallocate"):
+        try:
+            os.posix_fallocate(fd, 0, size)
+        except OSError:
+            # Not supported by every filesystem.
+            pass
+    # Also drops whatever an existing file held past ``size``.
+    os.ftruncate(fd, size)
+
+
+if hasattr(os, "pwrite"):
+
+    def _write_at(fd, data, offset):
+        while data:
+            written = os.pwrite(fd, data, offset)
+            data = data[written:]
+            offset += written
+
+else:  # Windows
+    # Seeking and writing must not interleave between segments.
+    _write_lock = threading.Lock()
+
+    def _write_at(fd, data, offset):
+        with _write_lock:
+            os.lseek(fd, offset, os.SEEK_SET)
+            while data:
+                data = data[os.write(fd, data) :]
+
+
+def _open(path):
+    flags = os.O_RDWR | os.O_CREAT | getattr(os, "O_BINARY", 0)
+    return os.open(path, flags, 0o666)
+
+
+class _Stopped(Exception):
+    """Another segment failed, so this one was given up."""
+
+
+class _FileWriter:
+    """Writes a response body into ``fd`` from ``offset`` on, keeping track of
+    how far it got so that an interrupted body can be resumed. Once ``stop``
+    is set, writing is given up after the current chunk."""
+
+    __slots__ = ("fd", "offset", "hasher", "stop")
+
+    def __init__(self, fd, offset=0, hasher=None, stop=None):
+        self.fd = fd
+        self.offset = offset
+        self.hasher = hasher
+        self.stop = stop
+
+    def write_body(self, response, buffer):
+        for chunk in response.iter_into(buffer):
+            if self.stop is not None and self.stop.is_set():
+                raise _Stopped()
+            _write_at(self.fd, chunk, self.offset)
+            self.offset += len(chunk)
+            if self.hasher is not None:
+                self.hasher.update(chunk)
+
+
+def _new_hasher(hash_name):
+    return hashlib.new(hash_name) if hash_name is not None else None
+
+
+def _validator(response):
+    """Returns a value for ``If-Range`` so that a resumed request does not
+    stitch together two versions of the resource."""
+    etag = response.headers.get("ETag")
+    if etag and not etag.startswith("W/"):
+        return etag
+    return response.headers.get("Last-Modified")
+
+
+def _hash_file(path, hash_name, buffer):
+    hasher = hashlib.new(hash_name)
+    view = memoryview(buffer)
+    with open(path, "rb") as f:
+        while True:
+            n = f.readinto(view)
+            if not n:
+                return hasher
+            hasher.update(view[:n])
+
+
+def _get_range(session, url, headers, start, end, validator, kwargs):
+    """Requests the bytes from ``start`` up to ``end`` (inclusive, or up to
+    the end of the body when None). A ``200`` means the server sent the
+    whole body instead; any other answer than those two and a matching
+    ``206`` raises.
+
+    :rtype: requests.Response
+    """
+    range_headers = headers.copy()
+    range_headers["Range"] = f"bytes={start}-{'' if end is None else end}"
+    if validator:
+        range_headers["If-Range"] = validator
+    response = session.get(url, headers=range_headers, **kwargs)
+    if response.status_code == 200 or (
+        response.status_code == 206 and _content_range_start(response) == start
+    ):
+        return response
+    response.close()
+    response.raise_for_status()
+    raise ChunkedEncodingError(
+        f"Unexpected Content-Range {response.headers.get('Content-Range')!r} "
+        f"for bytes from {start}",
+        response=response,
+    )
+
+
+def _download_stream(
+    session, url, path, headers, hash_name, max_resumes, buffer, kwargs
+):
+    response = session.get(url, headers=headers, **kwargs)
+    response.raise_for_status()
+
+    fd = _open(path)
+    try:
+        total = _content_length(response)
+        if total is not None:
+            _preallocate(fd, total)
+        validator = _validator(response)
+
+        writer = _FileWriter(fd, hasher=_new_hasher(hash_name))
+        resumes = 0
+        while True:
+            try:
+                if response is None:
+                    response = _get_range(
+                        session, url, headers, writer.offset, None, validator, kwargs
+                    )
+                    if response.status_code == 200:
+                        # The server ignored the range, or the resource changed.
+                        writer = _FileWriter(fd, hasher=_new_hasher(hash_name))
+                writer.write_body(response, buffer)
+                break
+            except (ChunkedEncodingError, ConnectionError):
+                if response is not None:
+                    response.close()
+                if resumes >= max_resumes:
+                    raise
+                resumes += 1
+                # Failing to reopen the range counts as a resume too.
+                response = None
+
+        os.ftruncate(fd, writer.offset)
+    finally:
+        os.close(fd)
+
+    if writer.hasher is not None:
+        response.digest = writer.hasher.hexdigest()
+    return response
+
+
+class _RangeIgnored(Exception):
+    """A segment was answered with the whole body."""
+
+
+def _download_segment(
+    session,
+    url,
+    headers,
+    fd,
+    start,
+    end,
+    validator,
+    max_resumes,
+    buffer_size,
+    stop,
+    kwargs,
+):
+    buffer = bytearray(buffer_size)
+    writer = _FileWriter(fd, offset=start, stop=stop)
+    resumes = 0
+    while True:
+        if stop.is_set():
+            raise _Stopped()
+        response = None
+        try:
+            response = _get_range(
+                session, url, headers, writer.offset, end, validator, kwargs
+            )
+            if response.status_code == 200:
+                response.close()
+                raise _RangeIgnored()
+            writer.write_body(response, buffer)
+        except (ChunkedEncodingError, ConnectionError):
+            if response is not None:
+                response.close()
+            if resumes >= max_resumes:
+                raise
+            resumes += 1
+            continue
+        except _Stopped:
+            response.close()
+            raise
+        if writer.offset != end + 1:
+            raise ChunkedEncodingError(
+                f"Segment {start}-{end} ended at {writer.offset}", response=response
+            )
+        return
+
+
+def _download_segmented(
+    session, url, path, headers, hash_name, max_resumes, buffer, segments, kwargs
+):
+    """Fetches the body as up to ``segments`` concurrent ranges. Returns None
+    when the server does not support ranges or the body is too small to be
+    worth splitting.
+
+    :rtype: requests.Response
+    """
+    head_kwargs = dict(kwargs, stream=False)
+    head_kwargs.setdefault("allow_redirects", True)
+    head = session.head(url, headers=headers, **head_kwargs)
+    head.raise_for_status()
+
+    total = _content_length(head)
+    if "bytes" not in head.headers.get("Accept-Ranges", "").lower() or not total:
+        return None
+
+    # Keep every segment on its own pooled connection.
+    url = head.url
+    pool_maxsize = getattr(session.get_adapter(url), "_pool_maxsize", None)
+    segments = min(segments, total // MIN_SEGMENT_SIZE, pool_maxsize or segments)
+    if segments < 2:
+        return None
+
+    validator = _validator(head)
+    size = -(-total // segments)
+    bounds = [(start, min(start + size, total) - 1) for start in range(0, total, size)]
+
+    stop = threading.Event()
+    fd = _open(path)
+    try:
+        _preallocate(fd, total)
+        with ThreadPoolExecutor(max_workers=len(bounds)) as executor:
+            futures = [
+                executor.submit(
+                    _download_segment,
+                    session,
+                    url,
+                    headers,
+                    fd,
+                    start,
+                    end,
+                    validator,
+                    max_resumes,
+                    len(buffer),
+                    stop,
+                    kwargs,
+                )
+                for start, end in bounds
+            ]
+            try:
+                done, _ = wait(futures, return_when=FIRST_EXCEPTION)
+                for future in done:
+                    future.result()
+            except BaseException:
+                # Stop the other segments rather than waiting for them; the
+                # running ones give up after their current chunk, before fd
+                # is closed.
+                stop.set()
+                for future in futures:
+                    future.cancel()
+                raise
+    except _RangeIgnored:
+        return None
+    finally:
+        os.close(fd)
+
+    if hash_name is not None:
+        head.digest = _hash_file(path, hash_name, buffer).hexdigest()
+    return head
+
+
+def download(
+    session,
+    url,
+    path,
+    hash_name=None,
+    expected_digest=None,
+    max_resumes=5,
+    buffer_size=DOWNLOAD_BUFFER_SIZE,
+    segments=1,
+    **kwargs,
+):
+    """Implements :meth:`Session.download <requests.Session.download>`.
+
+    :rtype: requests.Response
+    """
+    if expected_digest is not None and hash_name is None:
+        raise ValueError("expected_digest requires hash_name.")
+
+    headers = CaseInsensitiveDict(kwargs.pop("headers", None) or {})
+    # Resuming needs byte offsets into the body as it is stored.
+    headers.setdefault("Accept-Encoding", "identity")
+    kwargs["stream"] = True
+    buffer = bytearray(buffer_size)
+
+    response = None
+    if segments > 1:
+        response = _download_segmented(
+            session,
+            url,
+            path,
+            headers,
+            hash_name,
+            max_resumes,
+            buffer,
+            segments,
+            kwargs,
+        )
+    if response is None:
+        response = _download_stream(
+            session, url, path, headers, hash_name, max_resumes, buffer, kwargs
+        )
+
+    if expected_digest is not None and response.digest != expected_digest.lower():
+        raise ChecksumMismatch(
+            f"{hash_name} of {url} is {response.digest}, expected {expected_digest}",
+            response=response,
+        )
+    return response
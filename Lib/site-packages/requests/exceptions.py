@@ -136,6 +136,10 @@ class UnrewindableBodyError(RequestException):
     """Requests encountered an error when trying to rewind a body."""
 
 
+class ChecksumMismatch(RequestException):
+    """The downloaded content does not match the expected digest."""
+
+
 # Warnings
 
 
@@ -0,0 +1,76 @@
+"""
+requests.jsoncodecs
+~~~~~~~~~~~~~~~~~~~
+
+This module holds the JSON codecs a :class:`Session <requests.Session>` can
+encode ``json=`` request bodies and decode :meth:`Response.json
+<requests.Response.json>` with.
+
+A codec is any object with ``loads(bytes)`` and ``dumps(obj)`` returning
+bytes (or str, which is then encoded to UTF-8), such as the ``orjson`` or
+``msgspec.json`` modules. Codecs are set by name or as objects::
+
+    s = requests.Session()
+    s.json_codec = "orjson"
+"""
+
+import importlib
+import threading
+
+from .compat import json as complexjson
+
+
+class DefaultJSONCodec:
+    """The codec used when none is set: :mod:`simplejson` if installed,
+    otherwise :mod:`json`, with Requests' usual options."""
+
+    name = "json"
+
+    @staticmethod
+    def loads(data, **kwargs):
+        return complexjson.loads(data, **kwargs)
+
+    @staticmethod
+    def dumps(obj):
+        return complexjson.dumps(obj, allow_nan=False)
+
+
+DEFAULT_JSON_CODEC = DefaultJSONCodec()
+
+_codecs = {"json": DEFAULT_JSON_CODEC}
+_codecs_lock = threading.Lock()
+
+
+def register_json_codec(name, codec):
+    """Registers ``codec`` under ``name``, replacing any codec already
+    registered with that name."""
+    if not (
+        callable(getattr(codec, "loads", None))
+        and callable(getattr(codec, "dumps", None))
+    ):
+        raise TypeError(f"JSON codec {codec!r} must have loads() and dumps().")
+    with _codecs_lock:
+        _codecs[name] = codec
+
+
+def get_json_codec(codec=None):
+    """Returns the codec ``codec`` names, or ``codec`` itself if it is a
+    codec object. None is the default codec. Names that were not registered
+    are imported as modules (``"orjson"``, ``"msgspec.json"``) and registered.
+
+    :raises ValueError: If there is no codec by that name.
+    """
+    if codec is None:
+        return DEFAULT_JSON_CODEC
+    if not isinstance(codec, str):
+        return codec
+    try:
+        return _codecs[codec]
+    except KeyError:
+        pass
+    try:
+        module = importlib.import_module(codec)
+    except ImportError:
+        raise ValueError(f"No JSON codec named {codec!r}.")
+    register_json_codec(codec, module)
+    return module
@@ -0,0 +1,354 @@
+"""
+requests.jsonstream
+~~~~~~~~~~~~~~~~~~~
+
+This module implements the incremental JSON access of
+:meth:`Response.iter_json_items <requests.Response.iter_json_items>` and
+:meth:`Response.json(fields=...) <requests.Response.json>`.
+
+The body is scanned as it is decoded: values nobody asked for are skipped
+over without being built, and only the wanted ones are handed to the JSON
+decoder, one at a time. Memory use is bounded by the largest of those
+values rather than by the whole document.
+"""
+
+import codecs
+import re
+
+from .compat import JSONDecodeError as CompatJSONDecodeError
+from .compat import json as complexjson
+from .exceptions import JSONDecodeError
+from .utils import guess_json_utf
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+# A string, as much of it as the buffer holds (group 1 is its closing
+# quote), or an opening (2) or closing (3) bracket.
+_TOKEN = re.compile(r'"(?:[^"\\]|\\.)*(")?|([\[{])|([\]}])', re.S)
+_STRING_SPECIAL = re.compile(r'["\\]')
+_SCALAR_END = re.compile(r"[ \t\n\r,:\]}]")
+
+_PLAIN_DECODER = complexjson.JSONDecoder()
+_INCOMPLETE = object()
+
+
+class _Scanner:
+    """Walks a JSON document given as an iterator of text chunks.
+
+    ``pos`` is the index in ``buf`` of the next character to read. ``buf``
+    only holds what is left of the current chunk, plus whatever is needed
+    of the previous ones to finish the value being kept.
+    """
+
+    def __init__(self, chunks, cls=None, **kwargs):
+        self._chunks = chunks
+        self._decoder = (cls or complexjson.JSONDecoder)(**kwargs)
+        self.buf = ""
+        self.pos = 0
+
+    def _more(self, keep):
+        """Reads the next chunk, keeping ``buf`` from index ``keep`` on.
+        Returns False at the end of the document."""
+        for chunk in self._chunks:
+            if chunk:
+                self.buf = self.buf[keep:] + chunk
+                self.pos = 0
+                return True
+        return False
+
+    def _error(self, msg):
+        return JSONDecodeError(msg, self.buf, min(self.pos, len(self.buf)))
+
+    def peek(self):
+        """Skips whitespace and returns the next character, or an empty
+        string at the end of the document."""
+        while True:
+            self.pos = _WHITESPACE.match(self.buf, self.pos).end()
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self._more(self.pos):
+                return ""
+
+    def expect(self, chars):
+        """Consumes the next character, which must be one of ``chars``."""
+        c = self.peek()
+        if not c or c not in chars:
+            raise self._error(f"Expecting one of {chars!r}")
+        self.pos += 1
+        return c
+
+    def read(self, keep=True):
+        """Consumes the value starting at the next character and returns its
+        text, or None when ``keep`` is false."""
+        if not self.peek():
+            raise self._error("Expecting value")
+        buf = self.buf
+        start = i = self.pos
+        parts = []
+        scalar = buf[i] not in '"[{'
+        depth = 0
+        in_string = False
+        while True:
+            if in_string:
+                m = _STRING_SPECIAL.search(buf, i)
+                if m is None:
+                    i = len(buf)
+                elif m.group() == '"':
+                    i = m.end()
+                    in_string = False
+                    if depth == 0:
+                        break
+                    continue
+                elif m.end() < len(buf):
+                    # Skip the escaped character.
+                    i = m.end() + 1
+                    continue
+                else:
+                    # The escaped character is in the next chunk.
+                    i = m.start()
+            elif scalar:
+                m = _SCALAR_END.search(buf, i)
+                if m is not None:
+                    i = m.start()
+                    break
+                i = len(buf)
+            else:
+                done = False
+                for m in _TOKEN.finditer(buf, i):
+                    kind = m.lastindex
+                    if kind == 2:
+                        depth += 1
+                        continue
+                    i = m.end()
+                    if kind == 3:
+                        depth -= 1
+                    elif kind is None:
+                        # The string goes on in the next chunk.
+                        in_string = True
+                        break
+                    if depth == 0:
+                        done = True
+                        break
+                else:
+                    i = len(buf)
+                if done:
+                    break
+                if in_string:
+                    continue
+
+            if keep:
+                parts.append(buf[start:i])
+            if not self._more(i):
+                if scalar:
+                    break
+                raise self._error("Unterminated value")
+            buf = self.buf
+            start = i = 0
+
+        self.pos = i
+        if keep:
+            parts.append(buf[start:i])
+            return "".join(parts)
+        return None
+
+    def _decode_buffered(self, decoder):
+        """Decodes the next value if ``buf`` holds all of it, which the JSON
+        decoder does far faster than :meth:`read` scans it."""
+        try:
+            value, end = decoder.raw_decode(self.buf, self.pos)
+        except CompatJSONDecodeError:
+            return _INCOMPLETE
+        if end >= len(self.buf) or not _SCALAR_END.match(self.buf, end):
+            # A number may go on in the next chunk ("1." of "1.5").
+            return _INCOMPLETE
+        self.pos = end
+        return value
+
+    def decode(self, decoder=None):
+        """Consumes the next value and returns it decoded."""
+        decoder = decoder or self._decoder
+        if not self.peek():
+            raise self._error("Expecting value")
+        value = self._decode_buffered(decoder)
+        if value is not _INCOMPLETE:
+            return value
+        try:
+            return decoder.decode(self.read())
+        except CompatJSONDecodeError as e:
+            raise JSONDecodeError(e.msg, e.doc, e.pos)
+
+    def skip(self):
+        """Consumes the next value. Only the values the buffer holds whole
+        are decoded, and dropped, so memory use stays bounded."""
+        if not self.peek():
+            raise self._error("Expecting value")
+        if self._decode_buffered(_PLAIN_DECODER) is not _INCOMPLETE:
+            return
+        c = self.buf[self.pos]
+        if c == "{":
+            for _ in self.members():
+                self.skip()
+        elif c == "[":
+            for _ in self.elements():
+                self.skip()
+        else:
+            self.read(keep=False)
+
+    def members(self):
+        """Consumes an object, yielding each of its keys while positioned on
+        the key's value, which the caller must consume."""
+        self.expect("{")
+        if self.peek() == "}":
+            self.pos += 1
+            return
+        while True:
+            if self.peek() != '"':
+                raise self._error("Expecting property name enclosed in double quotes")
+            key = self.decode(_PLAIN_DECODER)
+            self.expect(":")
+            yield key
+            if self.expect(",}") == "}":
+                return
+
+    def elements(self):
+        """Consumes an array, yielding while positioned on each element,
+        which the caller must consume."""
+        self.expect("[")
+        if self.peek() == "]":
+            self.pos += 1
+            return
+        while True:
+            yield
+            if self.expect(",]") == "]":
+                return
+
+    def seek(self, path):
+        """Consumes the document up to the value at ``path``, a sequence of
+        object keys and array indices. Returns False when there is no such
+        value."""
+        for key in path:
+            c = self.peek()
+            if c == "[" and str(key).isdigit():
+                for index, _ in enumerate(self.elements()):
+                    if index == int(key):
+                        break
+                    self.skip()
+                else:
+                    return False
+            elif c == "{":
+                for name in self.members():
+                    if name == str(key):
+                        break
+                    self.skip()
+                else:
+                    return False
+            else:
+                self.skip()
+                return False
+        return True
+
+    def project(self, tree):
+        """Consumes the next value and returns the parts of it selected by
+        ``tree``, a dict mapping keys to subtrees, or to None for the whole
+        value. Arrays are projected element by element."""
+        c = self.peek()
+        if c == "{":
+            result = {}
+            for key in self.members():
+                subtree = tree.get(key, _SKIP)
+                if subtree is _SKIP:
+                    self.skip()
+                elif subtree is None:
+                    result[key] = self.decode()
+                else:
+                    result[key] = self.project(subtree)
+            return result
+        if c == "[":
+            return [self.project(tree) for _ in self.elements()]
+        return self.decode()
+
+    def finish(self):
+        """Consumes whatever is left of the document."""
+        if self.peek():
+            raise self._error("Extra data")
+
+    def drain(self):
+        """Reads the rest of the input without looking at it."""
+        for _ in self._chunks:
+            pass
+
+
+_SKIP = object()
+
+
+def _split_path(path):
+    if path is None:
+        return ()
+    if isinstance(path, str):
+        return tuple(path.split(".")) if path else ()
+    return tuple(path)
+
+
+def _field_tree(fields):
+    tree = {}
+    for field in fields:
+        path = _split_path(field)
+        if not path:
+            raise ValueError("fields must not contain an empty path.")
+        node = tree
+        for key in path[:-1]:
+            child = node.setdefault(key, {})
+            if child is None:
+                # A parent of this field is already selected whole.
+                break
+            node = child
+        else:
+            node[path[-1]] = None
+    return tree
+
+
+def _iter_text(response, chunk_size):
+    """Decodes the body of ``response`` chunk by chunk."""
+    chunks = response.iter_content(chunk_size)
+    encoding = response.encoding
+    if not encoding:
+        # RFC 4627 section 3: UTF-8, -16 or -32, told by the first bytes.
+        first = b""
+        for chunk in chunks:
+            first += chunk
+            if len(first) >= 4:
+                break
+        encoding = guess_json_utf(first) or "utf-8"
+        chunks = _prepend(first, chunks)
+    decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+    for chunk in chunks:
+        yield decoder.decode(chunk)
+    yield decoder.decode(b"", final=True)
+
+
+def _prepend(first, chunks):
+    yield first
+    yield from chunks
+
+
+def iter_json_items(response, path, chunk_size, **kwargs):
+    """Yields the decoded elements of the array at ``path`` in the body of
+    ``response``. See :meth:`Response.iter_json_items`."""
+    scanner = _Scanner(_iter_text(response, chunk_size), **kwargs)
+    if scanner.seek(_split_path(path)):
+        if scanner.peek() == "n":
+            # null, as good as an empty array.
+            scanner.skip()
+        else:
+            for _ in scanner.elements():
+                yield scanner.decode()
+    # Read the rest, so that the connection can be released.
+    scanner.drain()
+
+
+def project_json(response, fields, chunk_size, **kwargs):
+    """Returns the ``fields`` of the JSON body of ``response``. See
+    :meth:`Response.json`."""
+    scanner = _Scanner(_iter_text(response, chunk_size), **kwargs)
+    result = scanner.project(_field_tree(fields))
+    scanner.finish()
+    return result
@@ -5,7 +5,9 @@ requests.models
 This module contains the primary objects that power Requests.
 """
 
+import codecs
 import datetime
+import functools
 
 # Import encoding now, to avoid implicit import later.
 # Implicit import within threads may cause LookupError when standard library is in a ZIP,
@@ -51,6 +53,9 @@ from .exceptions import MissingSchema
 from .exceptions import SSLError as RequestsSSLError
 from .exceptions import StreamConsumedError
 from .hooks import default_hooks
+from .jsoncodecs import DEFAULT_JSON_CODEC, get_json_codec
+from .jsonstream import iter_json_items as _iter_json_items
+from .jsonstream import project_json as _project_json
 from .status_codes import codes
 from .structures import CaseInsensitiveDict
 from .utils import (
@@ -77,10 +82,69 @@ REDIRECT_STATI = (
 )
 
 DEFAULT_REDIRECT_LIMIT = 30
+URL_CACHE_SIZE = 1024
 CONTENT_CHUNK_SIZE = 10 * 1024
 ITER_CHUNK_SIZE = 512
 
 
+def _canonicalize_url(url, enc_params, get_idna_encoded_host):
+    """Returns the URL :meth:`PreparedRequest.prepare_url` prepares from an
+    HTTP ``url`` and the encoded ``params``."""
+    # Support for unicode domain names and paths.
+    try:
+        scheme, auth, host, port, path, query, fragment = parse_url(url)
+    except LocationParseError as e:
+        raise InvalidURL(*e.args)
+
+    if not scheme:
+        raise MissingSchema(
+            f"Invalid URL {url!r}: No scheme supplied. "
+            f"Perhaps you meant https://{url}?"
+        )
+
+    if not host:
+        raise InvalidURL(f"Invalid URL {url!r}: No host supplied")
+
+    # In general, we want to try IDNA encoding the hostname if the string contains
+    # non-ASCII characters. This allows users to automatically get the correct IDNA
+    # behaviour. For strings containing only ASCII characters, we need to also verify
+    # it doesn't start with a wildcard (*), before allowing the unencoded hostname.
+    if not unicode_is_ascii(host):
+        try:
+            host = get_idna_encoded_host(host)
+        except UnicodeError:
+            raise InvalidURL("URL has an invalid label.")
+    elif host.startswith(("*", ".")):
+        raise InvalidURL("URL has an invalid label.")
+
+    # Carefully reconstruct the network location
+    netloc = auth or ""
+    if netloc:
+        netloc += "@"
+    netloc += host
+    if port:
+        netloc += f":{port}"
+
+    # Bare domains aren't valid URLs.
+    if not path:
+        path = "/"
+
+    if enc_params:
+        if query:
+            query = f"{query}&{enc_params}"
+        else:
+            query = enc_params
+
+    return requote_uri(urlunparse([scheme, netloc, path, None, query, fragment]))
+
+
+# Applications request the same URLs again and again: their preparation is
+# memoized, keeping the last URL_CACHE_SIZE ones.
+_canonicalize_url_cached = functools.lru_cache(maxsize=URL_CACHE_SIZE)(
+    _canonicalize_url
+)
+
+
 class RequestEncodingMixin:
     @property
     def path_url(self):
@@ -347,6 +411,8 @@ class PreparedRequest(RequestEncodingMixin, RequestHooksMixin):
         self.hooks = default_hooks()
         #: integer denoting starting position of a readable file-like body.
         self._body_position = None
+        # (url, parsed url) of the last parsed_url lookup.
+        self._parsed_url = None
 
     def prepare(
         self,
@@ -360,6 +426,7 @@ class PreparedRequest(RequestEncodingMixin, RequestHooksMixin):
         cookies=None,
         hooks=None,
         json=None,
+        json_codec=None,
     ):
         """Prepares the entire request with the given parameters."""
 
@@ -367,7 +434,7 @@ class PreparedRequest(RequestEncodingMixin, RequestHooksMixin):
         self.prepare_url(url, params)
         self.prepare_headers(headers)
         self.prepare_cookies(cookies)
-        self.prepare_body(data, files, json)
+        self.prepare_body(data, files, json, json_codec)
         self.prepare_auth(auth, url)
 
         # Note that prepare_auth must be last to enable authentication schemes
@@ -388,8 +455,24 @@ class PreparedRequest(RequestEncodingMixin, RequestHooksMixin):
         p.body = self.body
         p.hooks = self.hooks
         p._body_position = self._body_position
+        p._parsed_url = getattr(self, "_parsed_url", None)
         return p
 
+    @property
+    def parsed_url(self):
+        """The :class:`urllib3.util.Url` of :attr:`url`.
+
+        It is parsed once per URL, with urllib3's memoized
+        :func:`~urllib3.util.parse_url`, and reused by the adapter and urllib3
+        rather than parsing :attr:`url` again. Assigning :attr:`url` (as
+        redirects do) is picked up on the next access.
+        """
+        # Instances unpickled from older versions have no _parsed_url.
+        cached = getattr(self, "_parsed_url", None)
+        if cached is None or cached[0] != self.url:
+            cached = self._parsed_url = (self.url, parse_url(self.url))
+        return cached[1]
+
     def prepare_method(self, method):
         """Prepares the given HTTP method."""
         self.method = method
@@ -428,57 +511,15 @@ class PreparedRequest(RequestEncodingMixin, RequestHooksMixin):
             self.url = url
             return
 
-        # Support for unicode domain names and paths.
-        try:
-            scheme, auth, host, port, path, query, fragment = parse_url(url)
-        except LocationParseError as e:
-            raise InvalidURL(*e.args)
-
-        if not scheme:
-            raise MissingSchema(
-                f"Invalid URL {url!r}: No scheme supplied. "
-                f"Perhaps you meant https://{url}?"
-            )
-
-        if not host:
-            raise InvalidURL(f"Invalid URL {url!r}: No host supplied")
-
-        # In general, we want to try IDNA encoding the hostname if the string contains
-        # non-ASCII characters. This allows users to automatically get the correct IDNA
-        # behaviour. For strings containing only ASCII characters, we need to also verify
-        # it doesn't start with a wildcard (*), before allowing the unencoded hostname.
-        if not unicode_is_ascii(host):
-            try:
-                host = self._get_idna_encoded_host(host)
-            except UnicodeError:
-                raise InvalidURL("URL has an invalid label.")
-        elif host.startswith(("*", ".")):
-            raise InvalidURL("URL has an invalid label.")
-
-        # Carefully reconstruct the network location
-        netloc = auth or ""
-        if netloc:
-            netloc += "@"
-        netloc += host
-        if port:
-            netloc += f":{port}"
-
-        # Bare domains aren't valid URLs.
-        if not path:
-            path = "/"
-
         if isinstance(params, (str, bytes)):
             params = to_native_string(params)
 
         enc_params = self._encode_params(params)
-        if enc_params:
-            if query:
-                query = f"{query}&{enc_params}"
-            else:
-                query = enc_params
-
-        url = requote_uri(urlunparse([scheme, netloc, path, None, query, fragment]))
-        self.url = url
+        if isinstance(enc_params, str):
+            canonicalize = _canonicalize_url_cached
+        else:
+            canonicalize = _canonicalize_url
+        self.url = canonicalize(url, enc_params, self._get_idna_encoded_host)
 
     def prepare_headers(self, headers):
         """Prepares the given HTTP headers."""
@@ -491,8 +532,12 @@ class PreparedRequest(RequestEncodingMixin, RequestHooksMixin):
                 name, value = header
                 self.headers[to_native_string(name)] = value
 
-    def prepare_body(self, data, files, json=None):
-        """Prepares the given HTTP body data."""
+    def prepare_body(self, data, files, json=None, json_codec=None):
+        """Prepares the given HTTP body data.
+
+        ``json`` is encoded with ``json_codec``, a codec or the name of one
+        (see :mod:`requests.jsoncodecs`), or with the default codec.
+        """
 
         # Check if file, fo, generator, iterator.
         # If not, run through normal process.
@@ -502,12 +547,12 @@ class PreparedRequest(RequestEncodingMixin, RequestHooksMixin):
         content_type = None
 
         if not data and json is not None:
-            # urllib3 requires a bytes-like body. Python 2's json.dumps
-            # provides this natively, but Python 3 gives a Unicode string.
+            # urllib3 requires a bytes-like body. Some codecs provide this
+            # natively, but the json module gives a Unicode string.
             content_type = "application/json"
 
             try:
-                body = complexjson.dumps(json, allow_nan=False)
+                body = get_json_codec(json_codec).dumps(json)
             except ValueError as ve:
                 raise InvalidJSONError(ve, request=self)
 
@@ -653,6 +698,7 @@ class Response:
         "cookies",
         "elapsed",
         "request",
+        "json_codec",
     ]
 
     def __init__(self):
@@ -702,6 +748,10 @@ class Response:
         #: is a response.
         self.request = None
 
+        #: The JSON codec, or name of one, :meth:`json` decodes with. None is
+        #: the default codec. See :mod:`requests.jsoncodecs`.
+        self.json_codec = None
+
     def __enter__(self):
         return self
 
@@ -717,6 +767,7 @@ class Response:
         return {attr: getattr(self, attr, None) for attr in self.__attrs__}
 
     def __setstate__(self, state):
+        self.json_codec = None
         for name, value in state.items():
             setattr(self, name, value)
 
@@ -810,7 +861,8 @@ class Response:
         a single chunk.
 
         If decode_unicode is True, content will be decoded using the best
-        available encoding based on the response.
+        available encoding based on the response. When the response does not
+        declare one, it is detected from the first chunks of the body.
         """
 
         def generate():
@@ -854,6 +906,55 @@ class Response:
 
         return chunks
 
+    def iter_into(self, buffer):
+        """Iterates over the response data by filling ``buffer``, a writable
+        bytes-like object such as a :class:`bytearray` or :class:`memoryview`,
+        over and over again. Each item is a :class:`memoryview` of the part
+        of ``buffer`` that was filled, valid until the next item is requested.
+
+        With stream=True the body goes from the connection (or the content
+        decoder) straight into ``buffer``, so arbitrarily large bodies are
+        read with constant memory use and no per-chunk allocations::
+
+            buf = bytearray(1024 * 1024)
+            with open(path, 'wb') as f:
+                for chunk in r.iter_into(buf):
+                    f.write(chunk)
+        """
+        view = memoryview(buffer).cast("B")
+        if not len(view):
+            raise ValueError("buffer must not be empty.")
+
+        if self._content_consumed:
+            if isinstance(self._content, bool):
+                raise StreamConsumedError()
+            content = memoryview(self._content or b"")
+            for start in range(0, len(content), len(view)):
+                chunk = content[start : start + len(view)]
+                view[: len(chunk)] = chunk
+                yield view[: len(chunk)]
+            return
+
+        # Special case for urllib3.
+        kwargs = {"decode_content": True} if hasattr(self.raw, "stream") else {}
+
+        while True:
+            try:
+                n = self.raw.readinto(view, **kwargs)
+            except ProtocolError as e:
+                raise ChunkedEncodingError(e)
+            except DecodeError as e:
+                raise ContentDecodingError(e)
+            except ReadTimeoutError as e:
+                raise ConnectionError(e)
+            except SSLError as e:
+                raise RequestsSSLError(e)
+            if not n:
+                break
+            yield view[:n]
+
+        self._content_consumed = True
+
     def iter_lines(
         self, chunk_size=ITER_CHUNK_SIZE, decode_unicode=False, delimiter=None
     ):
@@ -944,16 +1045,36 @@ class Response:
 
         return content
 
-    def json(self, **kwargs):
+    def json(self, *, fields=None, **kwargs):
         r"""Decodes the JSON response body (if any) as a Python object.
 
         This may return a dictionary, list, etc. depending on what is in the response.
 
+        With ``fields``, only the listed fields are decoded and everything
+        else is skipped over without being built. Each field is a path of
+        object keys, given as a dotted string or a sequence. The result
+        keeps the document's nesting, with arrays projected element by
+        element, and leaves out the fields that are missing::
+
+            >>> r.json(fields=["info.gameDuration", "info.participants.puuid"])
+            {'info': {'gameDuration': 1803, 'participants': [{'puuid': ...}, ...]}}
+
+        With stream=True the body is decoded as it is read, so memory use is
+        bounded by the largest selected value.
+
+        :param fields: (optional) Paths of the fields to decode.
         :param \*\*kwargs: Optional arguments that ``json.loads`` takes.
         :raises requests.exceptions.JSONDecodeError: If the response body does not
             contain valid json.
         """
 
+        if fields is not None:
+            return _project_json(self, fields, CONTENT_CHUNK_SIZE, **kwargs)
+
+        codec = get_json_codec(self.json_codec)
+        if codec is not DEFAULT_JSON_CODEC:
+            return self._json_with_codec(codec, **kwargs)
+
         if not self.encoding and self.content and len(self.content) > 3:
             # No encoding set. JSON RFC 4627 section 3 states we should expect
             # UTF-8, -16 or -32. Detect which one to use; If the detection or
@@ -979,6 +1100,53 @@ class Response:
             # This aliases json.JSONDecodeError and simplejson.JSONDecodeError
             raise RequestsJSONDecodeError(e.msg, e.doc, e.pos)
 
+    def _json_with_codec(self, codec, **kwargs):
+        """Decodes the body with ``codec``, handing it the UTF-8 bytes of
+        the body as they are whenever possible."""
+        data = self.content
+        encoding = self.encoding
+        if not encoding and data and len(data) > 3:
+            encoding = guess_json_utf(data)
+        try:
+            is_utf8 = codecs.lookup(encoding or "utf-8").name == "utf-8"
+        except LookupError:
+            # An unknown charset; .text falls back for it.
+            is_utf8 = False
+        if not data or not is_utf8:
+            data = self.text.encode("utf-8")
+        try:
+            return codec.loads(data, **kwargs)
+        except ValueError as e:
+            # json.JSONDecodeError and most codecs' errors derive from
+            # ValueError; raise it as requests.JSONDecodeError.
+            raise RequestsJSONDecodeError(
+                getattr(e, "msg", str(e)),
+                getattr(e, "doc", data),
+                getattr(e, "pos", 0),
+            )
+
+    def iter_json_items(self, path=None, chunk_size=CONTENT_CHUNK_SIZE, **kwargs):
+        r"""Iterates over the elements of a JSON array in the response body,
+        decoding them one at a time.
+
+        ``path`` locates the array: None for a top-level array, otherwise a
+        path of object keys and array indices, given as a dotted string or a
+        sequence. Nothing is yielded when there is no array there (or
+        ``null``). With stream=True, the elements are yielded as they
+        arrive and memory use is bounded by the largest of them::
+
+            r = s.get(url, stream=True)
+            for frame in r.iter_json_items("info.frames"):
+                ...
+
+        :param path: (optional) Path of the array.
+        :param chunk_size: (optional) Number of bytes read at once.
+        :param \*\*kwargs: Optional arguments that ``json.loads`` takes.
+        :raises requests.exceptions.JSONDecodeError: If the response body does not
+            contain valid json.
+        """
+        return _iter_json_items(self, path, chunk_size, **kwargs)
+
     @property
     def links(self):
         """Returns the parsed header links of the response, if any."""
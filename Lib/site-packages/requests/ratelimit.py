@@ -0,0 +1,307 @@
+"""
+requests.ratelimit
+~~~~~~~~~~~~~~~~~~
+
+This module contains a transport adapter that paces requests to stay under
+the rate limits advertised by the server instead of reacting to 429s.
+"""
+
+import re
+import threading
+import time
+from bisect import insort
+from collections import deque
+
+from urllib3.exceptions import InvalidHeader as _InvalidHeader
+
+from .adapters import HTTPAdapter
+from .compat import urlparse
+
+_ROUTE_PARAM = re.compile(r"\{[^/{}]*\}")
+_ID_SEGMENT = re.compile(r"\d{2,}|^[\w-]{24,}$")
+
+
+def _parse_limits(value):
+    """Parses a ``"20:1,100:120"`` style header into ``(count, seconds)``
+    pairs, skipping malformed entries.
+
+    :rtype: list
+    """
+    limits = []
+    for part in value.split(","):
+        count, _, seconds = part.strip().partition(":")
+        try:
+            limits.append((int(count), float(seconds)))
+        except ValueError:
+            continue
+    return [(count, seconds) for count, seconds in limits if seconds > 0]
+
+
+def _compile_route(template):
+    """Turns ``/matches/{matchId}/timeline`` into a regular expression that
+    matches the concrete paths of that route."""
+    literals = _ROUTE_PARAM.split(template)
+    return re.compile("[^/]+".join(map(re.escape, literals)) + "$")
+
+
+class _RateLimitWindow:
+    """Allows ``limit`` sends per ``seconds``. Each send takes a token that
+    comes back one window after it was taken, so the bucket can never let
+    more than ``limit`` sends into any interval of ``seconds``."""
+
+    __slots__ = ("limit", "seconds", "sent")
+
+    def __init__(self, limit, seconds, sent=()):
+        self.limit = limit
+        self.seconds = seconds
+        # Only the last ``limit`` send times matter.
+        self.sent = deque(sent, maxlen=limit)
+
+    def next_slot(self, now, margin):
+        if len(self.sent) < self.limit:
+            return now
+        return max(now, self.sent[0] + self.seconds + margin)
+
+    def sync(self, count, now):
+        """Accounts for sends the server counted but we did not make (e.g.
+        from another process sharing the same key)."""
+        local = sum(1 for sent in self.sent if sent > now - self.seconds)
+        if count <= local:
+            return
+        sent = list(self.sent)
+        for _ in range(min(count, self.limit) - local):
+            insort(sent, now)
+        self.sent = deque(sent, maxlen=self.limit)
+
+
+class _RateLimitBucket:
+    """The set of windows advertised for one application or route key."""
+
+    __slots__ = ("windows", "blocked_until")
+
+    def __init__(self):
+        self.windows = {}
+        self.blocked_until = 0.0
+
+    def set_limits(self, limits):
+        windows = {}
+        for limit, seconds in limits:
+            window = self.windows.get(seconds)
+            if window is None or window.limit != limit:
+                window = _RateLimitWindow(
+                    limit, seconds, window.sent if window is not None else ()
+                )
+            windows[seconds] = window
+        self.windows = windows
+
+    def sync_counts(self, counts, now):
+        for count, seconds in counts:
+            window = self.windows.get(seconds)
+            if window is not None:
+                window.sync(count, now)
+
+    def next_slot(self, now, margin):
+        slot = max(now, self.blocked_until)
+        for window in self.windows.values():
+            slot = max(slot, window.next_slot(now, margin))
+        return slot
+
+    def take(self, slot):
+        for window in self.windows.values():
+            window.sent.append(slot)
+
+
+class RateLimitingHTTPAdapter(HTTPAdapter):
+    """An :class:`HTTPAdapter <requests.adapters.HTTPAdapter>` that keeps
+    token buckets per host and per host+route, learns their limits from the
+    ``X-App-Rate-Limit`` / ``X-Method-Rate-Limit`` response headers and
+    delays sends so they stay under them.
+
+    Sends are scheduled under a lock, so threads sharing the adapter (for
+    instance through :meth:`Session.map <requests.Session.map>`) are spread
+    evenly over the allowed rate instead of bursting and backing off
+    together. A 429 carrying ``Retry-After`` pauses the bucket named by
+    ``X-Rate-Limit-Type`` until the given time.
+
+    :param routes: (optional) Iterable of route templates such as
+        ``"/lol/match/v5/matches/{matchId}"``. Requests whose path matches a
+        template share its method bucket. Other paths are grouped by
+        replacing every segment that looks like an identifier with ``{}``.
+    :param app_limits: (optional) Limits to start with before any response
+        has been seen, in header syntax (``"20:1,100:120"``).
+    :param method_limits: (optional) Same as ``app_limits``, applied to each
+        new route bucket.
+    :param margin: (optional) Seconds added to every window to absorb the
+        difference between when we send and when the server counts.
+    :param \\*\\*kwargs: Passed on to :class:`HTTPAdapter`.
+
+    Usage::
+
+      >>> import requests
+      >>> from requests.ratelimit import RateLimitingHTTPAdapter
+      >>> s = requests.Session()
+      >>> a = RateLimitingHTTPAdapter(routes=['/lol/match/v5/matches/{matchId}'])
+      >>> s.mount('https://', a)
+      >>> a.throttled_seconds
+      0.0
+    """
+
+    __attrs__ = HTTPAdapter.__attrs__ + [
+        "routes",
+        "app_limits",
+        "method_limits",
+        "margin",
+    ]
+
+    app_limit_header = "X-App-Rate-Limit"
+    app_count_header = "X-App-Rate-Limit-Count"
+    method_limit_header = "X-Method-Rate-Limit"
+    method_count_header = "X-Method-Rate-Limit-Count"
+    limit_type_header = "X-Rate-Limit-Type"
+
+    def __init__(
+        self, routes=None, app_limits=None, method_limits=None, margin=0.1, **kwargs
+    ):
+        self.routes = list(routes or ())
+        self.app_limits = app_limits
+        self.method_limits = method_limits
+        self.margin = margin
+        self._init_rate_limits()
+        super().__init__(**kwargs)
+
+    def __setstate__(self, state):
+        super().__setstate__(state)
+        self._init_rate_limits()
+
+    def _init_rate_limits(self):
+        self._route_patterns = [
+            (_compile_route(template), template) for template in self.routes
+        ]
+        self._buckets = {}
+        self._lock = threading.Lock()
+        #: Number of sends that had to wait for a token.
+        self.throttled_requests = 0
+        #: Total time spent waiting for tokens, in seconds.
+        self.throttled_seconds = 0.0
+        #: ``throttled_seconds`` broken down by ``(host, route)``.
+        self.throttled_seconds_by_route = {}
+
+    def route_for(self, request):
+        """Returns the route template the request is counted against.
+
+        This should not be called from user code, and is only exposed for use
+        when subclassing the
+        :class:`RateLimitingHTTPAdapter <requests.ratelimit.RateLimitingHTTPAdapter>`.
+
+        :param request: The :class:`PreparedRequest <PreparedRequest>` being sent.
+        :rtype: str
+        """
+        path = urlparse(request.url).path or "/"
+        for pattern, template in self._route_patterns:
+            if pattern.match(path):
+                return template
+        return "/".join(
+            "{}" if _ID_SEGMENT.search(segment) else segment
+            for segment in path.split("/")
+        )
+
+    def rate_limit_keys(self, request):
+        """Returns the application and method bucket keys for the request.
+
+        This should not be called from user code, and is only exposed for use
+        when subclassing the
+        :class:`RateLimitingHTTPAdapter <requests.ratelimit.RateLimitingHTTPAdapter>`.
+
+        :rtype: tuple
+        """
+        parsed = urlparse(request.url)
+        host = (parsed.scheme.lower(), parsed.netloc.lower())
+        return host, host + (self.route_for(request),)
+
+    def _bucket(self, key, limits):
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = _RateLimitBucket()
+            if limits:
+                bucket.set_limits(_parse_limits(limits))
+        return bucket
+
+    def acquire(self, request):
+        """Waits until the request may be sent without exceeding any known
+        limit and takes its tokens.
+
+        :rtype: float
+        :returns: The time waited, in seconds.
+        """
+        app_key, method_key = self.rate_limit_keys(request)
+        with self._lock:
+            buckets = (
+                self._bucket(app_key, self.app_limits),
+                self._bucket(method_key, self.method_limits),
+            )
+            now = time.monotonic()
+            slot = max(bucket.next_slot(now, self.margin) for bucket in buckets)
+            for bucket in buckets:
+                bucket.take(slot)
+
+            delay = slot - now
+            if delay > 0:
+                self.throttled_requests += 1
+                self.throttled_seconds += delay
+                by_route = self.throttled_seconds_by_route
+                by_route[method_key] = by_route.get(method_key, 0.0) + delay
+
+        if delay > 0:
+            time.sleep(delay)
+            return delay
+        return 0.0
+
+    def update_limits(self, request, response):
+        """Learns the limits and counts advertised by ``response``.
+
+        :param request: The :class:`PreparedRequest <PreparedRequest>` sent.
+        :param response: The :class:`Response <Response>` received.
+        """
+        app_key, method_key = self.rate_limit_keys(request)
+        headers = response.headers
+        with self._lock:
+            now = time.monotonic()
+            app = self._bucket(app_key, self.app_limits)
+            method = self._bucket(method_key, self.method_limits)
+            for bucket, limit_header, count_header in (
+                (app, self.app_limit_header, self.app_count_header),
+                (method, self.method_limit_header, self.method_count_header),
+            ):
+                if limit_header in headers:
+                    limits = _parse_limits(headers[limit_header])
+                    bucket.set_limits(limits)
+                    # The request just answered counts against them, even if
+                    # it was sent before they were known.
+                    bucket.sync_counts([(1, seconds) for _, seconds in limits], now)
+                if count_header in headers:
+                    bucket.sync_counts(_parse_limits(headers[count_header]), now)
+
+            if response.status_code != 429 or "Retry-After" not in headers:
+                return
+            try:
+                retry_after = self.max_retries.parse_retry_after(
+                    headers["Retry-After"]
+                )
+            except _InvalidHeader:
+                return
+            limit_type = headers.get(self.limit_type_header, "").lower()
+            bucket = app if limit_type == "application" else method
+            bucket.blocked_until = max(bucket.blocked_until, now + retry_after)
+
+    def send(self, request, **kwargs):
+        """Sends PreparedRequest object once the rate limits allow it.
+        Returns Response object.
+
+        :param request: The :class:`PreparedRequest <PreparedRequest>` being sent.
+        :param \\*\\*kwargs: Passed on to :meth:`HTTPAdapter.send`.
+        :rtype: requests.Response
+        """
+        self.acquire(request)
+        response = super().send(request, **kwargs)
+        self.update_limits(request, response)
+        return response
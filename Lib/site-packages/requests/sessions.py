@@ -8,11 +8,12 @@ requests (cookies, auth, proxies).
 import os
 import sys
 import time
-from collections import OrderedDict
+from collections import OrderedDict, deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from datetime import timedelta
 
 from ._internal_utils import to_native_string
-from .adapters import HTTPAdapter
+from .adapters import DEFAULT_POOLSIZE, HTTPAdapter
 from .auth import _basic_auth_str
 from .compat import Mapping, cookielib, urljoin, urlparse
 from .cookies import (
@@ -21,6 +22,8 @@ from .cookies import (
     extract_cookies_to_jar,
     merge_cookies,
 )
+from .downloads import DOWNLOAD_BUFFER_SIZE
+from .downloads import download as _download
 from .exceptions import (
     ChunkedEncodingError,
     ContentDecodingError,
@@ -57,6 +60,10 @@ if sys.platform == "win32":
 else:
     preferred_clock = time.time
 
+#: Number of environment lookups a session with ``freeze_env`` set keeps
+#: before starting over.
+ENV_CACHE_SIZE = 1000
+
 
 def merge_setting(request_setting, session_setting, dict_class=OrderedDict):
     """Determines appropriate setting for a given request, taking into account
@@ -175,90 +182,15 @@ class SessionRedirectMixin:
         url = self.get_redirect_target(resp)
         previous_fragment = urlparse(req.url).fragment
         while url:
-            prepared_request = req.copy()
-
             # Update history and keep track of redirects.
             # resp.history must ignore the original request in this loop
             hist.append(resp)
             resp.history = hist[1:]
 
-            try:
-                resp.content  # Consume socket so it can be released
-            except (ChunkedEncodingError, ContentDecodingError, RuntimeError):
-                resp.raw.read(decode_content=False)
-
-            if len(resp.history) >= self.max_redirects:
-                raise TooManyRedirects(
-                    f"Exceeded {self.max_redirects} redirects.", response=resp
-                )
-
-            # Release the connection back into the pool.
-            resp.close()
-
-            # Handle redirection without scheme (see: RFC 1808 Section 4)
-            if url.startswith("//"):
-                parsed_rurl = urlparse(resp.url)
-                url = ":".join([to_native_string(parsed_rurl.scheme), url])
-
-            # Normalize url case and attach previous fragment if needed (RFC 7231 7.1.2)
-            parsed = urlparse(url)
-            if parsed.fragment == "" and previous_fragment:
-                parsed = parsed._replace(fragment=previous_fragment)
-            elif parsed.fragment:
-                previous_fragment = parsed.fragment
-            url = parsed.geturl()
-
-            # Facilitate relative 'location' headers, as allowed by RFC 7231.
-            # (e.g. '/path/to/resource' instead of 'http://domain.tld/path/to/resource')
-            # Compliant with RFC3986, we percent encode the url.
-            if not parsed.netloc:
-                url = urljoin(resp.url, requote_uri(url))
-            else:
-                url = requote_uri(url)
-
-            prepared_request.url = to_native_string(url)
-
-            self.rebuild_method(prepared_request, resp)
-
-            # https://github.com/psf/requests/issues/1084
-            if resp.status_code not in (
-                codes.temporary_redirect,
-                codes.permanent_redirect,
-            ):
-                # https://github.com/psf/requests/issues/3490
-                purged_headers = ("Content-Length", "Content-Type", "Transfer-Encoding")
-                for header in purged_headers:
-                    prepared_request.headers.pop(header, None)
-                prepared_request.body = None
-
-            headers = prepared_request.headers
-            headers.pop("Cookie", None)
-
-            # Extract any cookies sent on the response to the cookiejar
-            # in the new request. Because we've mutated our copied prepared
-            # request, use the old one that we haven't yet touched.
-            extract_cookies_to_jar(prepared_request._cookies, req, resp.raw)
-            merge_cookies(prepared_request._cookies, self.cookies)
-            prepared_request.prepare_cookies(prepared_request._cookies)
-
-            # Rebuild auth and proxy information.
-            proxies = self.rebuild_proxies(prepared_request, proxies)
-            self.rebuild_auth(prepared_request, resp)
-
-            # A failed tell() sets `_body_position` to `object()`. This non-None
-            # value ensures `rewindable` will be True, allowing us to raise an
-            # UnrewindableBodyError, instead of hanging the connection.
-            rewindable = prepared_request._body_position is not None and (
-                "Content-Length" in headers or "Transfer-Encoding" in headers
+            req, previous_fragment, proxies = self.prepare_redirect(
+                resp, req, url, previous_fragment, proxies
             )
 
-            # Attempt to rewind consumed file-like object.
-            if rewindable:
-                rewind_body(prepared_request)
-
-            # Override the original request.
-            req = prepared_request
-
             if yield_requests:
                 yield req
             else:
@@ -273,12 +205,98 @@ class SessionRedirectMixin:
                     **adapter_kwargs,
                 )
 
-                extract_cookies_to_jar(self.cookies, prepared_request, resp.raw)
+                extract_cookies_to_jar(self.cookies, req, resp.raw)
 
                 # extract redirect url, if any, for the next loop
                 url = self.get_redirect_target(resp)
                 yield resp
 
+    def prepare_redirect(self, resp, req, url, previous_fragment, proxies):
+        """Releases ``resp`` and builds the request that follows it to ``url``.
+
+        This is the transport-independent half of :meth:`resolve_redirects`,
+        shared with sessions that send requests by other means.
+
+        :rtype: tuple of (PreparedRequest, str, dict)
+        """
+        prepared_request = req.copy()
+
+        try:
+            resp.content  # Consume socket so it can be released
+        except (ChunkedEncodingError, ContentDecodingError, RuntimeError):
+            resp.raw.read(decode_content=False)
+
+        if len(resp.history) >= self.max_redirects:
+            raise TooManyRedirects(
+                f"Exceeded {self.max_redirects} redirects.", response=resp
+            )
+
+        # Release the connection back into the pool.
+        resp.close()
+
+        # Handle redirection without scheme (see: RFC 1808 Section 4)
+        if url.startswith("//"):
+            parsed_rurl = urlparse(resp.url)
+            url = ":".join([to_native_string(parsed_rurl.scheme), url])
+
+        # Normalize url case and attach previous fragment if needed (RFC 7231 7.1.2)
+        parsed = urlparse(url)
+        if parsed.fragment == "" and previous_fragment:
+            parsed = parsed._replace(fragment=previous_fragment)
+        elif parsed.fragment:
+            previous_fragment = parsed.fragment
+        url = parsed.geturl()
+
+        # Facilitate relative 'location' headers, as allowed by RFC 7231.
+        # (e.g. '/path/to/resource' instead of 'http://domain.tld/path/to/resource')
+        # Compliant with RFC3986, we percent encode the url.
+        if not parsed.netloc:
+            url = urljoin(resp.url, requote_uri(url))
+        else:
+            url = requote_uri(url)
+
+        prepared_request.url = to_native_string(url)
+
+        self.rebuild_method(prepared_request, resp)
+
+        # https://github.com/psf/requests/issues/1084
+        if resp.status_code not in (
+            codes.temporary_redirect,
+            codes.permanent_redirect,
+        ):
+            # https://github.com/psf/requests/issues/3490
+            purged_headers = ("Content-Length", "Content-Type", "Transfer-Encoding")
+            for header in purged_headers:
+                prepared_request.headers.pop(header, None)
+            prepared_request.body = None
+
+        headers = prepared_request.headers
+        headers.pop("Cookie", None)
+
+        # Extract any cookies sent on the response to the cookiejar
+        # in the new request. Because we've mutated our copied prepared
+        # request, use the old one that we haven't yet touched.
+        extract_cookies_to_jar(prepared_request._cookies, req, resp.raw)
+        merge_cookies(prepared_request._cookies, self.cookies)
+        prepared_request.prepare_cookies(prepared_request._cookies)
+
+        # Rebuild auth and proxy information.
+        proxies = self.rebuild_proxies(prepared_request, proxies)
+        self.rebuild_auth(prepared_request, resp)
+
+        # A failed tell() sets `_body_position` to `object()`. This non-None
+        # value ensures `rewindable` will be True, allowing us to raise an
+        # UnrewindableBodyError, instead of hanging the connection.
+        rewindable = prepared_request._body_position is not None and (
+            "Content-Length" in headers or "Transfer-Encoding" in headers
+        )
+
+        # Attempt to rewind consumed file-like object.
+        if rewindable:
+            rewind_body(prepared_request)
+
+        return prepared_request, previous_fragment, proxies
+
     def rebuild_auth(self, prepared_request, response):
         """When being redirected we may want to strip authentication from the
         request to avoid leaking credentials. This method intelligently removes
@@ -295,7 +313,7 @@ class SessionRedirectMixin:
             del headers["Authorization"]
 
         # .netrc might have more auth for us on our new host.
-        new_auth = get_netrc_auth(url) if self.trust_env else None
+        new_auth = self._netrc_auth(url) if self.trust_env else None
         if new_auth is not None:
             prepared_request.prepare_auth(new_auth)
 
@@ -313,7 +331,7 @@ class SessionRedirectMixin:
         """
         headers = prepared_request.headers
         scheme = urlparse(prepared_request.url).scheme
-        new_proxies = resolve_proxies(prepared_request, proxies, self.trust_env)
+        new_proxies = self._resolve_proxies(prepared_request, proxies)
 
         if "Proxy-Authorization" in headers:
             del headers["Proxy-Authorization"]
@@ -384,7 +402,9 @@ class Session(SessionRedirectMixin):
         "adapters",
         "stream",
         "trust_env",
+        "freeze_env",
         "max_redirects",
+        "json_codec",
     ]
 
     def __init__(self):
@@ -437,6 +457,20 @@ class Session(SessionRedirectMixin):
         #: authentication and similar.
         self.trust_env = True
 
+        #: Read the environment settings used when :attr:`trust_env` is set
+        #: (proxy variables, ``REQUESTS_CA_BUNDLE``/``CURL_CA_BUNDLE`` and
+        #: ``.netrc``) once per host and reuse them for later requests,
+        #: instead of on every request. Call :meth:`clear_env_cache` after
+        #: changing the environment.
+        self.freeze_env = False
+        self._env_cache = {}
+
+        #: JSON codec, or name of one, to encode ``json=`` bodies and decode
+        #: :meth:`Response.json` with, e.g. ``"orjson"``. Defaults to
+        #: :mod:`simplejson` if installed, otherwise :mod:`json`. Names keep
+        #: the session picklable. See :mod:`requests.jsoncodecs`.
+        self.json_codec = None
+
         #: A CookieJar containing all currently outstanding cookies set on this
         #: session. By default it is a
         #: :class:`RequestsCookieJar <requests.cookies.RequestsCookieJar>`, but
@@ -468,17 +502,23 @@ class Session(SessionRedirectMixin):
 
         # Bootstrap CookieJar.
         if not isinstance(cookies, cookielib.CookieJar):
-            cookies = cookiejar_from_dict(cookies)
+            merged_cookies = cookiejar_from_dict(cookies)
+        elif cookies:
+            merged_cookies = merge_cookies(RequestsCookieJar(), cookies)
+        else:
+            merged_cookies = RequestsCookieJar()
 
-        # Merge with session cookies
-        merged_cookies = merge_cookies(
-            merge_cookies(RequestsCookieJar(), self.cookies), cookies
-        )
+        # Merge with session cookies. The request's cookies win, so they
+        # have to go on top; copying an empty session jar is a waste.
+        if self.cookies:
+            merged_cookies = merge_cookies(
+                merge_cookies(RequestsCookieJar(), self.cookies), merged_cookies
+            )
 
         # Set environment's basic authentication if not explicitly set.
         auth = request.auth
         if self.trust_env and not auth and not self.auth:
-            auth = get_netrc_auth(request.url)
+            auth = self._netrc_auth(request.url)
 
         p = PreparedRequest()
         p.prepare(
@@ -494,6 +534,7 @@ class Session(SessionRedirectMixin):
             auth=merge_setting(auth, self.auth),
             cookies=merged_cookies,
             hooks=merge_hooks(request.hooks, self.hooks),
+            json_codec=self.json_codec,
         )
         return p
 
@@ -670,6 +711,64 @@ class Session(SessionRedirectMixin):
 
         return self.request("DELETE", url, **kwargs)
 
+    def download(
+        self,
+        url,
+        path,
+        hash_name=None,
+        expected_digest=None,
+        max_resumes=5,
+        buffer_size=DOWNLOAD_BUFFER_SIZE,
+        segments=1,
+        **kwargs,
+    ):
+        r"""Downloads the body of ``url`` into the file at ``path``.
+        Returns the :class:`Response` the last bytes were read from, or the
+        response to the ``HEAD`` request for segmented downloads.
+
+        The body is streamed through a single preallocated buffer and written
+        with positional writes into a file preallocated to the announced
+        length, so memory use does not depend on the size of the body. If
+        the connection drops, the download continues from where it stopped
+        with a ``Range`` request (guarded by ``If-Range``); a server that
+        answers with the whole body again makes it start over.
+
+        With ``segments`` above one, a ``HEAD`` request is made first and, if
+        the server accepts byte ranges, the body is split into that many
+        ranges fetched concurrently over the session's connection pool and
+        written at their offsets. Otherwise the body is fetched as a single
+        stream.
+
+        :param url: URL for the new :class:`Request` object.
+        :param path: Destination file. Existing content is overwritten.
+        :param hash_name: (optional) Name of a :mod:`hashlib` algorithm to
+            hash the body with while it is written. The hex digest is stored
+            as ``digest`` on the returned response. For segmented downloads it
+            is computed by reading the file back once it is complete.
+        :param expected_digest: (optional) Hex digest the body must have,
+            otherwise :class:`~requests.exceptions.ChecksumMismatch` is raised.
+        :param max_resumes: (optional) How many times to resume after the
+            connection dropped before giving up.
+        :param buffer_size: (optional) Size of the buffer the body is read into.
+        :param segments: (optional) Number of ranges to fetch concurrently. It
+            is lowered so that no range is smaller than 1 MiB and so that
+            every range has its own pooled connection.
+        :param \*\*kwargs: Optional arguments that ``request`` takes.
+        :rtype: requests.Response
+        """
+
+        return _download(
+            self,
+            url,
+            path,
+            hash_name=hash_name,
+            expected_digest=expected_digest,
+            max_resumes=max_resumes,
+            buffer_size=buffer_size,
+            segments=segments,
+            **kwargs,
+        )
+
     def send(self, request, **kwargs):
         """Send a given PreparedRequest.
 
@@ -681,7 +780,7 @@ class Session(SessionRedirectMixin):
         kwargs.setdefault("verify", self.verify)
         kwargs.setdefault("cert", self.cert)
         if "proxies" not in kwargs:
-            kwargs["proxies"] = resolve_proxies(request, self.proxies, self.trust_env)
+            kwargs["proxies"] = self._resolve_proxies(request, self.proxies)
 
         # It's possible that users might accidentally send a Request object.
         # Guard against that specific failure case.
@@ -705,6 +804,7 @@ class Session(SessionRedirectMixin):
         # Total elapsed time of the request (approximately)
         elapsed = preferred_clock() - start
         r.elapsed = timedelta(seconds=elapsed)
+        r.json_codec = self.json_codec
 
         # Response manipulation hooks
         r = dispatch_hook("response", hooks, r, **kwargs)
@@ -747,6 +847,145 @@ class Session(SessionRedirectMixin):
 
         return r
 
+    def map(
+        self, requests, max_workers=DEFAULT_POOLSIZE, per_host_limit=None, **kwargs
+    ):
+        r"""Sends many requests concurrently over this session's adapters.
+        Returns a list of results in the order of ``requests``.
+
+        A request that fails does not abort the batch: its slot in the
+        returned list holds the exception that was raised instead of a
+        :class:`Response <Response>`.
+
+        :param requests: Iterable of :class:`Request`, :class:`PreparedRequest`
+            or URL strings (sent as ``GET``).
+        :param max_workers: (optional) Maximum number of requests in flight.
+        :param per_host_limit: (optional) Maximum number of requests in flight
+            to a single host. Defaults to, and never exceeds, the
+            ``pool_maxsize`` of the adapter serving the host so that every
+            connection is returned to its pool and reused.
+        :param \*\*kwargs: Optional arguments that ``send`` takes, plus
+            ``proxies``, ``stream``, ``verify`` and ``cert`` which are merged
+            with the session settings like in :meth:`request`.
+        :rtype: list
+        """
+        results = []
+        for index, result in self._send_batch(
+            requests, max_workers, per_host_limit, kwargs
+        ):
+            results.extend([None] * (index + 1 - len(results)))
+            results[index] = result
+        return results
+
+    def imap_unordered(
+        self, requests, max_workers=DEFAULT_POOLSIZE, per_host_limit=None, **kwargs
+    ):
+        r"""Like :meth:`map`, but returns a generator that yields each
+        :class:`Response <Response>` (or the exception raised for a failed
+        request) as soon as it completes. ``requests`` is consumed lazily.
+
+        :rtype: generator
+        """
+        batch = self._send_batch(requests, max_workers, per_host_limit, kwargs)
+        for _, result in batch:
+            yield result
+
+    def _send_batch(self, requests, max_workers, per_host_limit, kwargs):
+        """Schedules ``requests`` on a thread pool, keeping at most
+        ``max_workers`` in flight overall and the per-host limit for each
+        host. Yields ``(index, result)`` pairs in completion order."""
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1.")
+
+        send_kwargs = dict(kwargs)
+        env_kwargs = {
+            key: send_kwargs.pop(key, None)
+            for key in ("proxies", "stream", "verify", "cert")
+        }
+        items = enumerate(requests)
+        waiting = {}  # host -> deque of (index, request, settings)
+        in_flight = {}  # host -> number of requests in flight
+        limits = {}
+        futures = {}
+        queued = 0
+        exhausted = False
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+
+            def submit(host, index, prep, settings):
+                in_flight[host] = in_flight.get(host, 0) + 1
+                future = executor.submit(self.send, prep, **send_kwargs, **settings)
+                futures[future] = (index, host)
+
+            while True:
+                # Pull new requests until every worker has something to do.
+                # Requests held back by a host limit count too, so that no
+                # more than max_workers are read ahead of the results.
+                while not exhausted and len(futures) + queued < max_workers:
+                    try:
+                        index, item = next(items)
+                    except StopIteration:
+                        exhausted = True
+                        break
+                    try:
+                        prep, settings = self._prepare_batch_item(item, env_kwargs)
+                        parsed = urlparse(prep.url)
+                        host = (parsed.scheme.lower(), parsed.netloc.lower())
+                        if host not in limits:
+                            limits[host] = self._host_limit(prep.url, per_host_limit)
+                    except Exception as e:
+                        yield index, e
+                        continue
+
+                    if in_flight.get(host, 0) < limits[host]:
+                        submit(host, index, prep, settings)
+                    else:
+                        waiting.setdefault(host, deque()).append(
+                            (index, prep, settings)
+                        )
+                        queued += 1
+
+                if not futures:
+                    if exhausted:
+                        return
+                    continue
+
+                done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                for future in done:
+                    index, host = futures.pop(future)
+                    in_flight[host] -= 1
+                    queue = waiting.get(host)
+                    if queue:
+                        queued -= 1
+                        submit(host, *queue.popleft())
+                    try:
+                        yield index, future.result()
+                    except Exception as e:
+                        yield index, e
+
+    def _prepare_batch_item(self, item, env_kwargs):
+        if isinstance(item, PreparedRequest):
+            prep = item
+        else:
+            if isinstance(item, (str, bytes)):
+                item = Request("GET", item)
+            prep = self.prepare_request(item)
+
+        proxies = dict(env_kwargs["proxies"] or {})
+        settings = self.merge_environment_settings(
+            prep.url,
+            proxies,
+            env_kwargs["stream"],
+            env_kwargs["verify"],
+            env_kwargs["cert"],
+        )
+        return prep, settings
+
+    def _host_limit(self, url, per_host_limit):
+        pool_maxsize = getattr(self.get_adapter(url), "_pool_maxsize", None)
+        limits = [n for n in (per_host_limit, pool_maxsize) if n is not None]
+        return max(min(limits), 1) if limits else float("inf")
+
     def merge_environment_settings(self, url, proxies, stream, verify, cert):
         """
         Check the environment and merge it with some settings.
@@ -757,7 +996,7 @@ class Session(SessionRedirectMixin):
         if self.trust_env:
             # Set environment's proxies.
             no_proxy = proxies.get("no_proxy") if proxies is not None else None
-            env_proxies = get_environ_proxies(url, no_proxy=no_proxy)
+            env_proxies = self._environ_proxies(url, no_proxy)
             for k, v in env_proxies.items():
                 proxies.setdefault(k, v)
 
@@ -765,8 +1004,12 @@ class Session(SessionRedirectMixin):
             # and be compatible with cURL.
             if verify is True or verify is None:
                 verify = (
-                    os.environ.get("REQUESTS_CA_BUNDLE")
-                    or os.environ.get("CURL_CA_BUNDLE")
+                    self._env_lookup(
+                        None,
+                        ("ca_bundle",),
+                        lambda: os.environ.get("REQUESTS_CA_BUNDLE")
+                        or os.environ.get("CURL_CA_BUNDLE"),
+                    )
                     or verify
                 )
 
@@ -778,6 +1021,58 @@ class Session(SessionRedirectMixin):
 
         return {"proxies": proxies, "stream": stream, "verify": verify, "cert": cert}
 
+    def _env_lookup(self, url, key, compute):
+        """Returns ``compute()``, cached under ``key`` for the host of ``url``
+        when :attr:`freeze_env` is set."""
+        if not self.freeze_env:
+            return compute()
+        key = (urlparse(url).netloc.lower() if url is not None else None,) + key
+        try:
+            return self._env_cache[key]
+        except KeyError:
+            if len(self._env_cache) >= ENV_CACHE_SIZE:
+                self._env_cache.clear()
+            value = self._env_cache[key] = compute()
+            return value
+
+    def _netrc_auth(self, url):
+        return self._env_lookup(url, ("netrc",), lambda: get_netrc_auth(url))
+
+    def _environ_proxies(self, url, no_proxy):
+        return self._env_lookup(
+            url,
+            ("proxies", no_proxy),
+            lambda: get_environ_proxies(url, no_proxy=no_proxy),
+        )
+
+    def _resolve_proxies(self, request, proxies):
+        if not (self.trust_env and self.freeze_env):
+            return resolve_proxies(request, proxies, self.trust_env)
+
+        new_proxies = proxies.copy() if proxies is not None else {}
+        environ_proxies = self._environ_proxies(
+            request.url, new_proxies.get("no_proxy")
+        )
+        scheme = urlparse(request.url).scheme
+        proxy = environ_proxies.get(scheme, environ_proxies.get("all"))
+        if proxy:
+            new_proxies.setdefault(scheme, proxy)
+        return new_proxies
+
+    def clear_env_cache(self, url=None):
+        """Forgets the environment settings cached while :attr:`freeze_env`
+        is set, for the host of ``url`` or, by default, for every host.
+
+        :param url: (optional) URL whose host should be looked up again.
+        """
+        if url is None:
+            self._env_cache.clear()
+            return
+        netloc = urlparse(url).netloc.lower()
+        for key in list(self._env_cache):
+            if key[0] == netloc:
+                self._env_cache.pop(key, None)
+
     def get_adapter(self, url):
         """
         Returns the appropriate connection adapter for the given URL.
@@ -812,8 +1107,11 @@ class Session(SessionRedirectMixin):
         return state
 
     def __setstate__(self, state):
+        self.freeze_env = False
+        self.json_codec = None
         for attr, value in state.items():
             setattr(self, attr, value)
+        self._env_cache = {}
 
 
 def session():
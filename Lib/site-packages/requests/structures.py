@@ -80,6 +80,47 @@ class CaseInsensitiveDict(MutableMapping):
         return str(dict(self.items()))
 
 
+class HTTPHeaderDictView(CaseInsensitiveDict):
+    """A :class:`CaseInsensitiveDict` over a urllib3 ``HTTPHeaderDict``.
+
+    Response headers are adopted as they are instead of being copied, so
+    reads and writes go through to the urllib3 response's ``headers``.
+    Repeated fields read as one comma-joined value, like they would once
+    copied.
+    """
+
+    def __init__(self, headers):
+        self._headers = headers
+
+    def __setitem__(self, key, value):
+        self._headers[key] = value
+
+    def __getitem__(self, key):
+        return self._headers[key]
+
+    def __delitem__(self, key):
+        del self._headers[key]
+
+    def __contains__(self, key):
+        return key in self._headers
+
+    def __iter__(self):
+        return iter(self._headers)
+
+    def __len__(self):
+        return len(self._headers)
+
+    def lower_items(self):
+        """Like iteritems(), but with all lowercase keys."""
+        return ((key.lower(), value) for key, value in self._headers.itermerged())
+
+    def copy(self):
+        return CaseInsensitiveDict(self._headers.itermerged())
+
+    def __repr__(self):
+        return str(dict(self._headers.itermerged()))
+
+
 class LookupDict(dict):
     """Dictionary lookup object."""
 
@@ -0,0 +1,117 @@
+import asyncio
+import gc
+import socket
+import threading
+import warnings
+
+import pytest
+
+from requests.adapters import BaseAdapter
+from requests.async_sessions import AsyncSession
+from requests.models import Request, Response
+
+
+def silent_server():
+    """Accepts one connection and never answers. Returns the port and an
+    event set once the client closed the connection."""
+    listener = socket.socket()
+    listener.bind(("127.0.0.1", 0))
+    listener.listen(1)
+    closed = threading.Event()
+
+    def serve():
+        conn, _ = listener.accept()
+        with conn, listener:
+            while conn.recv(65536):
+                pass
+        closed.set()
+
+    threading.Thread(target=serve, daemon=True).start()
+    return listener.getsockname()[1], closed
+
+
+class TestCancellation:
+    def test_cancelled_request_closes_connection(self):
+        port, closed = silent_server()
+        url = f"http://127.0.0.1:{port}/"
+
+        async def main():
+            async with AsyncSession() as session:
+                task = asyncio.ensure_future(session.get(url))
+                await asyncio.sleep(0.2)
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+                else:
+                    raise AssertionError("request was not cancelled")
+                pools = session.get_adapter(url).poolmanager
+                [key] = pools.keys()
+                assert not pools[key]._idle
+                # The server sees the connection closed.
+                assert await asyncio.to_thread(closed.wait, 5)
+
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter("always", ResourceWarning)
+            asyncio.run(main())
+            gc.collect()
+
+        assert not [w for w in caught if w.category is ResourceWarning]
+
+
+class RecordingAdapter(BaseAdapter):
+    """Answers every request with an empty 200 response, recording the
+    proxies it was sent with."""
+
+    def __init__(self):
+        super().__init__()
+        self.proxies = []
+
+    async def send(self, request, **kwargs):
+        self.proxies.append(kwargs["proxies"])
+        response = Response()
+        response.status_code = 200
+        response.url = request.url
+        response.request = request
+        response._content = b""
+        return response
+
+    def close(self):
+        pass
+
+
+class TestFreezeEnv:
+    def test_proxies_are_cached(self, monkeypatch):
+        monkeypatch.setenv("HTTP_PROXY", "http://proxy-1.invalid:3128")
+        monkeypatch.delenv("NO_PROXY", raising=False)
+        monkeypatch.delenv("no_proxy", raising=False)
+
+        async def main():
+            async with AsyncSession() as session:
+                adapter = RecordingAdapter()
+                session.mount("http://", adapter)
+                session.freeze_env = True
+                request = session.prepare_request(
+                    Request("GET", "http://example.invalid/")
+                )
+                await session.send(request)
+                monkeypatch.setenv("HTTP_PROXY", "http://proxy-2.invalid:3128")
+                await session.send(request)
+                session.clear_env_cache()
+                await session.send(request)
+                return [p.get("http") for p in adapter.proxies]
+
+        assert asyncio.run(main()) == [
+            "http://proxy-1.invalid:3128",
+            "http://proxy-1.invalid:3128",
+            "http://proxy-2.invalid:3128",
+        ]
+
+
+class TestSyncHelpers:
+    @pytest.mark.parametrize("method", ["map", "imap_unordered", "download"])
+    def test_not_supported(self, method):
+        session = AsyncSession()
+        with pytest.raises(TypeError, match=method):
+            getattr(session, method)(["http://example.invalid/"])
@@ -0,0 +1,397 @@
+import email.utils
+import os
+from io import BytesIO
+
+import pytest
+from urllib3.response import HTTPResponse
+
+import requests
+from requests import caching
+from requests.adapters import HTTPAdapter
+from requests.caching import (
+    CachingHTTPAdapter,
+    FileCache,
+    MemoryCache,
+    SQLiteCache,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1_700_000_000.0
+
+    def time(self):
+        return self.now
+
+    def date(self, offset=0):
+        return email.utils.formatdate(self.now + offset, usegmt=True)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(caching, "time", clock)
+    return clock
+
+
+class ScriptedTransport(HTTPAdapter):
+    """Answers with ``respond(request)``, a ``(status, headers, body)``
+    tuple, and records the requests that reached the network."""
+
+    def __init__(self, respond, **kwargs):
+        self.respond = respond
+        self.sent = []
+        super().__init__(**kwargs)
+
+    def send(self, request, **kwargs):
+        self.sent.append(request)
+        status, headers, body = self.respond(request)
+        raw = HTTPResponse(
+            body=BytesIO(body),
+            headers=headers,
+            status=status,
+            preload_content=False,
+            request_method=request.method,
+        )
+        response = self.build_response(request, raw)
+        if not kwargs.get("stream"):
+            response.content
+        return response
+
+
+class Adapter(CachingHTTPAdapter, ScriptedTransport):
+    pass
+
+
+@pytest.fixture
+def server(clock):
+    """A resource whose headers and body the tests change as they go."""
+
+    class Resource:
+        status = 200
+        body = b"v1"
+        headers = {}
+
+        def __call__(self, request):
+            headers = {"Date": clock.date(), **self.headers}
+            etag = headers.get("ETag")
+            if etag is not None and request.headers.get("If-None-Match") == etag:
+                return 304, headers, b""
+            last_modified = headers.get("Last-Modified")
+            if (
+                last_modified is not None
+                and request.headers.get("If-Modified-Since") == last_modified
+            ):
+                return 304, headers, b""
+            return self.status, headers, self.body
+
+    return Resource()
+
+
+@pytest.fixture
+def session(server):
+    def factory(**kwargs):
+        adapter = Adapter(respond=server, **kwargs)
+        session = requests.Session()
+        session.mount("https://", adapter)
+        return session, adapter
+
+    return factory
+
+
+URL = "https://api.example/matches/1"
+
+
+class TestFreshness:
+    def test_max_age(self, session, server, clock):
+        server.headers = {"Cache-Control": "max-age=60"}
+        s, adapter = session()
+        assert s.get(URL).from_cache is False
+        clock.now += 59
+        r = s.get(URL)
+        assert r.from_cache is True
+        assert r.content == b"v1"
+        assert len(adapter.sent) == 1
+
+        clock.now += 1
+        server.body = b"v2"
+        r = s.get(URL)
+        assert r.from_cache is False
+        assert r.content == b"v2"
+        assert len(adapter.sent) == 2
+
+    def test_age_header_counts(self, session, server, clock):
+        server.headers = {"Cache-Control": "max-age=60", "Age": "50"}
+        s, adapter = session()
+        s.get(URL)
+        clock.now += 9
+        assert s.get(URL).from_cache is True
+        clock.now += 1
+        assert s.get(URL).from_cache is False
+
+    def test_expires(self, session, server, clock):
+        server.headers = {"Expires": clock.date(30)}
+        s, adapter = session()
+        s.get(URL)
+        clock.now += 29
+        assert s.get(URL).from_cache is True
+        clock.now += 1
+        assert s.get(URL).from_cache is False
+
+    def test_invalid_expires_is_stale(self, session, server):
+        server.headers = {"Expires": "0"}
+        s, adapter = session()
+        s.get(URL)
+        assert s.get(URL).from_cache is False
+
+    def test_last_modified_heuristic(self, session, server, clock):
+        # Fresh for a tenth of the time since the last modification.
+        server.headers = {"Last-Modified": clock.date(-1000)}
+        s, adapter = session()
+        s.get(URL)
+        clock.now += 99
+        assert s.get(URL).from_cache is True
+        assert len(adapter.sent) == 1
+        # Stale: revalidated with the Last-Modified date.
+        clock.now += 1
+        s.get(URL)
+        assert len(adapter.sent) == 2
+        assert adapter.revalidations == 1
+
+    def test_heuristics_override(self, session, server, clock):
+        server.headers = {"Cache-Control": "max-age=0"}
+        s, adapter = session(heuristics={r"/matches/\d+$": 3600})
+        s.get(URL)
+        clock.now += 3599
+        assert s.get(URL).from_cache is True
+        # Other URLs keep what the server said, and are not even stored.
+        other = "https://api.example/matches/1/timeline"
+        s.get(other)
+        assert s.get(other).from_cache is False
+
+    def test_not_storable_without_freshness_or_validator(self, session, server):
+        s, adapter = session()
+        s.get(URL)
+        assert s.get(URL).from_cache is False
+        assert adapter.misses == 2
+
+    @pytest.mark.parametrize(
+        "status, headers",
+        [
+            (200, {"Cache-Control": "no-store, max-age=60"}),
+            (200, {"Cache-Control": "max-age=60", "Vary": "*"}),
+            (500, {"Cache-Control": "max-age=60"}),
+        ],
+    )
+    def test_not_stored(self, session, server, status, headers):
+        server.status, server.headers = status, headers
+        s, adapter = session()
+        s.get(URL)
+        assert s.get(URL).from_cache is False
+
+    def test_streamed_not_stored(self, session, server):
+        server.headers = {"Cache-Control": "max-age=60"}
+        s, adapter = session()
+        s.get(URL, stream=True).close()
+        assert s.get(URL).from_cache is False
+        assert s.get(URL, stream=True).from_cache is True
+
+    def test_request_no_store(self, session, server):
+        server.headers = {"Cache-Control": "max-age=60"}
+        s, adapter = session()
+        s.get(URL, headers={"Cache-Control": "no-store"})
+        assert s.get(URL).from_cache is False
+        assert s.get(URL, headers={"Cache-Control": "no-store"}).from_cache is False
+
+    def test_request_max_age(self, session, server, clock):
+        server.headers = {"Cache-Control": "max-age=60"}
+        s, adapter = session()
+        s.get(URL)
+        clock.now += 10
+        assert s.get(URL, headers={"Cache-Control": "max-age=20"}).from_cache
+        r = s.get(URL, headers={"Cache-Control": "max-age=5"})
+        assert r.from_cache is False
+
+    def test_unsafe_method_invalidates(self, session, server):
+        server.headers = {"Cache-Control": "max-age=60"}
+        s, adapter = session()
+        s.get(URL)
+        s.post(URL, data=b"x")
+        assert s.get(URL).from_cache is False
+
+
+class TestValidation:
+    def test_etag(self, session, server, clock):
+        server.headers = {"Cache-Control": "no-cache", "ETag": '"a"'}
+        s, adapter = session()
+        s.get(URL)
+        r = s.get(URL)
+        assert r.from_cache is True
+        assert r.content == b"v1"
+        assert adapter.sent[-1].headers["If-None-Match"] == '"a"'
+        assert adapter.revalidations == 1
+        # The request handed to hooks and users is the one they made.
+        assert "If-None-Match" not in r.request.headers
+
+    def test_last_modified(self, session, server, clock):
+        server.headers = {"Cache-Control": "max-age=0", "Last-Modified": clock.date()}
+        s, adapter = session()
+        s.get(URL)
+        clock.now += 1
+        assert s.get(URL).from_cache is True
+        assert adapter.sent[-1].headers["If-Modified-Since"] == clock.date(-1)
+
+    def test_304_freshens_entry(self, session, server, clock):
+        server.headers = {"Cache-Control": "max-age=10", "ETag": '"a"'}
+        s, adapter = session()
+        s.get(URL)
+        clock.now += 10
+        server.headers = {"Cache-Control": "max-age=100", "ETag": '"a"'}
+        assert s.get(URL).from_cache is True
+        assert len(adapter.sent) == 2
+        # Fresh again, for the new max-age, from the time of the 304.
+        clock.now += 99
+        r = s.get(URL)
+        assert r.from_cache is True
+        assert r.headers["Cache-Control"] == "max-age=100"
+        assert len(adapter.sent) == 2
+
+    def test_changed_resource_replaces_entry(self, session, server, clock):
+        server.headers = {"Cache-Control": "no-cache", "ETag": '"a"'}
+        s, adapter = session()
+        s.get(URL)
+        server.headers = {"Cache-Control": "no-cache", "ETag": '"b"'}
+        server.body = b"v2"
+        r = s.get(URL)
+        assert r.from_cache is False
+        assert r.content == b"v2"
+        assert s.get(URL).content == b"v2"
+        assert adapter.sent[-1].headers["If-None-Match"] == '"b"'
+
+    def test_request_no_cache_revalidates(self, session, server):
+        server.headers = {"Cache-Control": "max-age=60", "ETag": '"a"'}
+        s, adapter = session()
+        s.get(URL)
+        r = s.get(URL, headers={"Cache-Control": "no-cache"})
+        assert r.from_cache is True
+        assert len(adapter.sent) == 2
+        assert adapter.revalidations == 1
+
+
+class TestVary:
+    def test_vary(self, session, server):
+        server.headers = {"Cache-Control": "max-age=60", "Vary": "Accept-Language"}
+        s, adapter = session()
+        s.get(URL, headers={"Accept-Language": "en"})
+        assert s.get(URL, headers={"Accept-Language": "en"}).from_cache is True
+        assert s.get(URL, headers={"Accept-Language": "fr"}).from_cache is False
+        assert s.get(URL).from_cache is False
+
+    def test_vary_names_are_case_insensitive(self, session, server):
+        server.headers = {"Cache-Control": "max-age=60", "Vary": "accept-language"}
+        s, adapter = session()
+        s.get(URL, headers={"Accept-Language": "en"})
+        assert s.get(URL, headers={"ACCEPT-LANGUAGE": "en"}).from_cache is True
+
+
+class TestCounters:
+    def test_counters(self, session, server, clock):
+        server.headers = {"Cache-Control": "max-age=10", "ETag": '"a"'}
+        server.body = b"x" * 100
+        s, adapter = session()
+        s.get(URL)
+        s.get(URL)
+        clock.now += 10
+        s.get(URL)
+        assert (adapter.hits, adapter.misses, adapter.revalidations) == (1, 1, 1)
+        assert adapter.bytes_saved == 200
+
+
+@pytest.fixture(params=["memory", "file", "sqlite"])
+def backend(request, tmp_path):
+    if request.param == "memory":
+        cache = MemoryCache()
+    elif request.param == "file":
+        cache = FileCache(str(tmp_path / "cache"))
+    else:
+        cache = SQLiteCache(str(tmp_path / "cache.db"))
+    yield cache
+    cache.close()
+
+
+class TestBackends:
+    def test_get_set_delete(self, backend):
+        assert backend.get("a") is None
+        backend.set("a", b"1")
+        backend.set("b", b"2")
+        backend.set("a", b"3")
+        assert backend.get("a") == b"3"
+        assert backend.get("b") == b"2"
+        backend.delete("a")
+        backend.delete("missing")
+        assert backend.get("a") is None
+
+    def test_adapter_roundtrip(self, backend, session, server, clock):
+        server.headers = {"Cache-Control": "max-age=60", "X-Custom": "1"}
+        server.body = bytes(range(256))
+        s, adapter = session(cache=backend)
+        s.get(URL)
+        r = s.get(URL)
+        assert r.from_cache is True
+        assert r.content == bytes(range(256))
+        assert r.headers["X-Custom"] == "1"
+        assert r.headers["Content-Length"] == "256"
+
+    def test_unreadable_entry_is_a_miss(self, backend, session, server):
+        server.headers = {"Cache-Control": "max-age=60"}
+        s, adapter = session(cache=backend)
+        backend.set(URL, b"garbage")
+        assert s.get(URL).from_cache is False
+        assert s.get(URL).from_cache is True
+
+
+class TestMemoryCache:
+    def test_evicts_least_recently_used(self):
+        cache = MemoryCache(max_bytes=10)
+        cache.set("a", b"1234")
+        cache.set("b", b"1234")
+        cache.get("a")
+        cache.set("c", b"1234")
+        assert cache.get("b") is None
+        assert cache.get("a") == cache.get("c") == b"1234"
+        assert cache.size == 8
+
+    def test_oversized_value_not_stored(self):
+        cache = MemoryCache(max_bytes=10)
+        cache.set("a", b"1234")
+        cache.set("a", b"x" * 11)
+        assert cache.get("a") is None
+        assert cache.size == 0
+
+
+class TestFileCache:
+    def test_sharded(self, tmp_path):
+        cache = FileCache(str(tmp_path), shards=2)
+        cache.set("key", b"value")
+        (path,) = [
+            os.path.relpath(os.path.join(root, name), tmp_path)
+            for root, _, names in os.walk(tmp_path)
+            for name in names
+        ]
+        first, second, name = path.split(os.sep)
+        assert name.startswith(first + second)
+        assert len(first) == len(second) == 2
+
+    def test_persistent(self, tmp_path):
+        FileCache(str(tmp_path)).set("key", b"value")
+        assert FileCache(str(tmp_path)).get("key") == b"value"
+
+
+class TestSQLiteCache:
+    def test_persistent(self, tmp_path):
+        cache = SQLiteCache(str(tmp_path / "db"))
+        cache.set("key", b"value")
+        cache.close()
+        cache = SQLiteCache(str(tmp_path / "db"))
+        assert cache.get("key") == b"value"
+        cache.close()
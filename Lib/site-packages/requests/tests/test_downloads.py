@@ -0,0 +1,157 @@
+import hashlib
+import os
+import re
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import requests
+from requests import downloads
+from requests.exceptions import ConnectionError, HTTPError
+
+BODY = os.urandom(256 * 1024)
+
+
+class RangeHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def _head(self, status, start, end):
+        self.send_response(status)
+        self.send_header("Accept-Ranges", "bytes")
+        self.send_header("ETag", '"v1"')
+        self.send_header("Content-Length", str(end - start + 1))
+        if status == 206:
+            self.send_header("Content-Range", f"bytes {start}-{end}/{len(BODY)}")
+        self.end_headers()
+
+    def _range(self):
+        match = re.match(r"bytes=(\d+)-(\d*)", self.headers.get("Range", ""))
+        if not match:
+            return 200, 0, len(BODY) - 1
+        start = int(match.group(1))
+        end = int(match.group(2)) if match.group(2) else len(BODY) - 1
+        return 206, start, end
+
+    def do_HEAD(self):
+        self._head(200, 0, len(BODY) - 1)
+
+    def do_GET(self):
+        server = self.server
+        status, start, end = self._range()
+        with server.lock:
+            server.requests.append(self.headers.get("Range"))
+            drop = server.drops > 0
+            server.drops -= drop
+        if start in server.fail_starts:
+            self.send_error(500)
+            return
+        self._head(status, start, end)
+        data = BODY[start : end + 1]
+        if drop:
+            # Drop the connection halfway through the body.
+            self.wfile.write(data[: len(data) // 2])
+            self.wfile.flush()
+            self.connection.shutdown(socket.SHUT_RDWR)
+            self.close_connection = True
+            return
+        for i in range(0, len(data), 16384):
+            if server.delay:
+                time.sleep(server.delay)
+            self.wfile.write(data[i : i + 16384])
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), RangeHandler)
+    httpd.daemon_threads = True
+    httpd.lock = threading.Lock()
+    httpd.requests = []
+    httpd.drops = 0
+    httpd.delay = 0
+    httpd.fail_starts = set()
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    httpd.url = f"http://127.0.0.1:{httpd.server_port}/file"
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+class TestDownload:
+    def test_download(self, server, tmp_path):
+        path = tmp_path / "file"
+        with requests.Session() as session:
+            r = session.download(server.url, path, hash_name="sha256")
+        assert path.read_bytes() == BODY
+        assert r.digest == hashlib.sha256(BODY).hexdigest()
+
+    def test_resume(self, server, tmp_path):
+        server.drops = 2
+        path = tmp_path / "file"
+        with requests.Session() as session:
+            session.download(server.url, path, buffer_size=4096)
+        assert path.read_bytes() == BODY
+        assert server.requests[0] is None
+        assert server.requests[1].startswith("bytes=")
+
+    def test_resume_after_failed_reconnect(self, server, tmp_path, monkeypatch):
+        # Reopening the range fails once; that uses up a resume, not the
+        # whole download.
+        server.drops = 1
+        failures = [ConnectionError("refused")]
+        real_get = downloads._get_range
+
+        def flaky_get_range(*args):
+            if failures:
+                raise failures.pop()
+            return real_get(*args)
+
+        monkeypatch.setattr(downloads, "_get_range", flaky_get_range)
+        path = tmp_path / "file"
+        with requests.Session() as session:
+            session.download(server.url, path, buffer_size=4096, max_resumes=2)
+        assert path.read_bytes() == BODY
+
+    def test_resumes_exhausted(self, server, tmp_path):
+        server.drops = 10
+        with requests.Session() as session:
+            with pytest.raises(
+                (ConnectionError, requests.exceptions.ChunkedEncodingError)
+            ):
+                session.download(
+                    server.url, tmp_path / "file", buffer_size=4096, max_resumes=2
+                )
+        assert len(server.requests) == 3
+
+
+class TestSegmentedDownload:
+    @pytest.fixture(autouse=True)
+    def small_segments(self, monkeypatch):
+        monkeypatch.setattr(downloads, "MIN_SEGMENT_SIZE", 16 * 1024)
+
+    def test_segments(self, server, tmp_path):
+        path = tmp_path / "file"
+        with requests.Session() as session:
+            r = session.download(server.url, path, segments=4, hash_name="md5")
+        assert path.read_bytes() == BODY
+        assert r.digest == hashlib.md5(BODY).hexdigest()
+        assert len([r for r in server.requests if r]) == 4
+
+    def test_failed_segment_stops_the_others(self, server, tmp_path):
+        # Each segment takes 64 KiB / 16 KiB * 0.5 s = 2 s; the others are
+        # given up after their current 16 KiB chunk.
+        server.delay = 0.5
+        server.fail_starts = {len(BODY) // 4}
+        start = time.monotonic()
+        with requests.Session() as session:
+            with pytest.raises(HTTPError):
+                session.download(
+                    server.url, tmp_path / "file", segments=4, buffer_size=16384
+                )
+        assert time.monotonic() - start < 1.5
@@ -0,0 +1,107 @@
+import json
+import random
+
+import pytest
+
+from requests.exceptions import JSONDecodeError
+from requests.jsonstream import project_json
+from requests.models import Response
+
+CHUNK_SIZES = [1, 2, 3, 4, 5, 7, 11, 64, 4096]
+
+
+def json_response(body, encoding="utf-8"):
+    response = Response()
+    response.status_code = 200
+    response._content = body
+    response._content_consumed = True
+    response.encoding = encoding
+    return response
+
+
+def random_value(rng, depth=0):
+    kind = rng.randrange(9 if depth < 4 else 6)
+    if kind == 0:
+        return rng.randint(-(10**12), 10**12)
+    if kind == 1:
+        return rng.choice([1.5, -0.25, 10.25, 2e3, 1e-7, -3.5e21, 0.1, 123456.789])
+    if kind == 2:
+        return rng.random() * 10 ** rng.randint(-5, 5)
+    if kind == 3:
+        chars = 'ab"\\/\b\f\n\r\té☃\U0001f600 '
+        return "".join(rng.choice(chars) for _ in range(rng.randrange(12)))
+    if kind == 4:
+        return rng.choice([True, False, None])
+    if kind == 5:
+        return ""
+    if kind in (6, 7):
+        return [random_value(rng, depth + 1) for _ in range(rng.randrange(5))]
+    return {
+        f"k{rng.randrange(6)}": random_value(rng, depth + 1)
+        for _ in range(rng.randrange(5))
+    }
+
+
+def documents():
+    rng = random.Random(0)
+    yield [1.5, 2e3, 7]
+    yield {"a": 10.25, "b": 1}
+    for _ in range(60):
+        yield [random_value(rng) for _ in range(rng.randrange(1, 8))]
+
+
+def dumps(doc, rng):
+    indent = rng.choice([None, None, 0, 2])
+    return json.dumps(doc, indent=indent, ensure_ascii=rng.random() < 0.5)
+
+
+class TestIterJsonItems:
+    @pytest.mark.parametrize("chunk_size", CHUNK_SIZES)
+    def test_matches_json_loads(self, chunk_size):
+        rng = random.Random(chunk_size)
+        for doc in documents():
+            if not isinstance(doc, list):
+                continue
+            body = dumps(doc, rng).encode("utf-8")
+            response = json_response(body)
+            items = list(response.iter_json_items(chunk_size=chunk_size))
+            assert items == json.loads(body)
+
+    @pytest.mark.parametrize("chunk_size", CHUNK_SIZES)
+    def test_path(self, chunk_size):
+        body = json.dumps({"meta": {"n": 2.5}, "data": {"items": [1.5, {"x": 2e3}]}})
+        response = json_response(body.encode())
+        items = list(response.iter_json_items("data.items", chunk_size=chunk_size))
+        assert items == [1.5, {"x": 2e3}]
+
+    def test_missing_path(self):
+        response = json_response(b'{"a": [1, 2]}')
+        assert list(response.iter_json_items("b")) == []
+
+    @pytest.mark.parametrize("chunk_size", [1, 3, 4096])
+    def test_invalid(self, chunk_size):
+        response = json_response(b"[1, 2,, 3]")
+        with pytest.raises(JSONDecodeError):
+            list(response.iter_json_items(chunk_size=chunk_size))
+
+
+class TestJsonFields:
+    @pytest.mark.parametrize("chunk_size", CHUNK_SIZES)
+    def test_matches_json_loads(self, chunk_size):
+        rng = random.Random(chunk_size)
+        for doc in documents():
+            doc = {"a": doc, "b": {"c": doc, "d": 10.25}, "e": 1.5}
+            body = dumps(doc, rng).encode("utf-8")
+            response = json_response(body)
+            expected = json.loads(body)
+            projected = project_json(response, ["a", "b.d"], chunk_size)
+            assert projected == {"a": expected["a"], "b": {"d": expected["b"]["d"]}}
+
+    @pytest.mark.parametrize("chunk_size", CHUNK_SIZES)
+    def test_number_split_across_chunks(self, chunk_size):
+        response = json_response(b'{"a": 10.25, "b": 1}')
+        assert project_json(response, ["a"], chunk_size) == {"a": 10.25}
+
+    def test_fields(self):
+        response = json_response(b'{"a": {"b": 1, "c": [2.5]}, "d": null}')
+        assert response.json(fields=["a.c", "d"]) == {"a": {"c": [2.5]}, "d": None}
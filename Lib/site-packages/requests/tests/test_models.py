@@ -0,0 +1,73 @@
+import gzip
+import io
+import json
+import pickle
+
+import pytest
+from urllib3.response import HTTPResponse
+
+from requests.models import PreparedRequest, Response
+
+
+class BytesJSONCodec:
+    """A codec that, like orjson, only takes bytes."""
+
+    @staticmethod
+    def loads(data):
+        assert isinstance(data, bytes)
+        return json.loads(data)
+
+    @staticmethod
+    def dumps(obj):
+        return json.dumps(obj).encode()
+
+
+def json_response(body, encoding=None, json_codec=None):
+    response = Response()
+    response.status_code = 200
+    response._content = body
+    response.encoding = encoding
+    response.json_codec = json_codec
+    return response
+
+
+class TestJsonCodec:
+    @pytest.mark.parametrize("json_codec", [None, BytesJSONCodec()])
+    def test_unknown_charset(self, json_codec):
+        response = json_response(b'{"a": 1}', "bogus-charset", json_codec)
+        assert response.json() == {"a": 1}
+
+    def test_other_charset(self):
+        body = '{"a": "été"}'.encode("latin-1")
+        response = json_response(body, "latin-1", BytesJSONCodec())
+        assert response.json() == {"a": "été"}
+
+
+class TestParsedUrl:
+    def test_unpickled_from_older_version(self):
+        request = PreparedRequest()
+        request.prepare(method="GET", url="https://example.com:8443/path?q=1")
+        # Older versions did not cache the parsed URL.
+        del request._parsed_url
+        request = pickle.loads(pickle.dumps(request))
+        assert request.parsed_url.port == 8443
+        assert request.copy().parsed_url.path == "/path"
+
+
+class TestIterInto:
+    def test_gzip_members(self):
+        # Each member fills the buffer exactly, so the next member's header
+        # is decoded on its own, to nothing.
+        member = b"abc" * 10
+        raw = HTTPResponse(
+            io.BytesIO(gzip.compress(member) * 100),
+            headers={"content-encoding": "gzip"},
+            preload_content=False,
+        )
+        response = Response()
+        response.raw = raw
+
+        out = bytearray()
+        for chunk in response.iter_into(bytearray(len(member))):
+            out += chunk
+        assert bytes(out) == member * 100
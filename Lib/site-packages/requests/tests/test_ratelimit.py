@@ -0,0 +1,188 @@
+import pickle
+
+import pytest
+
+import requests
+from requests import ratelimit
+from requests.adapters import HTTPAdapter
+from requests.models import Response
+from requests.ratelimit import RateLimitingHTTPAdapter, _parse_limits
+
+
+class FakeClock:
+    """Stands in for the time module: sleeping moves the clock forward."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(ratelimit, "time", clock)
+    return clock
+
+
+class ScriptedTransport(HTTPAdapter):
+    """Answers with the queued headers (and status), recording when each
+    request went out."""
+
+    def __init__(self, clock, **kwargs):
+        self.clock = clock
+        self.sent = []
+        self.replies = []
+        super().__init__(**kwargs)
+
+    def send(self, request, **kwargs):
+        self.sent.append((self.clock.now, request.url))
+        status, headers = self.replies.pop(0) if self.replies else (200, {})
+        response = Response()
+        response.status_code = status
+        response.headers.update(headers)
+        response.url = request.url
+        response.request = request
+        response._content = b""
+        return response
+
+
+class Adapter(RateLimitingHTTPAdapter, ScriptedTransport):
+    pass
+
+
+@pytest.fixture
+def session(clock):
+    def factory(**kwargs):
+        adapter = Adapter(clock=clock, margin=0, **kwargs)
+        session = requests.Session()
+        session.mount("https://", adapter)
+        return session, adapter
+
+    return factory
+
+
+def send_times(adapter):
+    return [round(at - 1000.0, 6) for at, _ in adapter.sent]
+
+
+class TestParseLimits:
+    def test_parse(self):
+        assert _parse_limits("20:1,100:120") == [(20, 1.0), (100, 120.0)]
+
+    def test_malformed_entries_skipped(self):
+        assert _parse_limits("20:1, x:2, 5:, 3:0, 7:0.5") == [(20, 1.0), (7, 0.5)]
+
+
+class TestRoutes:
+    def route(self, adapter, url):
+        return adapter.route_for(requests.Request("GET", url).prepare())
+
+    def test_template(self, session):
+        _, adapter = session(routes=["/lol/match/v5/matches/{matchId}"])
+        url = "https://euw1.example/lol/match/v5/matches/EUW1_6543210"
+        assert self.route(adapter, url) == "/lol/match/v5/matches/{matchId}"
+        # The template matches the whole path.
+        url += "/timeline"
+        assert self.route(adapter, url) == "/lol/match/v5/matches/{}/timeline"
+
+    def test_identifier_segments_grouped(self, session):
+        _, adapter = session()
+        url = "https://h.example/summoner/v4/summoners/by-puuid/" + "a" * 78
+        assert self.route(adapter, url) == "/summoner/v4/summoners/by-puuid/{}"
+        assert self.route(adapter, "https://h.example/status/v4") == "/status/v4"
+
+
+class TestRateLimiting:
+    def test_initial_limits(self, session, clock):
+        s, adapter = session(app_limits="2:1,3:10")
+        for _ in range(4):
+            s.get("https://api.example/a")
+        # Two per second, then the ten second window is full.
+        assert send_times(adapter) == [0, 0, 1, 10]
+        assert adapter.throttled_requests == 2
+        assert adapter.throttled_seconds == 1 + 9
+
+    def test_never_more_than_limit_in_any_window(self, session):
+        s, adapter = session(app_limits="3:1,5:4")
+        for i in range(20):
+            s.get(f"https://api.example/{i % 2}")
+        times = send_times(adapter)
+        for limit, seconds in ((3, 1), (5, 4)):
+            for i, start in enumerate(times):
+                in_window = [t for t in times[i:] if t < start + seconds]
+                assert len(in_window) <= limit
+
+    def test_limits_learned_from_headers(self, session, clock):
+        s, adapter = session()
+        adapter.replies.append((200, {"X-Method-Rate-Limit": "1:5"}))
+        s.get("https://api.example/a/11")
+        s.get("https://api.example/a/22")
+        # Another route has its own method bucket.
+        s.get("https://api.example/b")
+        assert send_times(adapter) == [0, 5, 5]
+        key = ("https", "api.example", "/a/{}")
+        assert adapter.throttled_seconds_by_route == {key: 5}
+
+    def test_limits_per_host(self, session):
+        s, adapter = session(app_limits="1:1")
+        s.get("https://one.example/")
+        s.get("https://two.example/")
+        s.get("https://one.example/")
+        assert send_times(adapter) == [0, 0, 1]
+
+    def test_counts_synced_from_headers(self, session):
+        # The server counted sends made elsewhere with the same key.
+        s, adapter = session()
+        adapter.replies.append(
+            (200, {"X-App-Rate-Limit": "3:1", "X-App-Rate-Limit-Count": "3:1"})
+        )
+        s.get("https://api.example/a")
+        s.get("https://api.example/a")
+        assert send_times(adapter) == [0, 1]
+
+    @pytest.mark.parametrize(
+        "limit_type, blocked",
+        [("application", ["/a", "/b"]), ("method", ["/a"])],
+    )
+    def test_retry_after(self, session, limit_type, blocked):
+        s, adapter = session()
+        adapter.replies.append(
+            (429, {"Retry-After": "7", "X-Rate-Limit-Type": limit_type})
+        )
+        assert s.get("https://api.example/a").status_code == 429
+        s.get("https://api.example/b")
+        s.get("https://api.example/a")
+        # /b goes first when not blocked; everything blocked waits 7 s.
+        assert send_times(adapter)[1:] == [
+            7 if "/b" in blocked else 0,
+            7,
+        ]
+
+    def test_invalid_retry_after_ignored(self, session):
+        s, adapter = session()
+        adapter.replies.append((429, {"Retry-After": "soon"}))
+        s.get("https://api.example/a")
+        s.get("https://api.example/a")
+        assert send_times(adapter) == [0, 0]
+        assert adapter.throttled_requests == 0
+
+
+class TestPickle:
+    def test_configuration_kept_state_reset(self, clock):
+        adapter = RateLimitingHTTPAdapter(routes=["/m/{id}"], app_limits="1:1")
+        request = requests.Request("GET", "https://api.example/m/1").prepare()
+        adapter.acquire(request)
+        assert adapter.acquire(request) == pytest.approx(1.1)
+        assert adapter.throttled_requests == 1
+
+        copy = pickle.loads(pickle.dumps(adapter))
+        assert copy.routes == ["/m/{id}"]
+        assert copy.app_limits == "1:1"
+        assert copy.margin == 0.1
+        assert copy.throttled_requests == 0
+        assert copy.acquire(request) == 0
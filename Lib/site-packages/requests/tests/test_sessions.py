@@ -0,0 +1,60 @@
+import itertools
+import threading
+
+import requests
+from requests.adapters import BaseAdapter
+from requests.models import Response
+
+
+class CountingAdapter(BaseAdapter):
+    """Answers every request with an empty 200 response."""
+
+    def __init__(self):
+        super().__init__()
+        self.sent = 0
+        self._lock = threading.Lock()
+
+    def send(self, request, **kwargs):
+        with self._lock:
+            self.sent += 1
+        response = Response()
+        response.status_code = 200
+        response.url = request.url
+        response.request = request
+        response._content = b""
+        return response
+
+    def close(self):
+        pass
+
+
+class TestImapUnordered:
+    def test_infinite_input_yields(self):
+        session = requests.Session()
+        adapter = CountingAdapter()
+        session.mount("http://", adapter)
+        pulled = 0
+
+        def urls():
+            nonlocal pulled
+            for _ in itertools.count():
+                pulled += 1
+                yield "http://example.invalid/"
+
+        results = session.imap_unordered(urls(), max_workers=10, per_host_limit=2)
+        first = list(itertools.islice(results, 5))
+        results.close()
+
+        assert [r.status_code for r in first] == [200] * 5
+        # Read-ahead is bounded by max_workers, even when requests are
+        # held back by the per-host limit.
+        assert pulled <= 5 + 10
+
+    def test_map_keeps_order(self):
+        session = requests.Session()
+        session.mount("http://", CountingAdapter())
+        urls = [f"http://host{i % 3}.invalid/{i}" for i in range(20)]
+
+        results = session.map(urls, max_workers=4, per_host_limit=1)
+
+        assert [r.url for r in results] == urls
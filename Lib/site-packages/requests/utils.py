@@ -9,6 +9,7 @@ that are also useful for external consumption.
 import codecs
 import contextlib
 import io
+import itertools
 import os
 import re
 import socket
@@ -35,6 +36,7 @@ from .compat import (
     Mapping,
     basestring,
     bytes,
+    chardet,
     getproxies,
     getproxies_environment,
     integer_types,
@@ -551,14 +553,44 @@ def get_encoding_from_headers(headers):
         return "utf-8"
 
 
+def _detect_stream_encoding(iterator):
+    """Detects the encoding of a stream from as few of its first chunks as
+    the detector needs, keeping at most its window in memory.
+
+    :rtype: tuple
+    :returns: The encoding (None when the available detection library cannot
+        work on a stream) and an iterator over the whole stream.
+    """
+    detector_class = getattr(chardet, "IncrementalDetector", None)
+    if detector_class is None:
+        return None, iterator
+
+    iterator = iter(iterator)
+    detector = detector_class()
+    consumed = []
+    for chunk in iterator:
+        consumed.append(chunk)
+        if detector.feed(chunk):
+            break
+
+    best = detector.close().best()
+    # Same fallback as ``Response.text``.
+    encoding = best.encoding if best is not None else "utf-8"
+    return encoding, itertools.chain(consumed, iterator)
+
+
 def stream_decode_response_unicode(iterator, r):
     """Stream decodes an iterator."""
 
-    if r.encoding is None:
+    encoding = r.encoding
+    if encoding is None:
+        encoding, iterator = _detect_stream_encoding(iterator)
+
+    if encoding is None:
         yield from iterator
         return
 
-    decoder = codecs.getincrementaldecoder(r.encoding)(errors="replace")
+    decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
     for chunk in iterator:
         rv = decoder.decode(chunk)
         if rv:
@@ -831,7 +863,8 @@ def select_proxy(url, proxies):
     :param url: The url being for the request
     :param proxies: A dictionary of schemes or schemes and hosts to proxy URLs
     """
-    proxies = proxies or {}
+    if not proxies:
+        return None
     urlparts = urlparse(url)
     if urlparts.hostname is None:
         return proxies.get(urlparts.scheme, proxies.get("all"))
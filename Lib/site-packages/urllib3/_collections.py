@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import sys
 import typing
 from collections import OrderedDict
 from enum import Enum, auto
@@ -40,6 +41,49 @@ class _Sentinel(Enum):
     not_passed = auto()
 
 
+# Field names of nearly every response. Their lowercased forms are computed
+# once and shared by all the HTTPHeaderDicts, instead of allocated per header.
+_COMMON_HEADER_NAMES = (
+    "Accept-Ranges",
+    "Access-Control-Allow-Origin",
+    "Age",
+    "Alt-Svc",
+    "Cache-Control",
+    "Connection",
+    "Content-Encoding",
+    "Content-Length",
+    "Content-Type",
+    "Date",
+    "ETag",
+    "Expires",
+    "Keep-Alive",
+    "Last-Modified",
+    "Location",
+    "Retry-After",
+    "Server",
+    "Set-Cookie",
+    "Strict-Transport-Security",
+    "Transfer-Encoding",
+    "Vary",
+    "Via",
+    "X-Content-Type-Options",
+    "X-Frame-Options",
+)
+
+_HEADER_NAME_LOWER: dict[str, str] = {}
+_HEADER_NAME_INTERNED: dict[str, str] = {}
+for _name in _COMMON_HEADER_NAMES:
+    for _cased in (_name, _name.lower(), _name.upper()):
+        _cased = sys.intern(_cased)
+        _HEADER_NAME_LOWER[_cased] = sys.intern(_name.lower())
+        _HEADER_NAME_INTERNED[_cased] = _cased
+del _name, _cased
+
+
+def _lower(key: str) -> str:
+    return _HEADER_NAME_LOWER.get(key) or key.lower()
+
+
 def ensure_can_construct_http_header_dict(
     potential: object,
 ) -> ValidHTTPHeaderSource | None:
@@ -233,13 +277,21 @@ class HTTPHeaderDict(typing.MutableMapping[str, str]):
     'foo=bar, baz=quxx'
     >>> headers['Content-Length']
     '7'
+
+    Headers built with :meth:`from_pairs`, as received ones are, keep the
+    parsed ``(name, value)`` pairs as they are and only index them on first
+    access.
     """
 
+    __slots__ = ("_container", "_pairs")
+
     _container: typing.MutableMapping[str, list[str]]
+    _pairs: typing.Sequence[tuple[str, str]] | None
 
     def __init__(self, headers: ValidHTTPHeaderSource | None = None, **kwargs: str):
         super().__init__()
         self._container = {}  # 'dict' is insert-ordered
+        self._pairs = None
         if headers is not None:
             if isinstance(headers, HTTPHeaderDict):
                 self._copy_from(headers)
@@ -248,22 +300,58 @@ class HTTPHeaderDict(typing.MutableMapping[str, str]):
         if kwargs:
             self.extend(kwargs)
 
+    @classmethod
+    def from_pairs(cls, pairs: typing.Sequence[tuple[str, str]]) -> Self:
+        """
+        Returns headers holding ``pairs``, a sequence of ``(name, value)``
+        string pairs with repeated names in received order, such as the
+        ``_headers`` of an :class:`http.client.HTTPMessage`.
+
+        ``pairs`` is not copied and must not be changed afterwards. It is
+        indexed on first access, so that headers nobody reads cost nothing
+        more than the list they were parsed into.
+        """
+        headers = cls.__new__(cls)
+        headers._pairs = pairs
+        return headers
+
+    def __getattr__(self, name: str) -> typing.Any:
+        # Only reached while the '_container' slot of headers built with
+        # from_pairs() is unset.
+        if name != "_container":
+            raise AttributeError(
+                f"{type(self).__name__!r} object has no attribute {name!r}"
+            )
+        container: dict[str, list[str]] = {}
+        for key, val in self._pairs or ():
+            key = _HEADER_NAME_INTERNED.get(key, key)
+            vals = container.get(_lower(key))
+            if vals is None:
+                container[_lower(key)] = [key, val]
+            else:
+                vals.append(val)
+        self._container = container
+        self._pairs = None
+        return container
+
     def __setitem__(self, key: str, val: str) -> None:
         # avoid a bytes/str comparison by decoding before httplib
         if isinstance(key, bytes):
             key = key.decode("latin-1")
-        self._container[key.lower()] = [key, val]
+        self._container[_lower(key)] = [key, val]
 
     def __getitem__(self, key: str) -> str:
-        val = self._container[key.lower()]
+        val = self._container[_lower(key)]
+        if len(val) == 2:
+            return val[1]
         return ", ".join(val[1:])
 
     def __delitem__(self, key: str) -> None:
-        del self._container[key.lower()]
+        del self._container[_lower(key)]
 
     def __contains__(self, key: object) -> bool:
         if isinstance(key, str):
-            return key.lower() in self._container
+            return _lower(key) in self._container
         return False
 
     def setdefault(self, key: str, default: str = "") -> str:
@@ -319,7 +407,7 @@ class HTTPHeaderDict(typing.MutableMapping[str, str]):
         # avoid a bytes/str comparison by decoding before httplib
         if isinstance(key, bytes):
             key = key.decode("latin-1")
-        key_lower = key.lower()
+        key_lower = _lower(key)
         new_vals = [key, val]
         # Keep the common case aka no item present as fast as possible
         vals = self._container.setdefault(key_lower, new_vals)
@@ -377,7 +465,7 @@ class HTTPHeaderDict(typing.MutableMapping[str, str]):
         """Returns a list of all the values for the named field. Returns an
         empty list if the key doesn't exist."""
         try:
-            vals = self._container[key.lower()]
+            vals = self._container[_lower(key)]
         except KeyError:
             if default is _Sentinel.not_passed:
                 # _DT is unbound; empty list is instance of List[str]
@@ -419,9 +507,8 @@ class HTTPHeaderDict(typing.MutableMapping[str, str]):
         return f"{type(self).__name__}({dict(self.itermerged())})"
 
     def _copy_from(self, other: HTTPHeaderDict) -> None:
-        for key in other:
-            val = other.getlist(key)
-            self._container[key.lower()] = [key, *val]
+        for key_lower, vals in other._container.items():
+            self._container[key_lower] = vals.copy()
 
     def copy(self) -> Self:
         clone = type(self)()
@@ -430,23 +517,24 @@ class HTTPHeaderDict(typing.MutableMapping[str, str]):
 
     def iteritems(self) -> typing.Iterator[tuple[str, str]]:
         """Iterate over all header lines, including duplicate ones."""
-        for key in self:
-            vals = self._container[key.lower()]
+        for vals in self._container.values():
             for val in vals[1:]:
                 yield vals[0], val
 
     def itermerged(self) -> typing.Iterator[tuple[str, str]]:
         """Iterate over all headers, merging duplicate ones together."""
-        for key in self:
-            val = self._container[key.lower()]
-            yield val[0], ", ".join(val[1:])
+        for vals in self._container.values():
+            if len(vals) == 2:
+                yield vals[0], vals[1]
+            else:
+                yield vals[0], ", ".join(vals[1:])
 
     def items(self) -> HTTPHeaderDictItemView:  # type: ignore[override]
         return HTTPHeaderDictItemView(self)
 
     def _has_value_for_header(self, header_name: str, potential_value: str) -> bool:
         if header_name in self:
-            return potential_value in self._container[header_name.lower()][1:]
+            return potential_value in self._container[_lower(header_name)][1:]
         return False
 
     def __ior__(self, other: object) -> HTTPHeaderDict:
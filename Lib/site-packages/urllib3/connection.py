@@ -1,6 +1,8 @@
 from __future__ import annotations
 
+import collections
 import datetime
+import functools
 import http.client
 import logging
 import os
@@ -8,15 +10,19 @@ import re
 import socket
 import sys
 import threading
+import time
 import typing
 import warnings
+import weakref
 from http.client import HTTPConnection as _HTTPConnection
 from http.client import HTTPException as HTTPException  # noqa: F401
 from http.client import ResponseNotReady
 from socket import timeout as SocketTimeout
 
 if typing.TYPE_CHECKING:
+    from .instrumentation import Instrument
     from .response import HTTPResponse
+    from .util.resolver import Resolver
     from .util.ssl_ import _TYPE_PEER_CERT_RET_DICT
     from .util.ssltransport import SSLTransport
 
@@ -48,6 +54,7 @@ from .exceptions import (
     NameResolutionError,
     NewConnectionError,
     ProxyError,
+    SSLError,
     SystemTimeWarning,
 )
 from .util import SKIP_HEADER, SKIPPABLE_HEADERS, connection, ssl_
@@ -91,6 +98,8 @@ class HTTPConnection(_HTTPConnection):
     - ``socket_options``: Set specific options on the underlying socket. If not specified, then
       defaults are loaded from ``HTTPConnection.default_socket_options`` which includes disabling
       Nagle's algorithm (sets TCP_NODELAY to 1) unless the connection is behind a proxy.
+    - ``resolver``: A :class:`~urllib3.util.resolver.Resolver` looking up the host name
+      instead of :func:`socket.getaddrinfo`, e.g. to cache the answers.
 
       For example, if you wish to enable TCP Keep Alive in addition to the defaults,
       you might pass:
@@ -129,6 +138,10 @@ class HTTPConnection(_HTTPConnection):
     _tunnel_port: int | None
     _tunnel_scheme: str | None
 
+    # Set by the pool when it has an instrument, along with the pool's name.
+    _instrument: Instrument | None = None
+    _instrument_host: str = ""
+
     def __init__(
         self,
         host: str,
@@ -142,6 +155,7 @@ class HTTPConnection(_HTTPConnection):
         ) = default_socket_options,
         proxy: Url | None = None,
         proxy_config: ProxyConfig | None = None,
+        resolver: Resolver | None = None,
     ) -> None:
         super().__init__(
             host=host,
@@ -153,6 +167,7 @@ class HTTPConnection(_HTTPConnection):
         self.socket_options = socket_options
         self.proxy = proxy
         self.proxy_config = proxy_config
+        self.resolver = resolver
 
         self._has_connected_to_proxy = False
         self._response_options = None
@@ -200,6 +215,8 @@ class HTTPConnection(_HTTPConnection):
                 self.timeout,
                 source_address=self.source_address,
                 socket_options=self.socket_options,
+                resolver=self.resolver,
+                _timing_hook=self._timing if self._instrument is not None else None,
             )
         except socket.gaierror as e:
             raise NameResolutionError(self.host, self, e) from e
@@ -218,6 +235,9 @@ class HTTPConnection(_HTTPConnection):
 
         return sock
 
+    def _timing(self, phase: str, seconds: float) -> None:
+        self._instrument.timing(self._instrument_host, phase, seconds)  # type: ignore[union-attr]
+
     def set_tunnel(
         self,
         host: str,
@@ -432,6 +452,13 @@ class HTTPConnection(_HTTPConnection):
         if self.sock is not None:
             self.sock.settimeout(self.timeout)
 
+        if self._instrument is not None:
+            # Connect now rather than when the headers are flushed, to keep
+            # connecting out of the send timing.
+            if self.sock is None:
+                self.connect()
+            start = time.perf_counter()
+
         # Store these values to be fed into the HTTPResponse
         # object later. TODO: Remove this in favor of a real
         # HTTP lifecycle mechanism.
@@ -512,6 +539,9 @@ class HTTPConnection(_HTTPConnection):
         if chunked:
             self.send(b"0\r\n\r\n")
 
+        if self._instrument is not None:
+            self._timing("send", time.perf_counter() - start)
+
     def request_chunked(
         self,
         method: str,
@@ -562,7 +592,13 @@ class HTTPConnection(_HTTPConnection):
         _shutdown = getattr(self.sock, "shutdown", None)
 
         # Get the response from http.client.HTTPConnection
-        httplib_response = super().getresponse()
+        if self._instrument is not None:
+            start = time.perf_counter()
+            httplib_response = super().getresponse()
+            headers_received = time.perf_counter()
+            self._timing("ttfb", headers_received - start)
+        else:
+            httplib_response = super().getresponse()
 
         try:
             assert_header_parsing(httplib_response.msg)
@@ -574,7 +610,7 @@ class HTTPConnection(_HTTPConnection):
                 exc_info=True,
             )
 
-        headers = HTTPHeaderDict(httplib_response.msg.items())
+        headers = _headers_from_message(httplib_response.msg)
 
         response = HTTPResponse(
             body=httplib_response,
@@ -591,8 +627,130 @@ class HTTPConnection(_HTTPConnection):
             request_url=resp_options.request_url,
             sock_shutdown=_shutdown,
         )
+        if self._instrument is not None:
+            if httplib_response.isclosed():
+                # Preloaded, or without a body.
+                self._timing("body", time.perf_counter() - headers_received)
+            else:
+                response._body_timer = (self._timing, headers_received)
         return response
 
+    def request_pipelined(
+        self,
+        requests: typing.Sequence[tuple[str, str, typing.Mapping[str, str]]],
+        *,
+        decode_content: bool = True,
+        enforce_content_length: bool = True,
+    ) -> typing.Iterator[HTTPResponse]:
+        """
+        Sends the ``(method, url, headers)`` requests back to back, without
+        bodies (HTTP/1.1 pipelining), then yields their responses in order.
+
+        The responses share the socket, so each is read entirely before the
+        next one is parsed. Errors are raised when reaching the response that
+        failed, the ones yielded before are complete. The iterator stops
+        early, closing the connection, after a response telling that the
+        server closes it: the requests left were not answered.
+        """
+        # This is needed here to avoid circular import errors
+        from .response import HTTPResponse
+
+        data = b"".join(
+            self._encode_pipelined_request(method, url, headers)
+            for method, url, headers in requests
+        )
+        if self.sock is None:
+            self.connect()
+        self.sock.settimeout(self.timeout)
+        self.sock.sendall(data)
+
+        self.sock.settimeout(self.timeout)
+        reader = _PipelinedReader(self.sock.makefile("rb"))
+        try:
+            for method, url, _ in requests:
+                httplib_response = self.response_class(reader, method=method)  # type: ignore[arg-type]
+                httplib_response.begin()
+                response = HTTPResponse(
+                    body=httplib_response,
+                    headers=_headers_from_message(httplib_response.msg),
+                    status=httplib_response.status,
+                    version=httplib_response.version,
+                    version_string=getattr(self, "_http_vsn_str", "HTTP/?"),
+                    reason=httplib_response.reason,
+                    preload_content=True,
+                    decode_content=decode_content,
+                    original_response=httplib_response,
+                    enforce_content_length=enforce_content_length,
+                    request_method=method,
+                    request_url=url,
+                )
+                yield response
+                if httplib_response.will_close:
+                    self.close()
+                    return
+        finally:
+            reader.fp.close()
+
+    def _encode_pipelined_request(
+        self, method: str, url: str, headers: typing.Mapping[str, str]
+    ) -> bytes:
+        # The request line and headers http.client.HTTPConnection.request()
+        # would send, and validates, for a request without a body.
+        match = _CONTAINS_CONTROL_CHAR_RE.search(method)
+        if match:
+            raise ValueError(
+                f"Method cannot contain non-token characters {method!r} (found at least {match.group()!r})"
+            )
+        self._validate_path(url)  # type: ignore[attr-defined]
+
+        header_keys = frozenset(to_str(k.lower()) for k in headers)
+        lines = [f"{method} {url or '/'} {self._http_vsn_str}".encode("ascii")]
+        if "host" not in header_keys:
+            host = self._tunnel_host or self.host
+            port = self._tunnel_port if self._tunnel_host else self.port
+            host_enc = host.encode("idna")
+            if ":" in host:
+                host_enc = b"[" + host_enc + b"]"
+            if port is not None and port != self.default_port:
+                host_enc += b":%d" % port
+            lines.append(b"Host: " + host_enc)
+        if "accept-encoding" not in header_keys:
+            lines.append(b"Accept-Encoding: identity")
+        if "user-agent" not in header_keys:
+            lines.append(b"User-Agent: " + _get_default_user_agent().encode("latin-1"))
+        for header, value in headers.items():
+            if value == SKIP_HEADER:
+                continue
+            header_enc = header.encode("ascii")
+            value_enc = value.encode("latin-1") if isinstance(value, str) else value
+            if not http.client._is_legal_header_name(header_enc):  # type: ignore[attr-defined]
+                raise ValueError(f"Invalid header name {header_enc!r}")
+            if http.client._is_illegal_header_value(value_enc):  # type: ignore[attr-defined]
+                raise ValueError(f"Invalid header value {value_enc!r}")
+            lines.append(header_enc + b": " + value_enc)
+        return b"\r\n".join(lines) + b"\r\n\r\n"
+
+
+class _PipelinedReader:
+    """
+    The buffered reader of a socket, shared by the pipelined responses read
+    from it: these close it once read, which must not lose what the buffer
+    holds of the next ones.
+    """
+
+    def __init__(self, fp: typing.BinaryIO) -> None:
+        self.fp = fp
+
+    def makefile(self, mode: str) -> _PipelinedReader:
+        # http.client.HTTPResponse reads from sock.makefile("rb").
+        return self
+
+    def __getattr__(self, name: str) -> typing.Any:
+        return getattr(self.fp, name)
+
+    def close(self) -> None:
+        pass
+
 
 class HTTPSConnection(HTTPConnection):
     """
@@ -612,6 +770,14 @@ class HTTPSConnection(HTTPConnection):
     assert_fingerprint: str | None = None
     _connect_callback: typing.Callable[..., None] | None = None
 
+    #: Whether the TLS handshake resumed the session of an earlier connection
+    #: to the same host, rather than being a full handshake.
+    tls_session_reused: bool = False
+
+    # (host, port) the TLS session is saved under once it can be resumed,
+    # which is after the handshake with TLS 1.3.
+    _tls_session_key: tuple[str, int] | None = None
+
     def __init__(
         self,
         host: str,
@@ -639,6 +805,7 @@ class HTTPSConnection(HTTPConnection):
         cert_file: str | None = None,
         key_file: str | None = None,
         key_password: str | None = None,
+        resolver: Resolver | None = None,
     ) -> None:
         super().__init__(
             host,
@@ -649,6 +816,7 @@ class HTTPSConnection(HTTPConnection):
             socket_options=socket_options,
             proxy=proxy,
             proxy_config=proxy_config,
+            resolver=resolver,
         )
 
         self.key_file = key_file
@@ -786,7 +954,10 @@ class HTTPSConnection(HTTPConnection):
 
             # Remove trailing '.' from fqdn hostnames to allow certificate validation
             server_hostname_rm_dot = server_hostname.rstrip(".")
+            tls_session_key = (server_hostname_rm_dot, self._tunnel_port or self.port)
 
+            if self._instrument is not None:
+                start = time.perf_counter()
             sock_and_verified = _ssl_wrap_socket_and_match_hostname(
                 sock=sock,
                 cert_reqs=self.cert_reqs,
@@ -804,8 +975,15 @@ class HTTPSConnection(HTTPConnection):
                 tls_in_tls=tls_in_tls,
                 assert_hostname=self.assert_hostname,
                 assert_fingerprint=self.assert_fingerprint,
+                tls_session_key=tls_session_key,
             )
             self.sock = sock_and_verified.socket
+            if self._instrument is not None:
+                self._timing("tls", time.perf_counter() - start)
+            if isinstance(self.sock, ssl.SSLSocket) and not tls_in_tls:
+                self.tls_session_reused = self.sock.session_reused
+                self._tls_session_key = tls_session_key
+                self._save_tls_session()
 
         # If an error occurs during connection/handshake we may need to release
         # our lock so another connection can probe the origin.
@@ -852,6 +1030,54 @@ class HTTPSConnection(HTTPConnection):
         if self._has_connected_to_proxy and self.proxy_is_verified is None:
             self.proxy_is_verified = sock_and_verified.is_verified
 
+    def _save_tls_session(self) -> None:
+        """
+        Saves the TLS session for the next connection to the host, unless it
+        cannot be resumed yet: TLS 1.3 servers send their session tickets
+        after the handshake, so this is tried again once a response is read.
+        """
+        session = self.sock.session  # type: ignore[union-attr]
+        if session is not None and (
+            session.has_ticket
+            or (self.sock.version() != "TLSv1.3" and session.id)  # type: ignore[union-attr]
+        ):
+            _save_tls_session(
+                self.sock.context,  # type: ignore[union-attr]
+                self._tls_session_key,  # type: ignore[arg-type]
+                session,
+            )
+            self._tls_session_key = None
+
+    def getresponse(self) -> HTTPResponse:
+        response = super().getresponse()
+        if self._tls_session_key is not None and self.sock is not None:
+            self._save_tls_session()
+        return response
+
+    @property
+    def is_connected(self) -> bool:
+        if self.sock is None:
+            return False
+        if not wait_for_read(self.sock, timeout=0.0):
+            return True
+        if ssl is None or not isinstance(self.sock, ssl.SSLSocket):
+            return False
+        # TLS 1.3 servers send session tickets once the handshake is done, so
+        # a connection that has not been used yet can be readable without
+        # anything being wrong with it. Let the TLS layer consume them.
+        timeout = self.sock.gettimeout()
+        try:
+            self.sock.settimeout(0.0)
+            self.sock.recv(1)
+        except ssl.SSLWantReadError:
+            return True
+        except OSError:
+            return False
+        finally:
+            self.sock.settimeout(timeout)
+        # Either closed (no data) or sent data nobody asked for.
+        return False
+
     def _connect_tls_proxy(self, hostname: str, sock: socket.socket) -> ssl.SSLSocket:
         """
         Establish a TLS connection to the proxy using the provided SSL context.
@@ -892,6 +1118,151 @@ class _WrappedAndVerifiedSocket(typing.NamedTuple):
     is_verified: bool
 
 
+# The TLS session of the last connection to each (host, port), which the next
+# one resumes instead of doing a full handshake. Sessions can only be resumed
+# with the context that created them, so they are kept per context.
+_TLS_SESSIONS_PER_CONTEXT = 256
+_tls_sessions: weakref.WeakKeyDictionary[
+    ssl.SSLContext, collections.OrderedDict[tuple[str, int], ssl.SSLSession]
+] = weakref.WeakKeyDictionary()
+_tls_sessions_lock = threading.Lock()
+
+
+def _get_tls_session(
+    context: ssl.SSLContext, key: tuple[str, int]
+) -> ssl.SSLSession | None:
+    with _tls_sessions_lock:
+        sessions = _tls_sessions.get(context)
+        return sessions.get(key) if sessions is not None else None
+
+
+def _save_tls_session(
+    context: ssl.SSLContext, key: tuple[str, int], session: ssl.SSLSession
+) -> None:
+    with _tls_sessions_lock:
+        sessions = _tls_sessions.get(context)
+        if sessions is None:
+            sessions = _tls_sessions[context] = collections.OrderedDict()
+        sessions[key] = session
+        sessions.move_to_end(key)
+        if len(sessions) > _TLS_SESSIONS_PER_CONTEXT:
+            sessions.popitem(last=False)
+
+
+def _file_states(*paths: str | None) -> tuple[tuple[int, int] | None, ...]:
+    """(mtime, size) of each file or directory, so that cached contexts see
+    changes."""
+    states = []
+    for path in paths:
+        state = None
+        if path:
+            try:
+                stat = os.stat(path)
+                state = (stat.st_mtime_ns, stat.st_size)
+            except OSError:
+                pass
+        states.append(state)
+    return tuple(states)
+
+
+def clear_ssl_context_cache() -> None:
+    """
+    Drops the SSLContexts shared by connections without an ``ssl_context``,
+    and the TLS sessions saved for them.
+
+    Changes to ``ca_certs``, ``cert_file`` and ``key_file`` are told by their
+    modification time and size, and ``ca_cert_dir`` by the directory's, which
+    changes when certificates are added, removed or renamed (as by
+    ``c_rehash``). Call this after certificates change on disk in a way that
+    leaves those alone, such as a file in ``ca_cert_dir`` rewritten in place.
+    """
+    _default_ssl_context.cache_clear()
+    with _tls_sessions_lock:
+        _tls_sessions.clear()
+
+
+def _new_default_ssl_context(
+    ssl_version: int | None,
+    ssl_minimum_version: int | None,
+    ssl_maximum_version: int | None,
+    cert_reqs: int,
+    check_hostname: bool,
+    ca_certs: str | None,
+    ca_cert_dir: str | None,
+    ca_cert_data: None | str | bytes,
+    cert_file: str | None,
+    key_file: str | None,
+    key_password: str | None,
+) -> ssl.SSLContext:
+    """
+    The context of connections without an ``ssl_context``, with the CA
+    certificates and client certificate loaded.
+    """
+    context = create_urllib3_context(
+        ssl_version=ssl_version,
+        ssl_minimum_version=ssl_minimum_version,
+        ssl_maximum_version=ssl_maximum_version,
+        cert_reqs=cert_reqs,
+    )
+    context.verify_mode = cert_reqs
+    if not check_hostname:
+        context.check_hostname = False
+
+    if ca_certs or ca_cert_dir or ca_cert_data:
+        try:
+            context.load_verify_locations(ca_certs, ca_cert_dir, ca_cert_data)
+        except OSError as e:
+            raise SSLError(e) from e
+    # Try to load OS default certs if none are given. We need to do the hasattr() check
+    # for custom pyOpenSSL SSLContext objects because they don't support
+    # load_default_certs().
+    elif hasattr(context, "load_default_certs"):
+        context.load_default_certs()
+
+    ssl_._load_cert_chain(context, cert_file, key_file, key_password)
+    return context
+
+
+@functools.lru_cache(maxsize=32)
+def _default_ssl_context(
+    ssl_version: int | None,
+    ssl_minimum_version: int | None,
+    ssl_maximum_version: int | None,
+    cert_reqs: int,
+    check_hostname: bool,
+    ca_certs: str | None,
+    ca_cert_dir: str | None,
+    ca_cert_data: None | str | bytes,
+    cert_file: str | None,
+    key_file: str | None,
+    file_states: tuple[tuple[int, int] | None, ...],
+    sslkeylogfile: str | None,
+) -> ssl.SSLContext:
+    """
+    :func:`_new_default_ssl_context` shared by all the connections with the
+    same settings (``file_states`` and ``sslkeylogfile`` only being part of
+    the cache key), so that certificates are parsed once rather than for
+    every connection, and TLS sessions can be resumed across pools.
+
+    Contexts whose key needs a password are not cached, which would keep
+    the password alive in the cache key. See :func:`clear_ssl_context_cache`
+    for when certificates change on disk.
+    """
+    return _new_default_ssl_context(
+        ssl_version,
+        ssl_minimum_version,
+        ssl_maximum_version,
+        cert_reqs,
+        check_hostname,
+        ca_certs,
+        ca_cert_dir,
+        ca_cert_data,
+        cert_file,
+        key_file,
+        None,
+    )
+
+
 def _ssl_wrap_socket_and_match_hostname(
     sock: socket.socket,
     *,
@@ -910,28 +1281,18 @@ def _ssl_wrap_socket_and_match_hostname(
     server_hostname: str | None,
     ssl_context: ssl.SSLContext | None,
     tls_in_tls: bool = False,
+    tls_session_key: tuple[str, int] | None = None,
 ) -> _WrappedAndVerifiedSocket:
     """Logic for constructing an SSLContext from all TLS parameters, passing
     that down into ssl_wrap_socket, and then doing certificate verification
     either via hostname or fingerprint. This function exists to guarantee
     that both proxies and targets have the same behavior when connecting via TLS.
-    """
-    default_ssl_context = False
-    if ssl_context is None:
-        default_ssl_context = True
-        context = create_urllib3_context(
-            ssl_version=resolve_ssl_version(ssl_version),
-            ssl_minimum_version=ssl_minimum_version,
-            ssl_maximum_version=ssl_maximum_version,
-            cert_reqs=resolve_cert_reqs(cert_reqs),
-        )
-    else:
-        context = ssl_context
-
-    context.verify_mode = resolve_cert_reqs(cert_reqs)
 
+    With ``tls_session_key``, the TLS session saved under that key for the
+    context is resumed, if any.
+    """
     # In some cases, we want to verify hostnames ourselves
-    if (
+    check_hostname = not (
         # `ssl` can't verify fingerprints or alternate hostnames
         assert_fingerprint
         or assert_hostname
@@ -941,20 +1302,36 @@ def _ssl_wrap_socket_and_match_hostname(
         # hostnames easily: https://github.com/pyca/pyopenssl/pull/933
         or ssl_.IS_PYOPENSSL
         or not ssl_.HAS_NEVER_CHECK_COMMON_NAME
-    ):
-        context.check_hostname = False
+    )
 
-    # Try to load OS default certs if none are given. We need to do the hasattr() check
-    # for custom pyOpenSSL SSLContext objects because they don't support
-    # load_default_certs().
-    if (
-        not ca_certs
-        and not ca_cert_dir
-        and not ca_cert_data
-        and default_ssl_context
-        and hasattr(context, "load_default_certs")
-    ):
-        context.load_default_certs()
+    default_ssl_context = False
+    if ssl_context is None:
+        default_ssl_context = True
+        settings = (
+            resolve_ssl_version(ssl_version),
+            ssl_minimum_version,
+            ssl_maximum_version,
+            resolve_cert_reqs(cert_reqs),
+            check_hostname,
+            ca_certs,
+            ca_cert_dir,
+            ca_cert_data,
+            cert_file,
+            key_file,
+        )
+        if key_password is None:
+            context = _default_ssl_context(
+                *settings,
+                _file_states(ca_certs, ca_cert_dir, cert_file, key_file),
+                os.environ.get("SSLKEYLOGFILE"),
+            )
+        else:
+            context = _new_default_ssl_context(*settings, key_password)
+    else:
+        context = ssl_context
+        context.verify_mode = resolve_cert_reqs(cert_reqs)
+        if not check_hostname:
+            context.check_hostname = False
 
     # Ensure that IPv6 addresses are in the proper format and don't have a
     # scope ID. Python's SSL module fails to recognize scoped IPv6 addresses
@@ -966,18 +1343,33 @@ def _ssl_wrap_socket_and_match_hostname(
         if is_ipaddress(normalized):
             server_hostname = normalized
 
-    ssl_sock = ssl_wrap_socket(
-        sock=sock,
-        keyfile=key_file,
-        certfile=cert_file,
-        key_password=key_password,
-        ca_certs=ca_certs,
-        ca_cert_dir=ca_cert_dir,
-        ca_cert_data=ca_cert_data,
-        server_hostname=server_hostname,
-        ssl_context=context,
-        tls_in_tls=tls_in_tls,
-    )
+    tls_session = None
+    if tls_session_key is not None and not tls_in_tls and not ssl_.IS_PYOPENSSL:
+        tls_session = _get_tls_session(context, tls_session_key)
+
+    if default_ssl_context:
+        # The certificates are loaded in the context already.
+        ssl_sock = ssl_wrap_socket(
+            sock=sock,
+            server_hostname=server_hostname,
+            ssl_context=context,
+            tls_in_tls=tls_in_tls,
+            tls_session=tls_session,
+        )
+    else:
+        ssl_sock = ssl_wrap_socket(
+            sock=sock,
+            keyfile=key_file,
+            certfile=cert_file,
+            key_password=key_password,
+            ca_certs=ca_certs,
+            ca_cert_dir=ca_cert_dir,
+            ca_cert_data=ca_cert_data,
+            server_hostname=server_hostname,
+            ssl_context=context,
+            tls_in_tls=tls_in_tls,
+            tls_session=tls_session,
+        )
 
     try:
         if assert_fingerprint:
@@ -1072,6 +1464,16 @@ def _get_default_user_agent() -> str:
     return f"python-urllib3/{__version__}"
 
 
+def _headers_from_message(message: http.client.HTTPMessage) -> HTTPHeaderDict:
+    # http.client has already split the header block into the message's
+    # (name, value) list: adopt it rather than copying it pair by pair.
+    # items() only sanitizes surrogates, which latin-1 decoded headers lack.
+    pairs = getattr(message, "_headers", None)
+    if not isinstance(pairs, list):
+        pairs = list(message.items())
+    return HTTPHeaderDict.from_pairs(pairs)
+
+
 class DummyConnection:
     """Used to detect a failed ConnectionCls import."""
 
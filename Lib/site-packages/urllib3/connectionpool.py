@@ -3,7 +3,10 @@ from __future__ import annotations
 import errno
 import logging
 import queue
+import selectors
 import sys
+import threading
+import time
 import typing
 import warnings
 import weakref
@@ -57,6 +60,7 @@ if typing.TYPE_CHECKING:
     from typing_extensions import Self
 
     from ._base_connection import BaseHTTPConnection, BaseHTTPSConnection
+    from .instrumentation import Instrument
 
 log = logging.getLogger(__name__)
 
@@ -156,6 +160,35 @@ class HTTPConnectionPool(ConnectionPool, RequestMethods):
     :param retries:
         Retry configuration to use by default with requests in this pool.
 
+    :param keepalive_timeout:
+        Seconds a connection may sit idle in the pool and still be reused.
+        Set it a little below the server's keep-alive timeout: older
+        connections are reconnected instead of being handed out to race the
+        server closing them, and :meth:`prewarm` replaces them ahead of time.
+        ``None`` (default) reuses idle connections regardless of their age.
+
+    :param max_requests_per_conn:
+        Number of requests after which a connection is closed when it is
+        released, instead of being reused. ``None`` (default) for no limit.
+
+    :param maintenance_interval:
+        If set, the idle connections of the pool are checked every that many
+        seconds from a background thread shared by all pools: the ones the
+        server closed and the ones idle for longer than ``keepalive_timeout``
+        are evicted. Checking a connection out then skips the
+        :func:`~urllib3.util.connection.is_connection_dropped` system call.
+        A connection the server closes between two checks is only noticed
+        when it is used, which the default retries cover for idempotent
+        requests.
+
+    :param instrument:
+        An :class:`~urllib3.instrumentation.Instrument` receiving the timings
+        of the requests (waiting for a connection, DNS, connect, TLS, send,
+        time to first byte and body) and the connection and retry counters of
+        the pool, e.g. a
+        :class:`~urllib3.instrumentation.PercentileAggregator`. Nothing is
+        measured without one.
+
     :param _proxy:
         Parsed proxy URL, should not be used directly, instead, see
         :class:`urllib3.ProxyManager`
@@ -184,6 +217,10 @@ class HTTPConnectionPool(ConnectionPool, RequestMethods):
         _proxy: Url | None = None,
         _proxy_headers: typing.Mapping[str, str] | None = None,
         _proxy_config: ProxyConfig | None = None,
+        keepalive_timeout: float | None = None,
+        max_requests_per_conn: int | None = None,
+        maintenance_interval: float | None = None,
+        instrument: Instrument | None = None,
         **conn_kw: typing.Any,
     ):
         ConnectionPool.__init__(self, host, port)
@@ -200,6 +237,11 @@ class HTTPConnectionPool(ConnectionPool, RequestMethods):
 
         self.pool: queue.LifoQueue[typing.Any] | None = self.QueueCls(maxsize)
         self.block = block
+        self.keepalive_timeout = keepalive_timeout
+        self.max_requests_per_conn = max_requests_per_conn
+        self.maintenance_interval = maintenance_interval
+        self.instrument = instrument
+        self._instrument_host = _url_from_pool(self)
 
         self.proxy = _proxy
         self.proxy_headers = _proxy_headers or {}
@@ -212,8 +254,17 @@ class HTTPConnectionPool(ConnectionPool, RequestMethods):
         # These are mostly for testing and debugging purposes.
         self.num_connections = 0
         self.num_requests = 0
+        #: Connections closed by the pool, by reason: ``"dropped"`` by the
+        #: server, ``"idle"`` past ``keepalive_timeout`` and
+        #: ``"max_requests"`` past ``max_requests_per_conn``.
+        self.num_evictions = {"dropped": 0, "idle": 0, "max_requests": 0}
         self.conn_kw = conn_kw
 
+        # The connections of a multiplexed ConnectionCls (HTTP/2), which are
+        # shared by concurrent requests rather than queued in self.pool.
+        self._multiplexed_conns: list[typing.Any] = []
+        self._multiplexed_cond = threading.Condition()
+
         if self.proxy:
             # Enable Nagle's algorithm for proxies, to avoid packet fragmentation.
             # We cannot know if the user has added default socket options, so we cannot replace the
@@ -233,6 +284,9 @@ class HTTPConnectionPool(ConnectionPool, RequestMethods):
         # HTTPConnectionPool object is garbage collected.
         weakref.finalize(self, _close_pool_connections, pool)
 
+        if maintenance_interval is not None:
+            _reaper.register(self)
+
     def _new_conn(self) -> BaseHTTPConnection:
         """
         Return a fresh :class:`HTTPConnection`.
@@ -251,8 +305,15 @@ class HTTPConnectionPool(ConnectionPool, RequestMethods):
             timeout=self.timeout.connect_timeout,
             **self.conn_kw,
         )
+        self._instrument_conn(conn)
         return conn
 
+    def _instrument_conn(self, conn: BaseHTTPConnection) -> None:
+        if self.instrument is not None:
+            self.instrument.count(self._instrument_host, "connections_created")
+            conn._instrument = self.instrument  # type: ignore[attr-defined]
+            conn._instrument_host = self._instrument_host  # type: ignore[attr-defined]
+
     def _get_conn(self, timeout: float | None = None) -> BaseHTTPConnection:
         """
         Get a connection. Will return a pooled connection if one is available.
@@ -270,6 +331,12 @@ class HTTPConnectionPool(ConnectionPool, RequestMethods):
         if self.pool is None:
             raise ClosedPoolError(self, "Pool is closed.")
 
+        if self._is_multiplexed:
+            return self._get_stream(timeout)
+
+        if self.instrument is not None:
+            start = time.perf_counter()
+
         try:
             conn = self.pool.get(block=self.block, timeout=timeout)
 
@@ -284,13 +351,304 @@ class HTTPConnectionPool(ConnectionPool, RequestMethods):
                 ) from None
             pass  # Oh well, we'll create a new connection then
 
+        finally:
+            if self.instrument is not None:
+                self.instrument.timing(
+                    self._instrument_host, "pool_wait", time.perf_counter() - start
+                )
+
         # If this is a persistent connection, check if it got disconnected
-        if conn and is_connection_dropped(conn):
+        # (unless the reaper thread is watching for that).
+        if conn and self._is_idle_expired(conn):
+            log.debug("Resetting idle connection: %s", self.host)
+            self.num_evictions["idle"] += 1
+            conn.close()
+        elif (
+            conn
+            and self.maintenance_interval is None
+            and not conn.is_closed
+            and is_connection_dropped(conn)
+        ):
             log.debug("Resetting dropped connection: %s", self.host)
+            self.num_evictions["dropped"] += 1
             conn.close()
 
+        if conn and self.instrument is not None:
+            # A closed connection reconnects, which counts as a new one.
+            self.instrument.count(
+                self._instrument_host,
+                "connections_created" if conn.is_closed else "connections_reused",
+            )
+
         return conn or self._new_conn()
 
+    @property
+    def _is_multiplexed(self) -> bool:
+        return hasattr(self.ConnectionCls, "open_stream")
+
+    def _get_stream(self, timeout: float | None = None) -> BaseHTTPConnection:
+        """
+        Get a stream of a multiplexed connection, which stands in for a
+        connection. Streams are packed onto the first connections with streams
+        available, up to the number of concurrent streams the server allows
+        on each, and :prop:`.maxsize` limits the number of connections: once
+        they are all busy, a fresh one is only opened if :prop:`.block` is
+        ``False``, and closed once its streams are released.
+        """
+        if self.instrument is not None:
+            start = time.perf_counter()
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        stale = []
+        created = False
+        try:
+            with self._multiplexed_cond:
+                while True:
+                    if self.pool is None:
+                        raise ClosedPoolError(self, "Pool is closed.")
+
+                    conn = None
+                    for candidate in list(self._multiplexed_conns):
+                        if candidate.active_streams == 0 and self._is_stale(candidate):
+                            self._multiplexed_conns.remove(candidate)
+                            stale.append(candidate)
+                        elif conn is None and candidate.available_streams > 0:
+                            conn = candidate
+
+                    if conn is None and (
+                        len(self._multiplexed_conns) < self.pool.maxsize
+                        or not self.block
+                    ):
+                        conn = self._new_conn()
+                        self._multiplexed_conns.append(conn)
+                        created = True
+                    if conn is not None:
+                        stream = conn.open_stream(on_release=self._release_stream)
+                        break
+
+                    remaining = None
+                    if deadline is not None:
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            raise EmptyPoolError(
+                                self,
+                                "Pool is empty and a new connection can't be opened due to blocking mode.",
+                            )
+                    self._multiplexed_cond.wait(remaining)
+        finally:
+            for conn in stale:
+                conn.close()
+            if self.instrument is not None:
+                self.instrument.timing(
+                    self._instrument_host, "pool_wait", time.perf_counter() - start
+                )
+
+        if self.instrument is not None and not created:
+            self.instrument.count(self._instrument_host, "connections_reused")
+        return stream  # type: ignore[no-any-return]
+
+    def _is_stale(self, conn: typing.Any) -> bool:
+        """Whether an idle multiplexed connection should be closed."""
+        if not conn.can_open_streams:
+            return True
+        if conn.is_closed:
+            return False
+        if self._is_idle_expired(conn):
+            log.debug("Evicting idle connection: %s", self.host)
+            self.num_evictions["idle"] += 1
+            return True
+        if not conn.is_connected:
+            log.debug("Evicting dropped connection: %s", self.host)
+            self.num_evictions["dropped"] += 1
+            return True
+        return False
+
+    def _release_stream(self, stream: typing.Any) -> None:
+        conn = stream.connection
+        close = False
+        with self._multiplexed_cond:
+            if conn.active_streams == 0:
+                conn._idle_since = time.monotonic()
+                if conn in self._multiplexed_conns and (
+                    self.pool is None
+                    or not conn.can_open_streams
+                    or len(self._multiplexed_conns) > self.pool.maxsize
+                ):
+                    self._multiplexed_conns.remove(conn)
+                    close = True
+            self._multiplexed_cond.notify_all()
+        if close:
+            conn.close()
+
+    def _is_idle_expired(self, conn: BaseHTTPConnection) -> bool:
+        idle_since = getattr(conn, "_idle_since", None)
+        return (
+            self.keepalive_timeout is not None
+            and idle_since is not None
+            and time.monotonic() - idle_since > self.keepalive_timeout
+        )
+
+    def _connect_new_conn(self, conn: BaseHTTPConnection) -> None:
+        """
+        Connect a connection returned by :meth:`._new_conn`, including the
+        TLS handshake and the proxy tunnel if any.
+        """
+        if self.proxy is not None and connection_requires_http_tunnel(
+            self.proxy, self.proxy_config, self.scheme
+        ):
+            self._prepare_proxy(conn)
+        else:
+            conn.connect()
+
+    def prewarm(self, n: int | None = None) -> int:
+        """
+        Open connections ahead of the first requests, so that these do not
+        pay for the TCP and TLS handshakes one after the other.
+
+        Up to ``n`` (by default, all) free slots of the pool get a connected
+        connection, the handshakes running concurrently. Pooled connections
+        that were dropped or have been idle for longer than
+        :attr:`keepalive_timeout` count as free and are replaced, so calling
+        this periodically keeps the pool warm. Pools of multiplexed (HTTP/2)
+        connections open a single one, which serves concurrent requests.
+
+        :param n:
+            Maximum number of connections to open.
+
+        :returns:
+            The number of connections added to the pool. Connection errors
+            are only raised when no connection could be opened.
+        """
+        pool = self.pool
+        if pool is None:
+            raise ClosedPoolError(self, "Pool is closed.")
+
+        if self._is_multiplexed:
+            return self._prewarm_multiplexed(n)
+
+        # Entries of pool.queue are only read and replaced in place while
+        # holding pool.mutex, which Queue.get() and Queue.put() hold too.
+        with pool.mutex:
+            free = sum(1 for conn in pool.queue if self._is_free_slot(conn))
+        if n is not None:
+            free = min(free, n)
+        if free <= 0:
+            return 0
+
+        conns = [self._new_conn() for _ in range(free)]
+        errors: list[Exception] = []
+
+        def connect(conn: BaseHTTPConnection) -> None:
+            try:
+                self._connect_new_conn(conn)
+            except Exception as e:
+                log.debug("Failed to prewarm connection to %s: %r", self.host, e)
+                conn.close()
+                errors.append(e)
+
+        threads = [
+            threading.Thread(target=connect, args=(conn,), daemon=True)
+            for conn in conns
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        connected = [conn for conn in conns if not conn.is_closed]
+        if not connected and errors:
+            raise errors[0]
+
+        now = time.monotonic()
+        added = 0
+        with pool.mutex:
+            # A pool closed in the meantime is drained by close(), which
+            # replaces self.pool before taking the mutex to drain it.
+            if self.pool is pool:
+                # Slots taken in the meantime are not ours to fill anymore.
+                # The top of the LIFO queue is handed out first.
+                for i in reversed(range(len(pool.queue))):
+                    if not connected:
+                        break
+                    stale = pool.queue[i]
+                    if self._is_free_slot(stale):
+                        if stale:
+                            stale.close()
+                        conn = connected.pop()
+                        conn._idle_since = now  # type: ignore[union-attr]
+                        pool.queue[i] = conn
+                        added += 1
+
+        for conn in connected:
+            conn.close()
+        return added
+
+    def _prewarm_multiplexed(self, n: int | None) -> int:
+        # One multiplexed connection serves concurrent requests already.
+        with self._multiplexed_cond:
+            if n == 0 or any(
+                conn.can_open_streams for conn in self._multiplexed_conns
+            ):
+                return 0
+            conn = self._new_conn()
+            self._multiplexed_conns.append(conn)
+            stream = conn.open_stream(on_release=self._release_stream)
+        try:
+            self._connect_new_conn(stream)
+        finally:
+            stream.release()
+        return 0 if conn.is_closed else 1
+
+    def _is_free_slot(self, conn: BaseHTTPConnection | None) -> bool:
+        return (
+            not conn or self._is_idle_expired(conn) or is_connection_dropped(conn)
+        )
+
+    def _idle_sockets(self) -> list[tuple[BaseHTTPConnection, typing.Any]]:
+        """
+        Evict the pooled connections past ``keepalive_timeout`` and return the
+        remaining connected ones with their sockets. Used by the reaper.
+
+        Like :meth:`prewarm`, this only changes ``pool.queue`` in place and
+        under ``pool.mutex``. The returned sockets are polled without the
+        mutex, so :meth:`_evict_if_dropped` checks again that the connection
+        is still pooled before evicting it.
+        """
+        pool = self.pool
+        if pool is None:
+            return []
+        idle = []
+        with pool.mutex:
+            for i, conn in enumerate(pool.queue):
+                if not conn or conn.is_closed:
+                    continue
+                if self._is_idle_expired(conn):
+                    log.debug("Evicting idle connection: %s", self.host)
+                    self.num_evictions["idle"] += 1
+                    conn.close()
+                    pool.queue[i] = None
+                else:
+                    idle.append((conn, conn.sock))  # type: ignore[attr-defined]
+        return idle
+
+    def _evict_if_dropped(self, conn: BaseHTTPConnection) -> None:
+        """
+        Evict ``conn`` if it is still idle in the pool and the server closed
+        it. Used by the reaper once its socket polled readable.
+        """
+        pool = self.pool
+        if pool is None:
+            return
+        with pool.mutex:
+            for i, pooled in enumerate(pool.queue):
+                if pooled is conn:
+                    if is_connection_dropped(conn):
+                        log.debug("Evicting dropped connection: %s", self.host)
+                        self.num_evictions["dropped"] += 1
+                        conn.close()
+                        pool.queue[i] = None
+                    return
+
     def _put_conn(self, conn: BaseHTTPConnection | None) -> None:
         """
         Put a connection back into the pool.
@@ -304,7 +662,24 @@ class HTTPConnectionPool(ConnectionPool, RequestMethods):
         then maxsize should be increased.
 
         If the pool is closed, then the connection will be closed and discarded.
+
+        The streams of multiplexed connections are released instead.
         """
+        if self._is_multiplexed:
+            if conn is not None:
+                conn.release()  # type: ignore[attr-defined]
+            return
+
+        if conn:
+            conn._idle_since = time.monotonic()  # type: ignore[union-attr]
+            if (
+                self.max_requests_per_conn is not None
+                and getattr(conn, "_num_requests", 0) >= self.max_requests_per_conn
+            ):
+                log.debug("Closing connection after its last request: %s", self.host)
+                self.num_evictions["max_requests"] += 1
+                conn.close()
+
         if self.pool is not None:
             try:
                 self.pool.put(conn, block=False)
@@ -316,6 +691,10 @@ class HTTPConnectionPool(ConnectionPool, RequestMethods):
                 # Connection never got put back into the pool, close it.
                 if conn:
                     conn.close()
+                    if self.instrument is not None:
+                        self.instrument.count(
+                            self._instrument_host, "connections_discarded"
+                        )
 
                 if self.block:
                     # This should never happen if you got the conn from self._get_conn
@@ -453,6 +832,10 @@ class HTTPConnectionPool(ConnectionPool, RequestMethods):
             value of Content-Length header, if present. Otherwise, raise error.
         """
         self.num_requests += 1
+        # A closed connection is about to be connected again.
+        conn._num_requests = (  # type: ignore[attr-defined]
+            1 if conn.is_closed else getattr(conn, "_num_requests", 0) + 1
+        )
 
         timeout_obj = self._get_timeout(timeout)
         timeout_obj.start_connect()
@@ -567,6 +950,12 @@ class HTTPConnectionPool(ConnectionPool, RequestMethods):
         # Close all the HTTPConnections in the pool.
         _close_pool_connections(old_pool)
 
+        with self._multiplexed_cond:
+            multiplexed, self._multiplexed_conns = self._multiplexed_conns, []
+            self._multiplexed_cond.notify_all()
+        for conn in multiplexed:
+            conn.close()
+
     def is_same_host(self, url: str) -> bool:
         """
         Check if the given ``url`` is a member of the same host as this
@@ -959,6 +1348,200 @@ class HTTPConnectionPool(ConnectionPool, RequestMethods):
 
         return response
 
+    def pipeline(
+        self,
+        requests: typing.Sequence[str | tuple[str, str]],
+        headers: typing.Mapping[str, str] | None = None,
+        retries: Retry | bool | int | None = None,
+        redirect: bool = True,
+        timeout: _TYPE_TIMEOUT = _DEFAULT_TIMEOUT,
+        pool_timeout: int | None = None,
+        decode_content: bool = True,
+    ) -> list[BaseHTTPResponse]:
+        """
+        Make several requests with HTTP/1.1 pipelining: they are written back
+        to back on a single connection and their responses are read in order,
+        which saves a round trip per request to the servers supporting it.
+        The requests are sent without a body, and must be idempotent, as a
+        server may close the connection before having answered all of them.
+
+        If the connection fails (or the server closes it) before the last
+        response, the requests left are made one at a time with
+        :meth:`urlopen`, the failure counting against ``retries`` as it would
+        there. The requests whose response calls for a redirect or a retry
+        are made again with :meth:`urlopen` as well, which handles these.
+        Pools of multiplexed (HTTP/2) connections make the requests one at a
+        time.
+
+        :param requests:
+            URLs to ``GET``, or ``(method, url)`` pairs, on the pool's host.
+
+        :param headers, retries, redirect, timeout, pool_timeout, decode_content:
+            Same as for :meth:`urlopen`, used by every request.
+
+        :returns:
+            The responses, preloaded, in the order of ``requests``.
+        """
+        if headers is None:
+            headers = self.headers
+
+        if not isinstance(retries, Retry):
+            retries = Retry.from_int(retries, redirect=redirect, default=self.retries)
+
+        pending: list[tuple[str, str]] = []
+        for request in requests:
+            method, url = ("GET", request) if isinstance(request, str) else request
+            if method.upper() not in Retry.DEFAULT_ALLOWED_METHODS:
+                raise ValueError(f"Can't pipeline non-idempotent {method} requests")
+            if not self.is_same_host(url):
+                raise HostChangedError(self, url, retries)
+            if url.startswith("/"):
+                url = to_str(_encode_target(url))
+            else:
+                url = to_str(parse_url(url).url)
+            pending.append((method, url))
+
+        responses: list[BaseHTTPResponse | None] = [None] * len(pending)
+        request_retries = [retries] * len(pending)
+        if len(pending) > 1 and not self._is_multiplexed:
+            self._pipeline(
+                pending,
+                responses,
+                request_retries,
+                headers,
+                redirect,
+                timeout,
+                pool_timeout,
+                decode_content,
+            )
+
+        # Whatever was not answered on the pipelined connection.
+        for i, (method, url) in enumerate(pending):
+            if responses[i] is None:
+                responses[i] = self.urlopen(
+                    method,
+                    url,
+                    headers=headers,
+                    retries=request_retries[i],
+                    redirect=redirect,
+                    timeout=timeout,
+                    pool_timeout=pool_timeout,
+                    decode_content=decode_content,
+                )
+        return responses  # type: ignore[return-value]
+
+    def _pipeline(
+        self,
+        pending: list[tuple[str, str]],
+        responses: list[BaseHTTPResponse | None],
+        request_retries: list[Retry],
+        headers: typing.Mapping[str, str],
+        redirect: bool,
+        timeout: _TYPE_TIMEOUT,
+        pool_timeout: int | None,
+        decode_content: bool,
+    ) -> None:
+        """
+        Fills ``responses`` with the responses of the pipelined ``pending``
+        requests, leaving None for those to make again with :meth:`urlopen`,
+        and ``request_retries`` with the retries left for each.
+        """
+        retries = request_retries[0]
+        http_tunnel_required = connection_requires_http_tunnel(
+            self.proxy, self.proxy_config, self.scheme
+        )
+        if not http_tunnel_required:
+            headers = HTTPHeaderDict(headers)
+            headers.update(self.proxy_headers)
+
+        timeout_obj = self._get_timeout(timeout)
+        conn = self._get_conn(timeout=pool_timeout)
+        answered = 0
+        try:
+            conn.timeout = Timeout.resolve_default_timeout(timeout_obj.connect_timeout)
+            if self.proxy is not None and http_tunnel_required and conn.is_closed:
+                self._prepare_proxy(conn)
+            self._validate_conn(conn)
+            if conn.is_closed:
+                conn.connect()
+            conn.timeout = Timeout.resolve_default_timeout(timeout_obj.read_timeout)
+
+            self.num_requests += len(pending)
+            conn._num_requests = (  # type: ignore[attr-defined]
+                getattr(conn, "_num_requests", 0) + len(pending)
+            )
+            pipelined = conn.request_pipelined(  # type: ignore[attr-defined]
+                [(method, url, headers) for method, url in pending],
+                decode_content=decode_content,
+            )
+            for response in pipelined:
+                response.retries = retries
+                response._pool = self  # type: ignore[attr-defined]
+                responses[answered] = response
+                answered += 1
+        except (
+            TimeoutError,
+            HTTPException,
+            OSError,
+            ProtocolError,
+            BaseSSLError,
+            SSLError,
+            CertificateError,
+            ProxyError,
+        ) as e:
+            conn.close()
+            self._put_conn(conn)
+
+            method, url = pending[min(answered, len(pending) - 1)]
+            new_e: Exception = e
+            if isinstance(e, (BaseSSLError, CertificateError)):
+                new_e = SSLError(e)
+            elif isinstance(e, SocketTimeout):
+                new_e = ReadTimeoutError(
+                    self, url, f"Read timed out. (read timeout={conn.timeout})"
+                )
+            elif isinstance(e, (OSError, HTTPException)):
+                new_e = ProtocolError("Connection aborted.", e)
+            retries = retries.increment(
+                method, url, error=new_e, _pool=self, _stacktrace=sys.exc_info()[2]
+            )
+            log.warning(
+                "Retrying (%r) without pipelining after connection broken by '%r': %s",
+                retries,
+                e,
+                url,
+            )
+            retries.sleep()
+            request_retries[answered:] = [retries] * (len(pending) - answered)
+        else:
+            self._put_conn(conn)
+
+        for i, response in enumerate(responses):
+            if response is None:
+                continue
+            method, url = pending[i]
+            if redirect and response.get_redirect_location():
+                # urlopen() makes the request again and follows the redirect.
+                responses[i] = None
+                continue
+
+            # Same as urlopen() does for the responses it reads.
+            retries = request_retries[i]
+            has_retry_after = bool(response.headers.get("Retry-After"))
+            if retries.is_retry(method, response.status, has_retry_after):
+                try:
+                    retries = retries.increment(
+                        method, url, response=response, _pool=self
+                    )
+                except MaxRetryError:
+                    if retries.raise_on_status:
+                        raise
+                    continue
+                retries.sleep(response)
+                log.debug("Retry: %s", url)
+                request_retries[i] = retries
+                responses[i] = None
+
 
 class HTTPSConnectionPool(HTTPConnectionPool):
     """
@@ -1026,6 +1609,20 @@ class HTTPSConnectionPool(HTTPConnectionPool):
         self.assert_hostname = assert_hostname
         self.assert_fingerprint = assert_fingerprint
 
+        #: TLS handshakes of the pool's connections: ``"resumed"`` the session
+        #: of an earlier connection to the host, or ``"full"``.
+        self.num_tls_handshakes = {"full": 0, "resumed": 0}
+
+    def _count_tls_handshake(self, conn: BaseHTTPConnection) -> None:
+        kind = "resumed" if getattr(conn, "tls_session_reused", False) else "full"
+        self.num_tls_handshakes[kind] += 1
+        if self.instrument is not None:
+            self.instrument.count(self._instrument_host, f"tls_handshakes.{kind}")
+
+    def _connect_new_conn(self, conn: BaseHTTPConnection) -> None:
+        super()._connect_new_conn(conn)
+        self._count_tls_handshake(conn)
+
     def _prepare_proxy(self, conn: HTTPSConnection) -> None:  # type: ignore[override]
         """Establishes a tunnel connection through HTTP CONNECT."""
         if self.proxy and self.proxy.scheme == "https":
@@ -1064,7 +1661,7 @@ class HTTPSConnectionPool(HTTPConnectionPool):
             actual_host = self.proxy.host
             actual_port = self.proxy.port
 
-        return self.ConnectionCls(
+        conn = self.ConnectionCls(
             host=actual_host,
             port=actual_port,
             timeout=self.timeout.connect_timeout,
@@ -1081,6 +1678,8 @@ class HTTPSConnectionPool(HTTPConnectionPool):
             ssl_maximum_version=self.ssl_maximum_version,
             **self.conn_kw,
         )
+        self._instrument_conn(conn)
+        return conn
 
     def _validate_conn(self, conn: BaseHTTPConnection) -> None:
         """
@@ -1091,6 +1690,7 @@ class HTTPSConnectionPool(HTTPConnectionPool):
         # Force connect early to allow us to validate the connection.
         if conn.is_closed:
             conn.connect()
+            self._count_tls_handshake(conn)
 
         # TODO revise this, see https://github.com/urllib3/urllib3/issues/2791
         if not conn.is_verified and not conn.proxy_is_verified:
@@ -1167,6 +1767,83 @@ def _url_from_pool(
     return Url(scheme=pool.scheme, host=pool.host, port=pool.port, path=path).url
 
 
+class _ConnectionReaper:
+    """
+    Checks the idle connections of every pool with a ``maintenance_interval``
+    from one daemon thread, with one ``select()`` per round for all their
+    sockets.
+    """
+
+    def __init__(self) -> None:
+        self._pools: weakref.WeakKeyDictionary[HTTPConnectionPool, float] = (
+            weakref.WeakKeyDictionary()
+        )
+        self._lock = threading.Condition()
+        self._thread: threading.Thread | None = None
+
+    def register(self, pool: HTTPConnectionPool) -> None:
+        with self._lock:
+            self._pools[pool] = time.monotonic() + pool.maintenance_interval  # type: ignore[operator]
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run, name="urllib3-connection-reaper", daemon=True
+                )
+                self._thread.start()
+            self._lock.notify()
+
+    def _run(self) -> None:
+        while True:
+            with self._lock:
+                if not self._pools:
+                    self._thread = None
+                    return
+                timeout = self._wait_timeout()
+                if timeout > 0:
+                    # Only holds on to the pools weakly while waiting.
+                    self._lock.wait(timeout)
+                    continue
+            try:
+                self.sweep(self._take_due_pools())
+            except Exception:  # Defensive: keep the thread alive
+                log.debug("Connection reaper failed", exc_info=True)
+
+    def _wait_timeout(self) -> float:
+        return min(self._pools.values()) - time.monotonic()
+
+    def _take_due_pools(self) -> list[HTTPConnectionPool]:
+        with self._lock:
+            now = time.monotonic()
+            due = []
+            for pool, deadline in list(self._pools.items()):
+                if pool.pool is None:
+                    del self._pools[pool]
+                elif deadline <= now:
+                    due.append(pool)
+                    self._pools[pool] = now + pool.maintenance_interval  # type: ignore[operator]
+            return due
+
+    def sweep(self, pools: typing.Iterable[HTTPConnectionPool]) -> None:
+        with selectors.DefaultSelector() as selector:
+            for pool in pools:
+                for conn, sock in pool._idle_sockets():
+                    try:
+                        selector.register(sock, selectors.EVENT_READ, (pool, conn))
+                    except (ValueError, KeyError, OSError):
+                        # Closed since, or the same socket twice.
+                        continue
+            if not selector.get_map():
+                return
+            # An idle socket is only readable when the server closed the
+            # connection (or sent TLS session tickets, which the check under
+            # the pool lock tells apart).
+            for key, _ in selector.select(timeout=0):
+                pool, conn = key.data
+                pool._evict_if_dropped(conn)
+
+
+_reaper = _ConnectionReaper()
+
+
 def _close_pool_connections(pool: queue.LifoQueue[typing.Any]) -> None:
     """Drains a queue of connections and closes each one."""
     try:
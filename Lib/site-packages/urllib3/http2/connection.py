@@ -3,21 +3,29 @@ from __future__ import annotations
 import logging
 import re
 import threading
+import time
 import types
 import typing
+from socket import timeout as SocketTimeout
 
 import h2.config  # type: ignore[import-untyped]
 import h2.connection  # type: ignore[import-untyped]
+import h2.errors  # type: ignore[import-untyped]
 import h2.events  # type: ignore[import-untyped]
+import h2.exceptions  # type: ignore[import-untyped]
 
 from .._base_connection import _TYPE_BODY
 from .._collections import HTTPHeaderDict
 from ..connection import HTTPSConnection, _get_default_user_agent
-from ..exceptions import ConnectionError
+from ..exceptions import ConnectionError, ProtocolError
 from ..response import BaseHTTPResponse
+from ..util.wait import wait_for_read
 
 orig_HTTPSConnection = HTTPSConnection
 
+# Longest time the thread reading for the others waits for a frame at once.
+_READ_INTERVAL = 0.1
+
 T = typing.TypeVar("T")
 
 log = logging.getLogger(__name__)
@@ -82,13 +90,62 @@ class _LockedObject(typing.Generic[T]):
         self.lock.release()
 
 
+class _StreamState:
+    """What has been received on one stream, filled in by the reading thread."""
+
+    __slots__ = ("status", "headers", "data", "ended", "error")
+
+    def __init__(self) -> None:
+        self.status: int | None = None
+        self.headers = HTTPHeaderDict()
+        self.data = bytearray()
+        self.ended = False
+        self.error: Exception | None = None
+
+
 class HTTP2Connection(HTTPSConnection):
+    """
+    An HTTP/2 connection that can carry many requests at once, each on its
+    own stream, from any number of threads.
+
+    :meth:`open_stream` reserves one of the connection's streams and returns
+    an :class:`HTTP2Stream` to make a request with. Connection pools do this
+    for you: they hand out streams of their connections instead of whole
+    connections, up to the number of concurrent streams each connection
+    allows. The methods of :class:`http.client.HTTPConnection`
+    (``request()``, ``getresponse()``...) are available too, and use one
+    stream at a time.
+
+    There is no dedicated reading thread: the threads waiting for a response
+    (or for flow control to let them send) take turns reading from the
+    socket and hand the frames they receive over to the streams they belong
+    to. All writes and reads of the socket, and uses of the h2 state
+    machine, hold the lock of ``_h2_conn``.
+    """
+
+    #: The most streams opened at once on one connection, if the server
+    #: allows that many (``SETTINGS_MAX_CONCURRENT_STREAMS``).
+    max_concurrent_streams: typing.ClassVar[int] = 100
+
     def __init__(
         self, host: str, port: int | None = None, **kwargs: typing.Any
     ) -> None:
         self._h2_conn = self._new_h2_conn()
-        self._h2_stream: int | None = None
-        self._headers: list[tuple[bytes, bytes]] = []
+        self._stream: HTTP2Stream | None = None
+
+        # Guards everything below. Waiting threads are notified whenever
+        # frames were read or a stream was released, which also bumps
+        # _generation: a thread waiting for a flow control window or for a
+        # stream to close waits for it to change.
+        self._state = threading.Condition()
+        self._streams: dict[int, _StreamState] = {}
+        self._num_streams = 0
+        self._remote_max_streams: int | None = None
+        self._reading = False
+        self._generation = 0
+        self._goaway = False
+        self._error: Exception | None = None
+        self._connect_lock = threading.Lock()
 
         if "proxy" in kwargs or "proxy_config" in kwargs:  # Defensive:
             raise NotImplementedError("Proxies aren't supported with HTTP/2")
@@ -103,11 +160,303 @@ class HTTP2Connection(HTTPSConnection):
         return _LockedObject(h2.connection.H2Connection(config=config))
 
     def connect(self) -> None:
-        super().connect()
+        # Streams may be started from other threads as soon as the socket is
+        # there, but not before the connection preface is sent.
         with self._h2_conn as conn:
+            super().connect()
             conn.initiate_connection()
-            if data_to_send := conn.data_to_send():
-                self.sock.sendall(data_to_send)
+            self._sendall(conn.data_to_send(), self.timeout)
+        # The server's preface is its SETTINGS frame, which tells how many
+        # streams can be opened. It is usually there already.
+        self._wait(lambda: self._remote_max_streams is not None, self.timeout)
+
+    @property
+    def can_open_streams(self) -> bool:
+        """
+        Whether new streams can be opened: the connection neither failed nor
+        was told to go away by the server. A connection that is not connected
+        yet connects for its first stream.
+        """
+        return self._error is None and not self._goaway
+
+    @property
+    def active_streams(self) -> int:
+        """The number of streams reserved by :meth:`open_stream` and in use."""
+        return self._num_streams
+
+    @property
+    def available_streams(self) -> int:
+        """The number of streams :meth:`open_stream` can open right now."""
+        with self._state:
+            if not self.can_open_streams:
+                return 0
+            limit = self.max_concurrent_streams
+            if self._remote_max_streams is not None:
+                limit = min(limit, self._remote_max_streams)
+            return max(limit - self._num_streams, 0)
+
+    @property
+    def is_connected(self) -> bool:
+        if self.sock is None:
+            return False
+        # Take in what the server sent meanwhile, like a GOAWAY.
+        self._poll()
+        return self.can_open_streams
+
+    def open_stream(
+        self, on_release: typing.Callable[[HTTP2Stream], None] | None = None
+    ) -> HTTP2Stream:
+        """
+        Reserves a stream for one request, which is released by
+        :meth:`HTTP2Stream.release` (``on_release`` being called then), or
+        once its response has been received. This does not check
+        :attr:`available_streams`, nor connect the connection.
+        """
+        with self._state:
+            self._num_streams += 1
+        return HTTP2Stream(self, on_release)
+
+    def _release_stream(self, stream_id: int | None) -> None:
+        with self._state:
+            self._num_streams -= 1
+            if stream_id is not None:
+                self._streams.pop(stream_id, None)
+            self._generation += 1
+            self._state.notify_all()
+
+    def _raise_if_failed(self) -> None:
+        if self._error is not None:
+            raise ProtocolError("HTTP/2 connection failed", self._error)
+
+    def _raise_if_going_away(self) -> None:
+        self._raise_if_failed()
+        if self._goaway:
+            raise ProtocolError("The server is closing the connection (GOAWAY)")
+
+    def _fail(self, error: Exception) -> None:
+        """Fails the connection: every stream waiting on it raises ``error``."""
+        with self._state:
+            if self._error is None:
+                self._error = error
+            self._state.notify_all()
+
+    def _sendall(self, data: bytes, timeout: float | None) -> None:
+        # Called with the lock of _h2_conn held.
+        if not data:
+            return
+        if self.sock is None:
+            raise ProtocolError("Connection closed")
+        try:
+            self.sock.settimeout(timeout)
+            self.sock.sendall(data)
+        except OSError as e:
+            self._fail(e)
+            raise
+
+    def _start_stream(
+        self,
+        headers: list[tuple[bytes, bytes]],
+        end_stream: bool,
+        timeout: float | None,
+    ) -> int:
+        """
+        Opens a stream by sending its headers, once the server allows one
+        more stream: it may allow fewer than the streams reserved, when it
+        lowers SETTINGS_MAX_CONCURRENT_STREAMS for instance.
+        """
+        while True:
+            self._raise_if_going_away()
+            generation = self._generation
+            with self._h2_conn as conn:
+                limit = self._remote_max_streams
+                if limit is not None and conn.open_outbound_streams < limit:
+                    # Stream IDs must be used in increasing order, so the ID
+                    # is only taken once the headers can be sent right away.
+                    stream_id: int = conn.get_next_available_stream_id()
+                    with self._state:
+                        self._streams[stream_id] = _StreamState()
+                    conn.send_headers(
+                        stream_id=stream_id, headers=headers, end_stream=end_stream
+                    )
+                    self._sendall(conn.data_to_send(), timeout)
+                    return stream_id
+            self._wait(lambda: self._generation != generation, timeout)
+
+    def _send_data(
+        self, stream_id: int, data: bytes, end_stream: bool, timeout: float | None
+    ) -> None:
+        """
+        Sends ``data`` on the stream as fast as the flow control windows of
+        the stream and the connection allow, waiting for the server to open
+        them when they are full.
+        """
+        state = self._streams[stream_id]
+        view = memoryview(data)
+        while True:
+            self._raise_if_failed()
+            if state.error is not None:
+                raise state.error
+            generation = self._generation
+            with self._h2_conn as conn:
+                size = min(
+                    conn.local_flow_control_window(stream_id),
+                    conn.max_outbound_frame_size,
+                    len(view),
+                )
+                if size > 0 or not view:
+                    chunk, view = view[:size], view[size:]
+                    conn.send_data(
+                        stream_id, chunk.tobytes(), end_stream=end_stream and not view
+                    )
+                    self._sendall(conn.data_to_send(), timeout)
+                    if not view:
+                        return
+                    continue
+            self._wait(
+                lambda: self._generation != generation or state.error is not None,
+                timeout,
+            )
+
+    def _end_stream(self, stream_id: int, timeout: float | None) -> None:
+        with self._h2_conn as conn:
+            conn.end_stream(stream_id)
+            self._sendall(conn.data_to_send(), timeout)
+
+    def _reset_stream(self, stream_id: int) -> None:
+        with self._h2_conn as conn:
+            try:
+                conn.reset_stream(stream_id, h2.errors.ErrorCodes.CANCEL)
+                self._sendall(conn.data_to_send(), self.timeout)
+            except Exception:
+                pass
+
+    def _wait_for_response(self, stream_id: int, timeout: float | None) -> _StreamState:
+        state = self._streams[stream_id]
+        self._wait(lambda: state.ended or state.error is not None, timeout)
+        if state.error is not None:
+            raise state.error
+        return state
+
+    def _wait(self, ready: typing.Callable[[], bool], timeout: float | None) -> None:
+        """
+        Waits until ``ready()``. One of the waiting threads reads from the
+        socket meanwhile, the others wait to be notified of what it read.
+
+        The reading thread checks ``ready()`` again at least every
+        ``_READ_INTERVAL`` seconds, for what happens without a frame being
+        read (another thread resetting its stream, for instance).
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._state:
+                while True:
+                    if ready():
+                        return
+                    self._raise_if_failed()
+                    remaining = None
+                    if deadline is not None:
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            raise SocketTimeout("timed out")
+                    if not self._reading:
+                        self._reading = True
+                        break
+                    self._state.wait(remaining)
+            try:
+                self._read_frames(
+                    _READ_INTERVAL
+                    if remaining is None
+                    else min(remaining, _READ_INTERVAL)
+                )
+            finally:
+                with self._state:
+                    self._reading = False
+                    self._state.notify_all()
+
+    def _poll(self) -> None:
+        """Reads what has been received already, if no thread is reading."""
+        with self._state:
+            if self._reading or self._error is not None:
+                return
+            self._reading = True
+        try:
+            self._read_frames(0.0)
+        finally:
+            with self._state:
+                self._reading = False
+                self._state.notify_all()
+
+    def _read_frames(self, wait: float) -> None:
+        """
+        Reads the frames received within ``wait`` seconds, and hands them over
+        to their streams.
+        """
+        sock = self.sock
+        if sock is None:
+            self._fail(ProtocolError("Connection closed"))
+            return
+        pending = getattr(sock, "pending", None)
+        if not (pending and pending()) and not wait_for_read(sock, wait):
+            return
+
+        timeout = self.timeout
+        with self._h2_conn as conn:
+            try:
+                sock.settimeout(timeout)
+                data = sock.recv(65535)
+            except OSError as e:
+                self._fail(e)
+                return
+            if not data:
+                self._fail(ProtocolError("Connection closed by the server"))
+                return
+            try:
+                events = conn.receive_data(data)
+                for event in events:
+                    if isinstance(event, h2.events.DataReceived):
+                        conn.acknowledge_received_data(
+                            event.flow_controlled_length, event.stream_id
+                        )
+                self._sendall(conn.data_to_send(), timeout)
+            except h2.exceptions.ProtocolError as e:
+                self._fail(ProtocolError("HTTP/2 protocol error", e))
+                return
+            except OSError:
+                return
+            remote_max_streams = conn.remote_settings.max_concurrent_streams
+
+        with self._state:
+            for event in events:
+                state = self._streams.get(getattr(event, "stream_id", None))  # type: ignore[arg-type]
+                if isinstance(event, h2.events.ResponseReceived) and state:
+                    for header, value in event.headers:
+                        if header == b":status":
+                            state.status = int(value.decode())
+                        else:
+                            state.headers.add(
+                                header.decode("ascii"), value.decode("ascii")
+                            )
+                elif isinstance(event, h2.events.DataReceived) and state:
+                    state.data += event.data
+                elif isinstance(event, h2.events.StreamEnded) and state:
+                    state.ended = True
+                elif isinstance(event, h2.events.StreamReset) and state:
+                    state.error = ProtocolError(
+                        f"Stream {event.stream_id} was reset by the server "
+                        f"(error code {event.error_code!r})"
+                    )
+                elif isinstance(event, h2.events.RemoteSettingsChanged):
+                    self._remote_max_streams = remote_max_streams
+                elif isinstance(event, h2.events.ConnectionTerminated):
+                    self._goaway = True
+                    # Streams the server did not process can be retried.
+                    for stream_id, state in self._streams.items():
+                        if stream_id > (event.last_stream_id or 0) and not state.ended:
+                            state.error = ProtocolError(
+                                "The server is closing the connection (GOAWAY)"
+                            )
+            self._generation += 1
+            self._state.notify_all()
 
     def putrequest(  # type: ignore[override]
         self,
@@ -119,98 +468,29 @@ class HTTP2Connection(HTTPSConnection):
         This deviates from the HTTPConnection method signature since we never need to override
         sending accept-encoding headers or the host header.
         """
-        if "skip_host" in kwargs:
-            raise NotImplementedError("`skip_host` isn't supported")
-        if "skip_accept_encoding" in kwargs:
-            raise NotImplementedError("`skip_accept_encoding` isn't supported")
-
-        self._request_url = url or "/"
-        self._validate_path(url)  # type: ignore[attr-defined]
-
-        if ":" in self.host:
-            authority = f"[{self.host}]:{self.port or 443}"
-        else:
-            authority = f"{self.host}:{self.port or 443}"
-
-        self._headers.append((b":scheme", b"https"))
-        self._headers.append((b":method", method.encode()))
-        self._headers.append((b":authority", authority.encode()))
-        self._headers.append((b":path", url.encode()))
-
-        with self._h2_conn as conn:
-            self._h2_stream = conn.get_next_available_stream_id()
+        self._stream = self.open_stream()
+        self._stream.putrequest(method, url, **kwargs)
 
     def putheader(self, header: str | bytes, *values: str | bytes) -> None:  # type: ignore[override]
-        # TODO SKIPPABLE_HEADERS from urllib3 are ignored.
-        header = header.encode() if isinstance(header, str) else header
-        header = header.lower()  # A lot of upstream code uses capitalized headers.
-        if not _is_legal_header_name(header):
-            raise ValueError(f"Illegal header name {str(header)}")
-
-        for value in values:
-            value = value.encode() if isinstance(value, str) else value
-            if _is_illegal_header_value(value):
-                raise ValueError(f"Illegal header value {str(value)}")
-            self._headers.append((header, value))
+        if self._stream is None:
+            raise ConnectionError("Must call `putrequest` first.")
+        self._stream.putheader(header, *values)
 
     def endheaders(self, message_body: typing.Any = None) -> None:  # type: ignore[override]
-        if self._h2_stream is None:
+        if self._stream is None:
             raise ConnectionError("Must call `putrequest` first.")
-
-        with self._h2_conn as conn:
-            conn.send_headers(
-                stream_id=self._h2_stream,
-                headers=self._headers,
-                end_stream=(message_body is None),
-            )
-            if data_to_send := conn.data_to_send():
-                self.sock.sendall(data_to_send)
-        self._headers = []  # Reset headers for the next request.
+        self._stream.timeout = self.timeout
+        self._stream.endheaders(message_body)
 
     def send(self, data: typing.Any) -> None:
         """Send data to the server.
         `data` can be: `str`, `bytes`, an iterable, or file-like objects
         that support a .read() method.
         """
-        if self._h2_stream is None:
+        if self._stream is None:
             raise ConnectionError("Must call `putrequest` first.")
-
-        with self._h2_conn as conn:
-            if data_to_send := conn.data_to_send():
-                self.sock.sendall(data_to_send)
-
-            if hasattr(data, "read"):  # file-like objects
-                while True:
-                    chunk = data.read(self.blocksize)
-                    if not chunk:
-                        break
-                    if isinstance(chunk, str):
-                        chunk = chunk.encode()  # pragma: no cover
-                    conn.send_data(self._h2_stream, chunk, end_stream=False)
-                    if data_to_send := conn.data_to_send():
-                        self.sock.sendall(data_to_send)
-                conn.end_stream(self._h2_stream)
-                return
-
-            if isinstance(data, str):  # str -> bytes
-                data = data.encode()
-
-            try:
-                if isinstance(data, bytes):
-                    conn.send_data(self._h2_stream, data, end_stream=True)
-                    if data_to_send := conn.data_to_send():
-                        self.sock.sendall(data_to_send)
-                else:
-                    for chunk in data:
-                        conn.send_data(self._h2_stream, chunk, end_stream=False)
-                        if data_to_send := conn.data_to_send():
-                            self.sock.sendall(data_to_send)
-                    conn.end_stream(self._h2_stream)
-            except TypeError:
-                raise TypeError(
-                    "`data` should be str, bytes, iterable, or file. got %r"
-                    % type(data)
-                )
+        self._stream.timeout = self.timeout
+        self._stream.send(data)
 
     def set_tunnel(
         self,
@@ -226,46 +506,174 @@ class HTTP2Connection(HTTPSConnection):
     def getresponse(  # type: ignore[override]
         self,
     ) -> HTTP2Response:
-        status = None
-        data = bytearray()
+        if self._stream is None:
+            raise ConnectionError("Must call `putrequest` first.")
+        stream, self._stream = self._stream, None
+        stream.timeout = self.timeout
+        return stream.getresponse()
+
+    def request(  # type: ignore[override]
+        self,
+        method: str,
+        url: str,
+        body: _TYPE_BODY | None = None,
+        headers: typing.Mapping[str, str] | None = None,
+        *,
+        preload_content: bool = True,
+        decode_content: bool = True,
+        enforce_content_length: bool = True,
+        **kwargs: typing.Any,
+    ) -> None:
+        """Send an HTTP/2 request"""
+        self._stream = self.open_stream()
+        self._stream.timeout = self.timeout
+        self._stream.request(method, url, body, headers, **kwargs)
+
+    def close(self) -> None:
         with self._h2_conn as conn:
-            end_stream = False
-            while not end_stream:
-                # TODO: Arbitrary read value.
-                if received_data := self.sock.recv(65535):
-                    events = conn.receive_data(received_data)
-                    for event in events:
-                        if isinstance(event, h2.events.ResponseReceived):
-                            headers = HTTPHeaderDict()
-                            for header, value in event.headers:
-                                if header == b":status":
-                                    status = int(value.decode())
-                                else:
-                                    headers.add(
-                                        header.decode("ascii"), value.decode("ascii")
-                                    )
-
-                        elif isinstance(event, h2.events.DataReceived):
-                            data += event.data
-                            conn.acknowledge_received_data(
-                                event.flow_controlled_length, event.stream_id
-                            )
+            try:
+                conn.close_connection()
+                if data := conn.data_to_send():
+                    self.sock.sendall(data)
+            except Exception:
+                pass
 
-                        elif isinstance(event, h2.events.StreamEnded):
-                            end_stream = True
+        # Fail what is still waiting, and reset all our HTTP/2 connection state.
+        with self._state:
+            for state in self._streams.values():
+                if not state.ended and state.error is None:
+                    state.error = ProtocolError("Connection closed")
+            self._streams = {}
+            self._remote_max_streams = None
+            self._generation += 1
+            self._goaway = False
+            self._error = None
+            self._state.notify_all()
+        self._h2_conn = self._new_h2_conn()
+        self._stream = None
 
-                if data_to_send := conn.data_to_send():
-                    self.sock.sendall(data_to_send)
+        super().close()
 
-        assert status is not None
-        return HTTP2Response(
-            status=status,
-            headers=headers,
-            request_url=self._request_url,
-            data=bytes(data),
+
+class HTTP2Stream:
+    """
+    One request and its response on a stream of an :class:`HTTP2Connection`,
+    as returned by :meth:`HTTP2Connection.open_stream`.
+
+    It has the methods of a connection a pool uses for a request, so that
+    pools hand these out in place of connections. Attributes it does not
+    have itself (``sock``, ``is_verified``...) are the connection's.
+    """
+
+    def __init__(
+        self,
+        connection: HTTP2Connection,
+        on_release: typing.Callable[[HTTP2Stream], None] | None = None,
+    ) -> None:
+        self.connection = connection
+        self.timeout = connection.timeout
+        self._on_release = on_release
+        self._stream_id: int | None = None
+        self._headers: list[tuple[bytes, bytes]] = []
+        self._request_url = "/"
+        self._finished = False
+        self._released = False
+
+    def __getattr__(self, name: str) -> typing.Any:
+        return getattr(self.connection, name)
+
+    def __repr__(self) -> str:
+        return f"<HTTP2Stream {self._stream_id} of {self.connection!r}>"
+
+    @property
+    def is_closed(self) -> bool:
+        return self.connection.is_closed
+
+    def connect(self) -> None:
+        with self.connection._connect_lock:
+            if self.connection.is_closed:
+                self.connection.timeout = self.timeout
+                self.connection.connect()
+
+    def putrequest(self, method: str, url: str, **kwargs: typing.Any) -> None:
+        if "skip_host" in kwargs:
+            raise NotImplementedError("`skip_host` isn't supported")
+        if "skip_accept_encoding" in kwargs:
+            raise NotImplementedError("`skip_accept_encoding` isn't supported")
+
+        self._request_url = url or "/"
+        self.connection._validate_path(url)  # type: ignore[attr-defined]
+
+        host, port = self.connection.host, self.connection.port
+        if ":" in host:
+            authority = f"[{host}]:{port or 443}"
+        else:
+            authority = f"{host}:{port or 443}"
+
+        self._headers = [
+            (b":scheme", b"https"),
+            (b":method", method.encode()),
+            (b":authority", authority.encode()),
+            (b":path", url.encode()),
+        ]
+
+    def putheader(self, header: str | bytes, *values: str | bytes) -> None:
+        # TODO SKIPPABLE_HEADERS from urllib3 are ignored.
+        header = header.encode() if isinstance(header, str) else header
+        header = header.lower()  # A lot of upstream code uses capitalized headers.
+        if not _is_legal_header_name(header):
+            raise ValueError(f"Illegal header name {str(header)}")
+
+        for value in values:
+            value = value.encode() if isinstance(value, str) else value
+            if _is_illegal_header_value(value):
+                raise ValueError(f"Illegal header value {str(value)}")
+            self._headers.append((header, value))
+
+    def endheaders(self, message_body: typing.Any = None) -> None:
+        if not self._headers:
+            raise ConnectionError("Must call `putrequest` first.")
+        self._stream_id = self.connection._start_stream(
+            self._headers, end_stream=message_body is None, timeout=self.timeout
         )
+        self._headers = []
 
-    def request(  # type: ignore[override]
+    def send(self, data: typing.Any) -> None:
+        """Send data to the server.
+        `data` can be: `str`, `bytes`, an iterable, or file-like objects
+        that support a .read() method.
+        """
+        if self._stream_id is None:
+            raise ConnectionError("Must call `putrequest` first.")
+        conn, stream_id = self.connection, self._stream_id
+
+        if hasattr(data, "read"):  # file-like objects
+            while True:
+                chunk = data.read(self.connection.blocksize)
+                if not chunk:
+                    break
+                if isinstance(chunk, str):
+                    chunk = chunk.encode()  # pragma: no cover
+                conn._send_data(stream_id, chunk, False, self.timeout)
+            conn._end_stream(stream_id, self.timeout)
+            return
+
+        if isinstance(data, str):  # str -> bytes
+            data = data.encode()
+
+        try:
+            if isinstance(data, bytes):
+                conn._send_data(stream_id, data, True, self.timeout)
+            else:
+                for chunk in data:
+                    conn._send_data(stream_id, chunk, False, self.timeout)
+                conn._end_stream(stream_id, self.timeout)
+        except TypeError:
+            raise TypeError(
+                "`data` should be str, bytes, iterable, or file. got %r" % type(data)
+            )
+
+    def request(
         self,
         method: str,
         url: str,
@@ -283,9 +691,6 @@ class HTTP2Connection(HTTPSConnection):
             # raise NotImplementedError("`chunked` isn't supported with HTTP/2")
             pass
 
-        if self.sock is not None:
-            self.sock.settimeout(self.timeout)
-
         self.putrequest(method, url)
 
         headers = headers or {}
@@ -295,7 +700,7 @@ class HTTP2Connection(HTTPSConnection):
             else:
                 self.putheader(k, v)
 
-        if b"user-agent" not in dict(self._headers):
+        if not any(name == b"user-agent" for name, _ in self._headers):
             self.putheader(b"user-agent", _get_default_user_agent())
 
         if body:
@@ -304,21 +709,45 @@ class HTTP2Connection(HTTPSConnection):
         else:
             self.endheaders()
 
-    def close(self) -> None:
-        with self._h2_conn as conn:
-            try:
-                conn.close_connection()
-                if data := conn.data_to_send():
-                    self.sock.sendall(data)
-            except Exception:
-                pass
+    def getresponse(self) -> HTTP2Response:
+        if self._stream_id is None:
+            raise ConnectionError("Must call `putrequest` first.")
+        try:
+            state = self.connection._wait_for_response(self._stream_id, self.timeout)
+        except BaseException:
+            # Reset, refused by a GOAWAY or timed out: the stream is of no
+            # more use, and must not keep its slot on the connection.
+            self.release()
+            raise
+        self._finished = True
+        # The whole response is in memory: the stream can serve another
+        # request already.
+        self.release()
+
+        assert state.status is not None
+        return HTTP2Response(
+            status=state.status,
+            headers=state.headers,
+            request_url=self._request_url,
+            data=bytes(state.data),
+        )
 
-        # Reset all our HTTP/2 connection state.
-        self._h2_conn = self._new_h2_conn()
-        self._h2_stream = None
-        self._headers = []
+    def release(self) -> None:
+        """
+        Gives the stream back to the connection, resetting it if its response
+        has not been received.
+        """
+        if self._released:
+            return
+        self._released = True
+        if self._stream_id is not None and not self._finished:
+            self.connection._reset_stream(self._stream_id)
+        self.connection._release_stream(self._stream_id)
+        if self._on_release is not None:
+            self._on_release(self)
 
-        super().close()
+    def close(self) -> None:
+        self.release()
 
 
 class HTTP2Response(BaseHTTPResponse):
@@ -344,6 +773,8 @@ class HTTP2Response(BaseHTTPResponse):
         )
         self._data = data
         self.length_remaining = 0
+        self._pool: typing.Any = None
+        self._connection: HTTP2Stream | None = None
 
     @property
     def data(self) -> bytes:
@@ -352,5 +783,15 @@ class HTTP2Response(BaseHTTPResponse):
     def get_redirect_location(self) -> None:
         return None
 
+    def release_conn(self) -> None:
+        # The stream was released once the response was received, this only
+        # lets the pool know.
+        if self._pool is not None and self._connection is not None:
+            self._pool._put_conn(self._connection)
+        self._connection = None
+
+    def drain_conn(self) -> None:
+        self.release_conn()
+
     def close(self) -> None:
         pass
@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+import collections
+import math
+import sys
+import threading
+import typing
+
+__all__ = ["Instrument", "PercentileAggregator", "PHASES"]
+
+#: The timed phases of a request, in the order they happen.
+PHASES = ("pool_wait", "dns", "connect", "tls", "send", "ttfb", "body")
+
+
+class Instrument:
+    """
+    Receives the timings and counters of the pools (and their connections and
+    responses) it is passed to as ``instrument``, e.g.
+    ``PoolManager(instrument=PercentileAggregator())``. Pools without one do
+    not measure anything.
+
+    ``host`` identifies the pool, as ``scheme://host:port``. The phases are:
+
+    - ``pool_wait``: getting a connection out of the pool, which only blocks
+      with ``block=True``.
+    - ``dns``: resolving the host name of a new connection.
+    - ``connect``: opening the TCP connection, over every address tried.
+    - ``tls``: the TLS handshake.
+    - ``send``: sending the request line, headers and body.
+    - ``ttfb``: waiting for and parsing the status line and headers.
+    - ``body``: from the headers until the body has been read entirely, which
+      includes the time a streaming caller spends between reads.
+
+    The counters are ``connections_created``, ``connections_reused`` (at
+    checkout), ``connections_discarded`` (released to a full pool),
+    ``tls_handshakes.full`` and ``tls_handshakes.resumed``, and
+    ``retries.<kind>``, ``kind`` being one of ``connect``, ``read``,
+    ``other``, ``redirect`` and ``status``.
+
+    The methods are called from the threads making the requests and must be
+    thread-safe. This base class ignores everything.
+    """
+
+    def timing(self, host: str, phase: str, seconds: float) -> None:
+        pass
+
+    def count(self, host: str, counter: str, n: int = 1) -> None:
+        pass
+
+
+class PercentileAggregator(Instrument):
+    """
+    Keeps the last ``max_samples`` timings of every host and phase along with
+    the counters, and reports percentiles per host.
+
+    .. code-block:: python
+
+        import urllib3
+        from urllib3.instrumentation import PercentileAggregator
+
+        stats = PercentileAggregator()
+        http = urllib3.PoolManager(instrument=stats)
+        http.request("GET", "https://example.com/")
+        stats.print_report()
+    """
+
+    def __init__(
+        self,
+        percentiles: typing.Sequence[float] = (50, 90, 99),
+        max_samples: int = 10000,
+    ) -> None:
+        self.percentiles = tuple(percentiles)
+        self.max_samples = max_samples
+        self._lock = threading.Lock()
+        self._samples: dict[tuple[str, str], collections.deque[float]] = {}
+        self._counters: dict[str, collections.Counter[str]] = {}
+
+    def timing(self, host: str, phase: str, seconds: float) -> None:
+        with self._lock:
+            samples = self._samples.get((host, phase))
+            if samples is None:
+                samples = self._samples[(host, phase)] = collections.deque(
+                    maxlen=self.max_samples
+                )
+            samples.append(seconds)
+
+    def count(self, host: str, counter: str, n: int = 1) -> None:
+        with self._lock:
+            counters = self._counters.get(host)
+            if counters is None:
+                counters = self._counters[host] = collections.Counter()
+            counters[counter] += n
+
+    def hosts(self) -> list[str]:
+        with self._lock:
+            return sorted({host for host, _ in self._samples} | set(self._counters))
+
+    def samples(self, host: str, phase: str) -> list[float]:
+        with self._lock:
+            return list(self._samples.get((host, phase), ()))
+
+    def counters(self, host: str) -> dict[str, int]:
+        with self._lock:
+            return dict(self._counters.get(host, {}))
+
+    def percentile(self, host: str, phase: str, percentile: float) -> float | None:
+        """
+        The ``percentile`` (0-100, nearest rank) of the timings kept for the
+        host and phase, in seconds, or None without any.
+        """
+        samples = sorted(self.samples(host, phase))
+        if not samples:
+            return None
+        rank = max(math.ceil(percentile / 100 * len(samples)), 1)
+        return samples[rank - 1]
+
+    def report(self) -> str:
+        """
+        A table of the timing percentiles (in milliseconds) and the counters
+        of every host.
+        """
+        header = f"{'phase':<10}{'count':>8}" + "".join(
+            f"{'p' + format(p, 'g'):>10}" for p in self.percentiles
+        )
+        lines = []
+        for host in self.hosts():
+            lines.append(host)
+            lines.append("  " + header)
+            for phase in PHASES:
+                samples = sorted(self.samples(host, phase))
+                if not samples:
+                    continue
+                values = "".join(
+                    f"{samples[max(math.ceil(p / 100 * len(samples)), 1) - 1] * 1000:>10.2f}"
+                    for p in self.percentiles
+                )
+                lines.append(f"  {phase:<10}{len(samples):>8}{values}")
+            counters = self.counters(host)
+            if counters:
+                lines.append(
+                    "  "
+                    + ", ".join(f"{name}={n}" for name, n in sorted(counters.items()))
+                )
+        return "\n".join(lines)
+
+    def print_report(self, file: typing.TextIO | None = None) -> None:
+        print(self.report(), file=file if file is not None else sys.stdout)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._samples.clear()
+            self._counters.clear()
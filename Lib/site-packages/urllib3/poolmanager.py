@@ -29,6 +29,9 @@ if typing.TYPE_CHECKING:
 
     from typing_extensions import Self
 
+    from .instrumentation import Instrument
+    from .util.resolver import Resolver
+
 __all__ = ["PoolManager", "ProxyManager", "proxy_from_url"]
 
 
@@ -90,6 +93,11 @@ class PoolKey(typing.NamedTuple):
     key_assert_fingerprint: str | None
     key_server_hostname: str | None
     key_blocksize: int | None
+    key_keepalive_timeout: float | None
+    key_max_requests_per_conn: int | None
+    key_maintenance_interval: float | None
+    key_instrument: Instrument | None
+    key_resolver: Resolver | None
 
 
 def _default_key_normalizer(
@@ -176,6 +184,15 @@ class PoolManager(RequestMethods):
         Additional parameters are used to create fresh
         :class:`urllib3.connectionpool.ConnectionPool` instances.
 
+    Passing a ``resolver`` shares it between all the pools, e.g. to resolve
+    each host once a minute instead of for every new connection:
+
+    .. code-block:: python
+
+        from urllib3.util.resolver import CachingResolver
+
+        http = urllib3.PoolManager(resolver=CachingResolver(ttl=60))
+
     Example:
 
     .. code-block:: python
@@ -387,6 +404,16 @@ class PoolManager(RequestMethods):
             u.host, port=u.port, scheme=u.scheme, pool_kwargs=pool_kwargs
         )
 
+    def prewarm(self, url: str, n: int | None = None) -> int:
+        """
+        Open up to ``n`` connections to the host of ``url`` ahead of the
+        first requests. See :meth:`.HTTPConnectionPool.prewarm`.
+
+        :returns:
+            The number of connections added to the pool.
+        """
+        return self.connection_from_url(url).prewarm(n)
+
     def _merge_pool_kwargs(
         self, override: dict[str, typing.Any] | None
     ) -> dict[str, typing.Any]:
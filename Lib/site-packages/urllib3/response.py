@@ -7,9 +7,11 @@ import logging
 import re
 import socket
 import sys
+import time
 import typing
 import warnings
 import zlib
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import contextmanager
 from http.client import HTTPMessage as _HttplibHTTPMessage
 from http.client import HTTPResponse as _HttplibHTTPResponse
@@ -52,9 +54,23 @@ log = logging.getLogger(__name__)
 
 
 class ContentDecoder:
-    def decompress(self, data: bytes) -> bytes:
+    def decompress(self, data: bytes, max_length: int = -1) -> bytes:
+        """
+        Decodes ``data`` after whatever input was left over by the previous
+        call. Returns at most ``max_length`` bytes unless it is negative, any
+        input left over being kept for the next call, see
+        :attr:`has_unconsumed_tail`.
+        """
         raise NotImplementedError()
 
+    @property
+    def has_unconsumed_tail(self) -> bool:
+        """
+        Whether input held back because of ``max_length`` is waiting to be
+        decoded, in which case ``decompress(b"")`` yields more output.
+        """
+        return False
+
     def flush(self) -> bytes:
         raise NotImplementedError()
 
@@ -63,18 +79,26 @@ class DeflateDecoder(ContentDecoder):
     def __init__(self) -> None:
         self._first_try = True
         self._data = b""
+        self._unconsumed_tail = b""
         self._obj = zlib.decompressobj()
 
-    def decompress(self, data: bytes) -> bytes:
+    @property
+    def has_unconsumed_tail(self) -> bool:
+        return bool(self._unconsumed_tail)
+
+    def decompress(self, data: bytes, max_length: int = -1) -> bytes:
+        if self._unconsumed_tail:
+            data = self._unconsumed_tail + data
+            self._unconsumed_tail = b""
         if not data:
-            return data
+            return b""
 
         if not self._first_try:
-            return self._obj.decompress(data)
+            return self._decompress(data, max_length)
 
         self._data += data
         try:
-            decompressed = self._obj.decompress(data)
+            decompressed = self._decompress(data, max_length)
             if decompressed:
                 self._first_try = False
                 self._data = None  # type: ignore[assignment]
@@ -83,10 +107,18 @@ class DeflateDecoder(ContentDecoder):
             self._first_try = False
             self._obj = zlib.decompressobj(-zlib.MAX_WBITS)
             try:
-                return self.decompress(self._data)
+                return self.decompress(self._data, max_length)
             finally:
                 self._data = None  # type: ignore[assignment]
 
+    def _decompress(self, data: bytes, max_length: int) -> bytes:
+        # For zlib a max_length of 0 means no limit.
+        decompressed = self._obj.decompress(data, max(max_length, 0))
+        if not self._obj.eof:
+            # Data after the end of the stream is dropped, as before.
+            self._unconsumed_tail = self._obj.unconsumed_tail
+        return decompressed
+
     def flush(self) -> bytes:
         return self._obj.flush()
 
@@ -101,14 +133,25 @@ class GzipDecoder(ContentDecoder):
     def __init__(self) -> None:
         self._obj = zlib.decompressobj(16 + zlib.MAX_WBITS)
         self._state = GzipDecoderState.FIRST_MEMBER
+        self._unconsumed_tail = b""
 
-    def decompress(self, data: bytes) -> bytes:
+    @property
+    def has_unconsumed_tail(self) -> bool:
+        return bool(self._unconsumed_tail)
+
+    def decompress(self, data: bytes, max_length: int = -1) -> bytes:
+        if self._unconsumed_tail:
+            data = self._unconsumed_tail + data
+            self._unconsumed_tail = b""
         ret = bytearray()
         if self._state == GzipDecoderState.SWALLOW_DATA or not data:
             return bytes(ret)
         while True:
             try:
-                ret += self._obj.decompress(data)
+                # For zlib a max_length of 0 means no limit.
+                ret += self._obj.decompress(
+                    data, max_length - len(ret) if max_length > 0 else 0
+                )
             except zlib.error:
                 previous_state = self._state
                 # Ignore data after the first error
@@ -117,11 +160,20 @@ class GzipDecoder(ContentDecoder):
                     # Allow trailing garbage acceptable in other gzip clients
                     return bytes(ret)
                 raise
+            if not self._obj.eof:
+                self._unconsumed_tail = self._obj.unconsumed_tail
+                return bytes(ret)
+            # At the end of a member zlib may report what follows as both
+            # unused data and unconsumed tail.
             data = self._obj.unused_data
             if not data:
                 return bytes(ret)
             self._state = GzipDecoderState.OTHER_MEMBERS
             self._obj = zlib.decompressobj(16 + zlib.MAX_WBITS)
+            if 0 < max_length <= len(ret):
+                # Keep the next member for the next call.
+                self._unconsumed_tail = data
+                return bytes(ret)
 
     def flush(self) -> bytes:
         return self._obj.flush()
@@ -136,9 +188,21 @@ if brotli is not None:
         def __init__(self) -> None:
             self._obj = brotli.Decompressor()
             if hasattr(self._obj, "decompress"):
-                setattr(self, "decompress", self._obj.decompress)
+                self._decompress = self._obj.decompress
             else:
-                setattr(self, "decompress", self._obj.process)
+                self._decompress = self._obj.process
+
+        def decompress(self, data: bytes, max_length: int = -1) -> bytes:
+            # Only Brotli 1.2+ can bound its output, keeping the input it
+            # did not decode yet.
+            if max_length > 0 and hasattr(self._obj, "can_accept_more_data"):
+                return self._obj.process(data, output_buffer_limit=max_length)  # type: ignore[no-any-return]
+            return self._decompress(data)  # type: ignore[no-any-return]
+
+        @property
+        def has_unconsumed_tail(self) -> bool:
+            can_accept_more_data = getattr(self._obj, "can_accept_more_data", None)
+            return can_accept_more_data is not None and not can_accept_more_data()
 
         def flush(self) -> bytes:
             if hasattr(self._obj, "flush"):
@@ -155,15 +219,35 @@ try:
     class ZstdDecoder(ContentDecoder):
         def __init__(self) -> None:
             self._obj = zstd.ZstdDecompressor()
+            self._unused_data = b""
 
-        def decompress(self, data: bytes) -> bytes:
-            if not data:
+        @property
+        def has_unconsumed_tail(self) -> bool:
+            return bool(self._unused_data) or not (
+                self._obj.needs_input or self._obj.eof
+            )
+
+        def decompress(self, data: bytes, max_length: int = -1) -> bytes:
+            if self._unused_data:
+                data = self._unused_data + data
+                self._unused_data = b""
+            if not data and not self.has_unconsumed_tail:
                 return b""
-            data_parts = [self._obj.decompress(data)]
+            data_parts = [self._obj.decompress(data, max_length)]
+            length = len(data_parts[0])
             while self._obj.eof and self._obj.unused_data:
                 unused_data = self._obj.unused_data
                 self._obj = zstd.ZstdDecompressor()
-                data_parts.append(self._obj.decompress(unused_data))
+                if 0 <= max_length <= length:
+                    # Keep the next frame for the next call.
+                    self._unused_data = unused_data
+                    break
+                data_parts.append(
+                    self._obj.decompress(
+                        unused_data, max_length - length if max_length >= 0 else -1
+                    )
+                )
+                length += len(data_parts[-1])
             return b"".join(data_parts)
 
         def flush(self) -> bytes:
@@ -191,10 +275,12 @@ except ImportError:
         HAS_ZSTD = True
 
         class ZstdDecoder(ContentDecoder):  # type: ignore[no-redef]
+            # zstandard's decompression objects cannot bound their output,
+            # so max_length is not honoured.
             def __init__(self) -> None:
                 self._obj = zstd.ZstdDecompressor().decompressobj()
 
-            def decompress(self, data: bytes) -> bytes:
+            def decompress(self, data: bytes, max_length: int = -1) -> bytes:
                 if not data:
                     return b""
                 data_parts = [self._obj.decompress(data)]
@@ -218,18 +304,36 @@ class MultiDecoder(ContentDecoder):
         sender that applied the encodings MUST generate a Content-Encoding
         header field that lists the content codings in the order in which
         they were applied.
+
+    Only the last decoding step bounds its output to ``max_length``: the
+    output of the others is still encoded, so not the one that balloons.
     """
 
     def __init__(self, modes: str) -> None:
         self._decoders = [_get_decoder(m.strip()) for m in modes.split(",")]
+        # Input of the last decoding step, waiting for it to be able to
+        # take more.
+        self._pending = b""
+
+    @property
+    def has_unconsumed_tail(self) -> bool:
+        return bool(self._pending) or self._decoders[0].has_unconsumed_tail
 
     def flush(self) -> bytes:
         return self._decoders[0].flush()
 
-    def decompress(self, data: bytes) -> bytes:
-        for d in reversed(self._decoders):
+    def decompress(self, data: bytes, max_length: int = -1) -> bytes:
+        for d in reversed(self._decoders[1:]):
             data = d.decompress(data)
-        return data
+        last = self._decoders[0]
+        if self._pending:
+            data = self._pending + data
+            self._pending = b""
+        if last.has_unconsumed_tail and data:
+            # Brotli refuses input before its pending output is read.
+            self._pending = data
+            data = b""
+        return last.decompress(data, max_length)
 
 
 def _get_decoder(mode: str) -> ContentDecoder:
@@ -308,13 +412,32 @@ class BytesQueueBuffer:
 
         return ret.getvalue()
 
+    def get_into(self, b: memoryview) -> int:
+        """
+        Move up to ``len(b)`` bytes into ``b`` without building an
+        intermediate ``bytes`` object and return how many were moved.
+        """
+        n = len(b)
+        fetched = 0
+        while fetched < n and self.buffer:
+            chunk = self.buffer.popleft()
+            take = min(n - fetched, len(chunk))
+            b[fetched : fetched + take] = memoryview(chunk)[:take]
+            if take < len(chunk):
+                # A view, so that draining a large chunk piece by piece does
+                # not copy its tail over and over again.
+                self.buffer.appendleft(memoryview(chunk)[take:])  # type: ignore[arg-type]
+            fetched += take
+        self._size -= fetched
+        return fetched
+
     def get_all(self) -> bytes:
         buffer = self.buffer
         if not buffer:
             assert self._size == 0
             return b""
         if len(buffer) == 1:
-            result = buffer.pop()
+            result = bytes(buffer.pop())
         else:
             ret = io.BytesIO()
             ret.writelines(buffer.popleft() for _ in range(len(buffer)))
@@ -389,15 +512,19 @@ class BaseHTTPResponse(io.IOBase):
     def data(self) -> bytes:
         raise NotImplementedError()
 
-    def json(self) -> typing.Any:
+    def json(
+        self, loads: typing.Callable[[bytes], typing.Any] | None = None
+    ) -> typing.Any:
         """
         Deserializes the body of the HTTP response as a Python object.
 
         The body of the HTTP response must be encoded using UTF-8, as per
         `RFC 8529 Section 8.1 <https://www.rfc-editor.org/rfc/rfc8259#section-8.1>`_.
 
-        To use a custom JSON decoder pass the result of :attr:`HTTPResponse.data` to
-        your custom decoder instead.
+        :param loads:
+            A custom JSON decoder, such as ``orjson.loads``. It is passed
+            :attr:`HTTPResponse.data` as bytes, without decoding it to text
+            first, and its errors are raised as they are.
 
         If the body of the HTTP response is not decodable to UTF-8, a
         `UnicodeDecodeError` will be raised. If the body of the HTTP response is not a
@@ -407,6 +534,8 @@ class BaseHTTPResponse(io.IOBase):
 
         :returns: The body of the HTTP response as a Python object.
         """
+        if loads is not None:
+            return loads(self.data)
         data = self.data.decode("utf-8")
         return _json.loads(data)
 
@@ -492,10 +621,19 @@ class BaseHTTPResponse(io.IOBase):
                     self._decoder = _get_decoder(content_encoding)
 
     def _decode(
-        self, data: bytes, decode_content: bool | None, flush_decoder: bool
+        self,
+        data: bytes,
+        decode_content: bool | None,
+        flush_decoder: bool,
+        max_length: int = -1,
     ) -> bytes:
         """
         Decode the data passed in and potentially flush the decoder.
+
+        With a non-negative ``max_length``, at most that many bytes are
+        decoded (plus what flushing yields), the rest of the input staying
+        in the decoder: see :meth:`_decoder_has_unconsumed_tail`. The decoder
+        is only flushed once it holds nothing back.
         """
         if not decode_content:
             if self._has_decoded_content:
@@ -507,7 +645,7 @@ class BaseHTTPResponse(io.IOBase):
 
         try:
             if self._decoder:
-                data = self._decoder.decompress(data)
+                data = self._decoder.decompress(data, max_length)
                 self._has_decoded_content = True
         except self.DECODER_ERROR_CLASSES as e:
             content_encoding = self.headers.get("content-encoding", "").lower()
@@ -516,11 +654,14 @@ class BaseHTTPResponse(io.IOBase):
                 "failed to decode it." % content_encoding,
                 e,
             ) from e
-        if flush_decoder:
+        if flush_decoder and not self._decoder_has_unconsumed_tail():
             data += self._flush_decoder()
 
         return data
 
+    def _decoder_has_unconsumed_tail(self) -> bool:
+        return self._decoder is not None and self._decoder.has_unconsumed_tail
+
     def _flush_decoder(self) -> bytes:
         """
         Flushes the decoder. Should only be called if the decoder is actually
@@ -639,6 +780,11 @@ class HTTPResponse(BaseHTTPResponse):
         self._original_response = original_response
         self._fp_bytes_read = 0
         self.msg = msg
+        # (timing callback, time the headers were received) of an
+        # instrumented connection, until the body has been read.
+        self._body_timer: tuple[typing.Callable[[str, float], None], float] | None = (
+            None
+        )
 
         if body and isinstance(body, (str, bytes)):
             self._body = body
@@ -659,6 +805,9 @@ class HTTPResponse(BaseHTTPResponse):
         # Used to return the correct amount of bytes for partial read()s
         self._decoded_buffer = BytesQueueBuffer()
 
+        # Reused by readinto() to receive encoded data before decoding it.
+        self._readinto_scratch: bytearray | None = None
+
         # If requested, preload the body.
         if preload_content and not self._body:
             self._body = self.read(decode_content=decode_content)
@@ -827,6 +976,10 @@ class HTTPResponse(BaseHTTPResponse):
             # If we hold the original response but it's closed now, we should
             # return the connection back to the pool.
             if self._original_response and self._original_response.isclosed():
+                if self._body_timer is not None:
+                    timing, headers_received = self._body_timer
+                    self._body_timer = None
+                    timing("body", time.perf_counter() - headers_received)
                 self.release_conn()
 
     def _fp_read(
@@ -938,6 +1091,107 @@ class HTTPResponse(BaseHTTPResponse):
                 self.length_remaining -= len(data)
         return data
 
+    def _raw_readinto(self, b: memoryview) -> int:
+        """
+        Reads up to ``len(b)`` bytes from the socket straight into ``b``.
+        """
+        if self._fp is None:
+            return 0
+
+        if not hasattr(self._fp, "readinto"):
+            data = self._raw_read(len(b))
+            b[: len(data)] = data
+            return len(data)
+
+        if util.IS_PYOPENSSL or sys.version_info < (3, 10):
+            # See _fp_read() for why reads must fit into a 32-bit int.
+            b = b[: 2**28]
+
+        fp_closed = getattr(self._fp, "closed", False)
+
+        with self._error_catcher():
+            n = self._fp.readinto(b) if not fp_closed else 0
+            if not n and len(b):
+                # Same handling of a premature end of the body as _raw_read().
+                self._fp.close()
+                if (
+                    self.enforce_content_length
+                    and self.length_remaining is not None
+                    and self.length_remaining != 0
+                ):
+                    raise IncompleteRead(self._fp_bytes_read, self.length_remaining)
+
+        if n:
+            self._fp_bytes_read += n
+            if self.length_remaining is not None:
+                self.length_remaining -= n
+        return n
+
+    def readinto(  # type: ignore[override]
+        self, b: bytearray | memoryview, decode_content: bool | None = None
+    ) -> int:
+        """
+        Read up to ``len(b)`` bytes of the body into ``b`` and return the number
+        of bytes read, ``0`` meaning the body is exhausted.
+
+        When the body is not being decoded the bytes go from the socket
+        straight into ``b``. Otherwise the encoded data is received into a
+        reused internal buffer and the decoder output is copied into ``b``,
+        any excess being kept for the next call.
+
+        :param decode_content:
+            If True, will attempt to decode the body based on the
+            'content-encoding' header.
+        """
+        self._init_decoder()
+        if decode_content is None:
+            decode_content = self.decode_content
+
+        view = memoryview(b).cast("B")
+        if not view:
+            return 0
+        if len(self._decoded_buffer) > 0:
+            return self._decoded_buffer.get_into(view)
+
+        if not (decode_content and self._decoder):
+            if not decode_content and self._has_decoded_content:
+                raise RuntimeError(
+                    "Calling readinto(decode_content=False) is not supported after "
+                    "readinto(decode_content=True) was called."
+                )
+            return self._raw_readinto(view)
+
+        scratch = self._readinto_scratch
+        if scratch is None or len(scratch) < len(view):
+            scratch = self._readinto_scratch = bytearray(len(view))
+        with memoryview(scratch)[: len(view)] as encoded:
+            while True:
+                if self._decoder_has_unconsumed_tail():
+                    # Decode what the decoder held back before receiving
+                    # more. It may decode to nothing, such as the header of
+                    # the next gzip member, which is not the end of the body.
+                    decoded = self._decode(
+                        b"", decode_content, flush_decoder=False, max_length=len(view)
+                    )
+                    if decoded:
+                        break
+                    continue
+                n = self._raw_readinto(encoded)
+                decoded = self._decode(
+                    encoded[:n] if n else b"",
+                    decode_content,
+                    flush_decoder=not n,
+                    max_length=len(view),
+                )
+                if decoded or not (n or self._decoder_has_unconsumed_tail()):
+                    break
+
+        if len(decoded) <= len(view):
+            view[: len(decoded)] = decoded
+            return len(decoded)
+        self._decoded_buffer.put(decoded)
+        return self._decoded_buffer.get_into(view)
+
     def read(
         self,
         amt: int | None = None,
@@ -977,11 +1231,17 @@ class HTTPResponse(BaseHTTPResponse):
             if len(self._decoded_buffer) >= amt:
                 return self._decoded_buffer.get(amt)
 
-        data = self._raw_read(amt)
-
-        flush_decoder = amt is None or (amt != 0 and not data)
+        # Input held back by the decoder is decoded before more is read, so
+        # that a small read of a very compressible body stays small.
+        has_tail = decode_content and self._decoder_has_unconsumed_tail()
+        if amt is not None and has_tail:
+            data = b""
+            flush_decoder = False
+        else:
+            data = self._raw_read(amt)
+            flush_decoder = amt is None or (amt != 0 and not data)
 
-        if not data and len(self._decoded_buffer) == 0:
+        if not data and len(self._decoded_buffer) == 0 and not has_tail:
             return data
 
         if amt is None:
@@ -998,16 +1258,27 @@ class HTTPResponse(BaseHTTPResponse):
                     )
                 return data
 
-            decoded_data = self._decode(data, decode_content, flush_decoder)
-            self._decoded_buffer.put(decoded_data)
-
-            while len(self._decoded_buffer) < amt and data:
+            while True:
+                decoded_data = self._decode(
+                    data,
+                    decode_content,
+                    flush_decoder,
+                    max_length=amt - len(self._decoded_buffer),
+                )
+                self._decoded_buffer.put(decoded_data)
+                if len(self._decoded_buffer) >= amt:
+                    break
+                if self._decoder_has_unconsumed_tail():
+                    data = b""
+                    continue
+                if flush_decoder or (not data and not has_tail):
+                    break
                 # TODO make sure to initially read enough data to get past the headers
                 # For example, the GZ file header takes 10 bytes, we don't want to read
                 # it one byte at a time
                 data = self._raw_read(amt)
-                decoded_data = self._decode(data, decode_content, flush_decoder)
-                self._decoded_buffer.put(decoded_data)
+                flush_decoder = not data
+                has_tail = False
             data = self._decoded_buffer.get(amt)
 
         return data
@@ -1067,7 +1338,10 @@ class HTTPResponse(BaseHTTPResponse):
         return self._decoded_buffer.get(amt)
 
     def stream(
-        self, amt: int | None = 2**16, decode_content: bool | None = None
+        self,
+        amt: int | None = 2**16,
+        decode_content: bool | None = None,
+        decode_in_thread: bool = False,
     ) -> typing.Generator[bytes]:
         """
         A generator wrapper for the read() method. A call will block until
@@ -1083,16 +1357,57 @@ class HTTPResponse(BaseHTTPResponse):
         :param decode_content:
             If True, will attempt to decode the body based on the
             'content-encoding' header.
+
+        :param decode_in_thread:
+            If True, a body that is decoded is decoded in a worker thread
+            while the next ``amt`` bytes are read from the connection. The
+            decoders release the GIL, so decoding and receiving overlap. It
+            does not apply to chunked bodies.
         """
+        if decode_content is None:
+            decode_content = self.decode_content
+        self._init_decoder()
         if self.chunked and self.supports_chunked_reads():
             yield from self.read_chunked(amt, decode_content=decode_content)
+        elif decode_in_thread and amt and decode_content and self._decoder:
+            yield from self._stream_decoding_in_thread(amt)
         else:
-            while not is_fp_closed(self._fp) or len(self._decoded_buffer) > 0:
+            while (
+                not is_fp_closed(self._fp)
+                or len(self._decoded_buffer) > 0
+                or (decode_content and self._decoder_has_unconsumed_tail())
+            ):
                 data = self.read(amt=amt, decode_content=decode_content)
 
                 if data:
                     yield data
 
+    def _stream_decoding_in_thread(self, amt: int) -> typing.Generator[bytes]:
+        if len(self._decoded_buffer) > 0:
+            yield self._decoded_buffer.get_all()
+
+        with ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="urllib3-decode"
+        ) as executor:
+            data = self._raw_read(amt)
+            while True:
+                flush_decoder = not data
+                future = executor.submit(self._decode, data, True, flush_decoder, amt)
+                # Receive the next chunk meanwhile.
+                next_data = self._raw_read(amt) if data else b""
+                decoded = future.result()
+                if decoded:
+                    yield decoded
+                # The decoder may have held input back: drain it before
+                # decoding the next chunk, keeping memory use bounded.
+                while self._decoder_has_unconsumed_tail():
+                    decoded = self._decode(b"", True, flush_decoder, amt)
+                    if decoded:
+                        yield decoded
+                if not data:
+                    break
+                data = next_data
+
     # Overrides from io.IOBase
     def readable(self) -> bool:
         return True
@@ -1249,11 +1564,18 @@ class HTTPResponse(BaseHTTPResponse):
                 if self.chunk_left == 0:
                     break
                 chunk = self._handle_chunk(amt)
-                decoded = self._decode(
-                    chunk, decode_content=decode_content, flush_decoder=False
-                )
-                if decoded:
-                    yield decoded
+                while True:
+                    decoded = self._decode(
+                        chunk,
+                        decode_content=decode_content,
+                        flush_decoder=False,
+                        max_length=amt or -1,
+                    )
+                    if decoded:
+                        yield decoded
+                    if not (decode_content and self._decoder_has_unconsumed_tail()):
+                        break
+                    chunk = b""
 
             if decode_content:
                 # On CPython and PyPy, we should never need to flush the
@@ -0,0 +1,233 @@
+import socket
+import time
+
+import pytest
+
+from urllib3.util import connection
+from urllib3.util.connection import (
+    _happy_eyeballs_connect,
+    _interleave_addresses,
+    create_connection,
+)
+from urllib3.util.resolver import Resolver
+
+V4 = socket.AF_INET
+V6 = socket.AF_INET6
+
+
+def addrinfo(host, port):
+    if ":" in host:
+        return (V6, socket.SOCK_STREAM, socket.IPPROTO_TCP, "", (host, port, 0, 0))
+    return (V4, socket.SOCK_STREAM, socket.IPPROTO_TCP, "", (host, port))
+
+
+@pytest.fixture
+def sockets():
+    opened = []
+    yield opened
+    for sock in opened:
+        sock.close()
+
+
+@pytest.fixture
+def listener(sockets):
+    """Returns the addrinfo of a new listener on ``host``."""
+
+    def factory(host):
+        sock = socket.create_server((host, 0), family=V6 if ":" in host else V4)
+        sockets.append(sock)
+        return addrinfo(host, sock.getsockname()[1])
+
+    return factory
+
+
+@pytest.fixture
+def blackhole(sockets):
+    """
+    Returns the addrinfo of an address on ``host`` that never answers: a
+    listener whose accept queue is full, so that new connection attempts
+    have their SYNs dropped and hang like ones to a blackholed address.
+    """
+
+    def factory(host):
+        family = V6 if ":" in host else V4
+        sock = socket.socket(family)
+        sock.bind((host, 0))
+        sock.listen(0)
+        sockets.append(sock)
+        res = addrinfo(host, sock.getsockname()[1])
+        for _ in range(3):
+            filler = socket.socket(family)
+            filler.setblocking(False)
+            filler.connect_ex(res[4])
+            sockets.append(filler)
+        time.sleep(0.05)
+        return res
+
+    return factory
+
+
+@pytest.fixture
+def refused(sockets):
+    """Returns the addrinfo of a port on ``host`` nothing listens on."""
+
+    def factory(host):
+        sock = socket.socket(V6 if ":" in host else V4)
+        sock.bind((host, 0))
+        port = sock.getsockname()[1]
+        sock.close()
+        return addrinfo(host, port)
+
+    return factory
+
+
+@pytest.fixture(autouse=True)
+def family_preference(monkeypatch):
+    preference = {}
+    monkeypatch.setattr(connection, "_family_preference", preference)
+    return preference
+
+
+@pytest.fixture
+def attempts(monkeypatch):
+    """Records the sockets of the connection attempts, in order."""
+    started = []
+    start_connect = connection._start_connect
+
+    def record(res, *args):
+        sock = start_connect(res, *args)
+        started.append(sock)
+        return sock
+
+    monkeypatch.setattr(connection, "_start_connect", record)
+    return started
+
+
+def happy_eyeballs(addresses, timeout=5, delay=0.05):
+    return _happy_eyeballs_connect("example.com", addresses, timeout, None, None, delay)
+
+
+class TestInterleaveAddresses:
+    def test_alternates_families(self):
+        addresses = [
+            addrinfo("::1", 1),
+            addrinfo("::2", 1),
+            addrinfo("::3", 1),
+            addrinfo("10.0.0.1", 1),
+            addrinfo("10.0.0.2", 1),
+        ]
+        assert [r[4][0] for r in _interleave_addresses(addresses, None)] == [
+            "::1",
+            "10.0.0.1",
+            "::2",
+            "10.0.0.2",
+            "::3",
+        ]
+
+    def test_preferred_family_first(self):
+        addresses = [addrinfo("::1", 1), addrinfo("10.0.0.1", 1), addrinfo("::2", 1)]
+        assert [r[4][0] for r in _interleave_addresses(addresses, V4)] == [
+            "10.0.0.1",
+            "::1",
+            "::2",
+        ]
+
+    def test_preferred_family_missing(self):
+        addresses = [addrinfo("::1", 1), addrinfo("::2", 1)]
+        assert _interleave_addresses(addresses, V4) == addresses
+
+
+class TestHappyEyeballs:
+    def test_winner_returned(self, listener, blackhole, attempts):
+        # The IPv6 address is blackholed: IPv4 is tried after the delay, and
+        # wins long before the connect timeout.
+        start = time.monotonic()
+        winner = listener("127.0.0.1")
+        sock = happy_eyeballs([blackhole("::1"), winner])
+        try:
+            assert time.monotonic() - start < 1
+            assert sock.getpeername() == winner[4]
+            assert sock.gettimeout() == 5
+            assert len(attempts) == 2
+        finally:
+            sock.close()
+
+    def test_losers_closed(self, listener, blackhole, attempts):
+        sock = happy_eyeballs(
+            [blackhole("::1"), blackhole("127.0.0.1"), listener("::1")]
+        )
+        try:
+            assert attempts[-1] is sock
+            assert [s.fileno() for s in attempts[:-1]] == [-1, -1]
+            assert sock.fileno() != -1
+        finally:
+            sock.close()
+
+    def test_failed_attempt_starts_next(self, listener, refused, attempts):
+        # A refused connection does not wait for the delay.
+        start = time.monotonic()
+        sock = happy_eyeballs([refused("::1"), listener("127.0.0.1")], delay=2)
+        try:
+            assert time.monotonic() - start < 1
+            assert sock.family == V4
+            assert attempts[0].fileno() == -1
+        finally:
+            sock.close()
+
+    def test_each_attempt_times_out(self, blackhole, attempts):
+        # Each attempt gives up after the timeout, counted from its own
+        # start: the second one started 0.1 s after the first.
+        start = time.monotonic()
+        with pytest.raises(socket.timeout):
+            happy_eyeballs([blackhole("::1"), blackhole("127.0.0.1")], 0.3, 0.1)
+        elapsed = time.monotonic() - start
+        assert 0.35 < elapsed < 0.6
+        assert [s.fileno() for s in attempts] == [-1, -1]
+
+    def test_all_refused(self, refused):
+        with pytest.raises(ConnectionRefusedError):
+            happy_eyeballs([refused("::1"), refused("127.0.0.1")])
+
+
+class AddressResolver(Resolver):
+    """Resolves every host to the given addresses, whatever the port."""
+
+    def __init__(self, addresses):
+        self.addresses = addresses
+
+    def getaddrinfo(self, host, port, family, type):
+        return list(self.addresses)
+
+
+class TestCreateConnection:
+    def test_family_preference_remembered(
+        self, listener, blackhole, attempts, family_preference, monkeypatch
+    ):
+        monkeypatch.setattr(connection, "HAPPY_EYEBALLS_DELAY", 0.05)
+        resolver = AddressResolver([blackhole("::1"), listener("127.0.0.1")])
+
+        sock = create_connection(("example.com", 80), 5, resolver=resolver)
+        sock.close()
+        assert family_preference == {"example.com": V4}
+        assert [s.family for s in attempts] == [V6, V4]
+
+        # IPv4 won last time, so it goes first, and wins before the IPv6
+        # attempt is even started.
+        del attempts[:]
+        create_connection(("example.com", 80), 5, resolver=resolver).close()
+        assert [s.family for s in attempts] == [V4]
+
+        # The preference is kept per host.
+        del attempts[:]
+        create_connection(("example.org", 80), 5, resolver=resolver).close()
+        assert [s.family for s in attempts] == [V6, V4]
+
+    def test_delay_none_tries_addresses_in_turn(
+        self, listener, refused, attempts, monkeypatch
+    ):
+        monkeypatch.setattr(connection, "HAPPY_EYEBALLS_DELAY", None)
+        resolver = AddressResolver([refused("::1"), listener("127.0.0.1")])
+        sock = create_connection(("example.com", 80), 5, resolver=resolver)
+        sock.close()
+        assert sock.family == V4
+        assert attempts == []
@@ -0,0 +1,385 @@
+import hashlib
+import socket
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+h2 = pytest.importorskip("h2")
+
+import h2.config  # noqa: E402
+import h2.connection  # noqa: E402
+import h2.events  # noqa: E402
+from h2.settings import SettingCodes  # noqa: E402
+
+from urllib3 import connection  # noqa: E402
+from urllib3.connectionpool import HTTPSConnectionPool  # noqa: E402
+from urllib3.exceptions import EmptyPoolError, ProtocolError  # noqa: E402
+from urllib3.http2.connection import HTTP2Connection  # noqa: E402
+
+TIMEOUT = 5
+
+pytestmark = pytest.mark.filterwarnings(
+    "ignore::urllib3.exceptions.InsecureRequestWarning"
+)
+
+
+class Request:
+    def __init__(self, stream_id, headers):
+        self.stream_id = stream_id
+        self.headers = dict(headers)
+        self.body = bytearray()
+
+    @property
+    def path(self):
+        return self.headers[b":path"].decode()
+
+
+class H2Server:
+    """
+    A cleartext HTTP/2 server (prior knowledge, no TLS) standing in for a
+    real one. Each connection is served by a thread of its own, which hands
+    the requests received in full to :meth:`respond`.
+
+    By default requests are answered with the digest of their body once
+    ``batch`` of them are waiting: clients get responses only if they have
+    that many streams open at once.
+    """
+
+    def __init__(self, max_concurrent_streams=100, initial_window_size=65535, batch=1):
+        self.max_concurrent_streams = max_concurrent_streams
+        self.initial_window_size = initial_window_size
+        self.batch = batch
+        self.connections = 0
+        self.max_open = 0
+        self.lock = threading.Lock()
+        self.listener = socket.create_server(("127.0.0.1", 0))
+        self.port = self.listener.getsockname()[1]
+        self._socks = []
+        threading.Thread(target=self._accept, daemon=True).start()
+
+    def close(self):
+        self.listener.close()
+        for sock in self._socks:
+            sock.close()
+
+    def _accept(self):
+        while True:
+            try:
+                sock, _ = self.listener.accept()
+            except OSError:
+                return
+            with self.lock:
+                self.connections += 1
+            self._socks.append(sock)
+            threading.Thread(target=self._serve, args=(sock,), daemon=True).start()
+
+    def _serve(self, sock):
+        conn = h2.connection.H2Connection(
+            h2.config.H2Configuration(client_side=False, header_encoding=None)
+        )
+        conn.initiate_connection()
+        conn.update_settings(
+            {
+                SettingCodes.MAX_CONCURRENT_STREAMS: self.max_concurrent_streams,
+                SettingCodes.INITIAL_WINDOW_SIZE: self.initial_window_size,
+            }
+        )
+        requests = {}
+        waiting = []
+        try:
+            sock.sendall(conn.data_to_send())
+            while True:
+                data = sock.recv(65535)
+                if not data:
+                    return
+                for event in conn.receive_data(data):
+                    if isinstance(event, h2.events.RequestReceived):
+                        requests[event.stream_id] = Request(
+                            event.stream_id, event.headers
+                        )
+                        with self.lock:
+                            self.max_open = max(self.max_open, len(requests))
+                    elif isinstance(event, h2.events.DataReceived):
+                        requests[event.stream_id].body += event.data
+                        conn.acknowledge_received_data(
+                            event.flow_controlled_length, event.stream_id
+                        )
+                    elif isinstance(event, h2.events.StreamEnded):
+                        waiting.append(requests[event.stream_id])
+                    elif isinstance(event, h2.events.StreamReset):
+                        requests.pop(event.stream_id, None)
+                pending = self.respond(conn, waiting)
+                for request in waiting:
+                    if request not in pending:
+                        del requests[request.stream_id]
+                waiting = pending
+                sock.sendall(conn.data_to_send())
+        except OSError:
+            pass
+
+    def respond(self, conn, waiting):
+        """Answers some of the ``waiting`` requests, returns the others."""
+        if len(waiting) < self.batch:
+            return waiting
+        for request in waiting:
+            self.send_response(conn, request)
+        return []
+
+    def send_response(self, conn, request, end_stream=True):
+        body = hashlib.sha256(request.body).hexdigest().encode()
+        conn.send_headers(
+            request.stream_id,
+            [(b":status", b"200"), (b"content-length", str(len(body)).encode())],
+        )
+        conn.send_data(request.stream_id, body, end_stream=end_stream)
+        return body
+
+
+@pytest.fixture(autouse=True)
+def cleartext(monkeypatch):
+    # The server speaks HTTP/2 without TLS.
+    monkeypatch.setattr(
+        connection,
+        "_ssl_wrap_socket_and_match_hostname",
+        lambda sock, **kwargs: connection._WrappedAndVerifiedSocket(sock, False),
+    )
+
+
+@pytest.fixture
+def server_factory():
+    servers = []
+
+    def factory(cls=H2Server, **kwargs):
+        server = cls(**kwargs)
+        servers.append(server)
+        return server
+
+    yield factory
+    for server in servers:
+        server.close()
+
+
+class H2Pool(HTTPSConnectionPool):
+    ConnectionCls = HTTP2Connection
+
+
+def digest(body):
+    return hashlib.sha256(body).hexdigest().encode()
+
+
+def request_on(stream, path="/", body=None):
+    stream.request("POST" if body else "GET", path, body=body)
+    return stream
+
+
+class TestHTTP2Connection:
+    def test_concurrent_streams(self, server_factory):
+        server = server_factory(batch=3)
+        conn = HTTP2Connection("127.0.0.1", server.port, timeout=TIMEOUT)
+        streams = [conn.open_stream() for _ in range(3)]
+        assert conn.active_streams == 3
+        streams[0].connect()
+        bodies = [b"a" * 10, b"b" * 20, b"c" * 30]
+        for stream, body in zip(streams, bodies):
+            request_on(stream, body=body)
+
+        # Each response is only sent once all three requests are in, which
+        # would time out if the streams were used one after another.
+        for stream, body in reversed(list(zip(streams, bodies))):
+            response = stream.getresponse()
+            assert response.status == 200
+            assert response.data == digest(body)
+        assert conn.active_streams == 0
+        assert server.connections == 1
+        conn.close()
+
+    def test_concurrent_streams_from_threads(self, server_factory):
+        server = server_factory(batch=8)
+        conn = HTTP2Connection("127.0.0.1", server.port, timeout=TIMEOUT)
+        conn.connect()
+
+        def fetch(i):
+            stream = request_on(conn.open_stream(), f"/{i}", body=b"x" * i * 1000)
+            return stream.getresponse().data
+
+        with ThreadPoolExecutor(8) as executor:
+            results = list(executor.map(fetch, range(1, 9)))
+        assert results == [digest(b"x" * i * 1000) for i in range(1, 9)]
+        assert server.max_open == 8
+        conn.close()
+
+    def test_server_max_concurrent_streams(self, server_factory):
+        server = server_factory(max_concurrent_streams=2)
+        conn = HTTP2Connection("127.0.0.1", server.port, timeout=TIMEOUT)
+        conn.connect()
+        assert conn.available_streams == 2
+        stream = conn.open_stream()
+        assert conn.available_streams == 1
+        stream.release()
+        assert conn.available_streams == 2
+        conn.close()
+
+    def test_body_larger_than_flow_control_window(self, server_factory):
+        # The server's window for each stream is a tenth of the body: the
+        # body can only be sent in full as the server opens it again.
+        server = server_factory(initial_window_size=10000)
+        conn = HTTP2Connection("127.0.0.1", server.port, timeout=TIMEOUT)
+        conn.connect()
+        body = bytes(range(256)) * 400
+        streams = [request_on(conn.open_stream(), body=body) for _ in range(2)]
+        for stream in streams:
+            assert stream.getresponse().data == digest(body)
+        conn.close()
+
+    def test_goaway_mid_stream(self, server_factory):
+        class GoAwayServer(H2Server):
+            def respond(self, conn, waiting):
+                if len(waiting) < 2:
+                    return waiting
+                first, second = sorted(waiting, key=lambda r: r.stream_id)
+                self.send_response(conn, first)
+                # The second stream is not going to be processed.
+                conn.close_connection(last_stream_id=first.stream_id)
+                return []
+
+        server = server_factory(cls=GoAwayServer)
+        conn = HTTP2Connection("127.0.0.1", server.port, timeout=TIMEOUT)
+        conn.connect()
+        first = request_on(conn.open_stream(), body=b"first")
+        second = request_on(conn.open_stream(), body=b"second")
+
+        with pytest.raises(ProtocolError, match="GOAWAY"):
+            second.getresponse()
+        assert first.getresponse().data == digest(b"first")
+        assert not conn.can_open_streams
+        assert conn.available_streams == 0
+        with pytest.raises(ProtocolError, match="GOAWAY"):
+            request_on(conn.open_stream())
+        conn.close()
+
+    def test_reset_mid_stream(self, server_factory):
+        class ResetServer(H2Server):
+            def respond(self, conn, waiting):
+                for request in waiting:
+                    if request.path == "/reset":
+                        # Headers and part of the body, then a reset.
+                        conn.send_headers(request.stream_id, [(b":status", b"200")])
+                        conn.send_data(request.stream_id, b"partial")
+                        conn.reset_stream(request.stream_id)
+                    else:
+                        self.send_response(conn, request)
+                return []
+
+        server = server_factory(cls=ResetServer)
+        conn = HTTP2Connection("127.0.0.1", server.port, timeout=TIMEOUT)
+        conn.connect()
+        with pytest.raises(ProtocolError, match="reset"):
+            request_on(conn.open_stream(), "/reset").getresponse()
+        assert conn.active_streams == 0
+
+        # Only the stream failed; the connection carries on.
+        assert conn.can_open_streams
+        assert request_on(conn.open_stream(), body=b"ok").getresponse().data == digest(
+            b"ok"
+        )
+        conn.close()
+
+
+class TestHTTP2Pool:
+    def test_streams_share_a_connection(self, server_factory):
+        server = server_factory(batch=6)
+        with H2Pool(
+            "127.0.0.1", server.port, maxsize=1, block=True, timeout=TIMEOUT
+        ) as pool:
+            with ThreadPoolExecutor(6) as executor:
+                responses = list(
+                    executor.map(lambda i: pool.urlopen("GET", f"/{i}"), range(6))
+                )
+            assert [r.status for r in responses] == [200] * 6
+            assert server.connections == 1
+            assert server.max_open == 6
+            (conn,) = pool._multiplexed_conns
+            assert conn.active_streams == 0
+
+    def test_streams_limited_by_server(self, server_factory):
+        # With one connection allowed, no more streams than the server's
+        # SETTINGS_MAX_CONCURRENT_STREAMS are handed out at once.
+        server = server_factory(max_concurrent_streams=2, batch=2)
+        with H2Pool(
+            "127.0.0.1", server.port, maxsize=1, block=True, timeout=TIMEOUT
+        ) as pool:
+            with ThreadPoolExecutor(6) as executor:
+                responses = list(
+                    executor.map(lambda i: pool.urlopen("GET", f"/{i}"), range(6))
+                )
+            assert [r.status for r in responses] == [200] * 6
+            assert server.connections == 1
+            assert server.max_open == 2
+
+    def test_get_and_release_stream(self, server_factory):
+        server = server_factory(max_concurrent_streams=2)
+        with H2Pool(
+            "127.0.0.1", server.port, maxsize=2, block=True, timeout=TIMEOUT
+        ) as pool:
+            first = pool._get_stream()
+            first.connect()
+            second = pool._get_stream()
+            assert second.connection is first.connection
+            # The first connection has no more streams to offer.
+            third = pool._get_stream()
+            third.connect()
+            fourth = pool._get_stream()
+            assert third.connection is not first.connection
+            assert fourth.connection is third.connection
+            with pytest.raises(EmptyPoolError):
+                pool._get_stream(timeout=0.1)
+
+            pool._put_conn(second)
+            fifth = pool._get_stream(timeout=0.1)
+            assert fifth.connection is first.connection
+
+            for stream in (first, third, fourth, fifth):
+                pool._put_conn(stream)
+            assert [c.active_streams for c in pool._multiplexed_conns] == [0, 0]
+            assert not any(c.is_closed for c in pool._multiplexed_conns)
+            assert server.connections == 2
+
+    def test_release_stream_closes_overflow_connection(self, server_factory):
+        server = server_factory(max_concurrent_streams=1)
+        with H2Pool(
+            "127.0.0.1", server.port, maxsize=1, block=False, timeout=TIMEOUT
+        ) as pool:
+            first = pool._get_stream()
+            first.connect()
+            overflow = pool._get_stream()
+            overflow.connect()
+            assert server.connections == 2
+            pool._put_conn(overflow)
+            assert overflow.connection.is_closed
+            assert pool._multiplexed_conns == [first.connection]
+            pool._put_conn(first)
+            assert not first.connection.is_closed
+
+    def test_goaway_prunes_connection(self, server_factory):
+        class GoAwayServer(H2Server):
+            def respond(self, conn, waiting):
+                for request in waiting:
+                    self.send_response(conn, request)
+                    if self.connections == 1:
+                        conn.close_connection(last_stream_id=request.stream_id)
+                return []
+
+        server = server_factory(cls=GoAwayServer)
+        with H2Pool(
+            "127.0.0.1", server.port, maxsize=1, block=True, timeout=TIMEOUT
+        ) as pool:
+            assert pool.urlopen("GET", "/1").status == 200
+            # The connection was told to go away: it is closed once its last
+            # stream is released, and the next request opens another one.
+            assert pool._multiplexed_conns == []
+            assert pool.urlopen("GET", "/2").status == 200
+            assert pool.urlopen("GET", "/3").status == 200
+            assert server.connections == 2
+            (conn,) = pool._multiplexed_conns
+            assert conn.can_open_streams
@@ -0,0 +1,196 @@
+import socket
+import threading
+
+import pytest
+
+from urllib3.connectionpool import HTTPConnectionPool
+from urllib3.exceptions import HostChangedError, MaxRetryError
+from urllib3.util.retry import Retry
+
+TIMEOUT = 2
+
+
+class PipelineServer:
+    """
+    An HTTP/1.1 server reading requests off each connection as they come,
+    and recording the paths received on each connection.
+
+    On the first connection nothing is answered before ``batch`` requests
+    are in, which only pipelined requests get past. Once ``close_after``
+    responses were written there, the connection is dropped. ``routes``
+    maps paths to ``(status, headers)``; bodies are the paths.
+    """
+
+    def __init__(self, batch=1, close_after=None, routes=None):
+        self.batch = batch
+        self.close_after = close_after
+        self.routes = routes or {}
+        self.connections = []
+        self.listener = socket.create_server(("127.0.0.1", 0))
+        self.port = self.listener.getsockname()[1]
+        threading.Thread(target=self._accept, daemon=True).start()
+
+    def close(self):
+        self.listener.close()
+
+    def _accept(self):
+        while True:
+            try:
+                sock, _ = self.listener.accept()
+            except OSError:
+                return
+            paths = []
+            first = not self.connections
+            self.connections.append(paths)
+            threading.Thread(
+                target=self._serve, args=(sock, paths, first), daemon=True
+            ).start()
+
+    def _serve(self, sock, paths, first):
+        batch = self.batch if first else 1
+        close_after = self.close_after if first else None
+        buf = b""
+        waiting = []
+        answered = 0
+        with sock:
+            while True:
+                while b"\r\n\r\n" not in buf:
+                    data = sock.recv(65536)
+                    if not data:
+                        return
+                    buf += data
+                head, buf = buf.split(b"\r\n\r\n", 1)
+                path = head.split(b" ")[1].decode()
+                paths.append(path)
+                waiting.append(path)
+                if len(paths) < batch:
+                    continue
+                for path in waiting:
+                    if answered == close_after:
+                        sock.shutdown(socket.SHUT_RDWR)
+                        return
+                    sock.sendall(self._response(path))
+                    answered += 1
+                waiting = []
+
+    def _response(self, path):
+        status, headers = self.routes.get(path, (200, {}))
+        body = path.encode()
+        head = [f"HTTP/1.1 {status} X", f"Content-Length: {len(body)}"]
+        head += [f"{name}: {value}" for name, value in headers.items()]
+        return ("\r\n".join(head) + "\r\n\r\n").encode() + body
+
+
+@pytest.fixture
+def server_factory():
+    servers = []
+
+    def factory(**kwargs):
+        server = PipelineServer(**kwargs)
+        servers.append(server)
+        return server
+
+    yield factory
+    for server in servers:
+        server.close()
+
+
+def pool_for(server, **kwargs):
+    return HTTPConnectionPool("127.0.0.1", server.port, timeout=TIMEOUT, **kwargs)
+
+
+PATHS = [f"/{i}" for i in range(5)]
+
+
+class TestPipeline:
+    def test_pipelined(self, server_factory):
+        # Nothing would be answered if the requests waited for responses.
+        server = server_factory(batch=5)
+        with pool_for(server) as pool:
+            responses = pool.pipeline(PATHS)
+        assert [r.data for r in responses] == [p.encode() for p in PATHS]
+        assert [r.status for r in responses] == [200] * 5
+        assert server.connections == [PATHS]
+
+    def test_connection_reused_afterwards(self, server_factory):
+        server = server_factory(batch=2)
+        with pool_for(server) as pool:
+            pool.pipeline(["/a", ("HEAD", "/b")])
+            assert pool.urlopen("GET", "/c").data == b"/c"
+        assert server.connections == [["/a", "/b", "/c"]]
+
+    def test_single_request_not_pipelined(self, server_factory):
+        server = server_factory()
+        with pool_for(server) as pool:
+            (response,) = pool.pipeline(["/only"])
+        assert response.data == b"/only"
+
+    def test_dropped_connection_falls_back(self, server_factory):
+        # The server answers two requests, then drops the connection: the
+        # others are made one at a time on a new connection.
+        server = server_factory(batch=5, close_after=2)
+        with pool_for(server) as pool:
+            responses = pool.pipeline(PATHS, retries=Retry(3))
+        assert [r.data for r in responses] == [p.encode() for p in PATHS]
+        assert server.connections[0] == PATHS
+        assert server.connections[1:] == [PATHS[2:]]
+        # The failure counted against the retries of the rest.
+        assert responses[0].retries.total == 3
+        assert responses[-1].retries.total == 2
+        assert len(responses[-1].retries.history) == 1
+
+    def test_dropped_connection_without_retries(self, server_factory):
+        server = server_factory(batch=5, close_after=2)
+        with pool_for(server) as pool:
+            with pytest.raises(MaxRetryError):
+                pool.pipeline(PATHS, retries=Retry(0))
+
+    def test_connection_close_header(self, server_factory):
+        # The server announces that it closes the connection: the requests
+        # it did not answer are made again, without using up a retry.
+        server = server_factory(batch=5, routes={"/1": (200, {"Connection": "close"})})
+        with pool_for(server) as pool:
+            responses = pool.pipeline(PATHS, retries=Retry(0))
+        assert [r.data for r in responses] == [p.encode() for p in PATHS]
+        assert server.connections[1:] == [PATHS[2:]]
+
+    def test_redirect_followed(self, server_factory):
+        server = server_factory(batch=3, routes={"/1": (302, {"Location": "/target"})})
+        with pool_for(server) as pool:
+            responses = pool.pipeline(["/0", "/1", "/2"])
+            assert [r.data for r in responses] == [b"/0", b"/target", b"/2"]
+            no_redirect = pool.pipeline(["/0", "/1"], redirect=False)
+            assert no_redirect[1].status == 302
+
+    def test_status_retried(self, server_factory):
+        server = server_factory(batch=3, routes={"/1": (503, {"Retry-After": "0"})})
+        retries = Retry(1, status_forcelist=[503], raise_on_status=False)
+        with pool_for(server) as pool:
+            responses = pool.pipeline(["/0", "/1", "/2"], retries=retries)
+        # The pipelined 503 used up the retry: /1 was made once more.
+        requested = [path for paths in server.connections for path in paths]
+        assert requested == ["/0", "/1", "/2", "/1"]
+        assert responses[1].status == 503
+        assert len(responses[1].retries.history) == 1
+        assert responses[0].retries.history == ()
+
+    def test_status_retries_exhausted(self, server_factory):
+        server = server_factory(batch=2, routes={"/1": (503, {})})
+        retries = Retry(0, status_forcelist=[503])
+        with pool_for(server) as pool:
+            with pytest.raises(MaxRetryError):
+                pool.pipeline(["/0", "/1"], retries=retries)
+        assert server.connections == [["/0", "/1"]]
+
+    def test_non_idempotent_rejected(self, server_factory):
+        server = server_factory()
+        with pool_for(server) as pool:
+            with pytest.raises(ValueError, match="non-idempotent POST"):
+                pool.pipeline(["/a", ("POST", "/b")])
+        assert server.connections == []
+
+    def test_other_host_rejected(self, server_factory):
+        server = server_factory()
+        with pool_for(server) as pool:
+            with pytest.raises(HostChangedError):
+                pool.pipeline(["/a", "http://other.example/b"])
@@ -0,0 +1,95 @@
+import gzip
+import io
+import zlib
+
+import pytest
+
+from urllib3.response import HTTPResponse
+
+BODY = b"".join(b"%d:" % i + b"x" * (i % 97) for i in range(2000))
+
+
+def encode(encoding, body):
+    if encoding == "gzip":
+        return gzip.compress(body)
+    if encoding == "gzip-members":
+        half = len(body) // 2
+        return gzip.compress(body[:half]) + gzip.compress(body[half:])
+    if encoding == "gzip-small-members":
+        return b"".join(
+            gzip.compress(body[i : i + 30]) for i in range(0, len(body), 30)
+        )
+    if encoding == "deflate":
+        return zlib.compress(body)
+    if encoding == "gzip, deflate":
+        return zlib.compress(gzip.compress(body))
+    raise ValueError(encoding)
+
+
+def response(encoding, body=BODY):
+    header = "gzip" if encoding.startswith("gzip-") else encoding
+    return HTTPResponse(
+        io.BytesIO(encode(encoding, body)),
+        headers={"content-encoding": header},
+        preload_content=False,
+    )
+
+
+ENCODINGS = ["gzip", "gzip-members", "gzip-small-members", "deflate", "gzip, deflate"]
+
+
+class TestBoundedDecoding:
+    @pytest.mark.parametrize("encoding", ENCODINGS)
+    @pytest.mark.parametrize("amt", [1, 30, 4096, 65536])
+    def test_read_amt(self, encoding, amt):
+        r = response(encoding)
+        chunks = []
+        while True:
+            chunk = r.read(amt)
+            if not chunk:
+                break
+            assert len(chunk) <= amt
+            # The decoder output is bounded by what was asked for.
+            assert len(r._decoded_buffer) <= amt
+            chunks.append(chunk)
+        assert b"".join(chunks) == BODY
+
+    @pytest.mark.parametrize("encoding", ENCODINGS)
+    @pytest.mark.parametrize("size", [1, 30, 100, 8192])
+    def test_readinto(self, encoding, size):
+        r = response(encoding)
+        buffer = bytearray(size)
+        out = bytearray()
+        while True:
+            n = r.readinto(buffer)
+            if not n:
+                break
+            out += buffer[:n]
+        assert bytes(out) == BODY
+        assert not r._decoder_has_unconsumed_tail()
+
+    def test_readinto_across_gzip_members(self):
+        # The second member's header decodes to nothing, which is not EOF.
+        data = gzip.compress(b"abc" * 10) * 2
+        r = HTTPResponse(
+            io.BytesIO(data),
+            headers={"content-encoding": "gzip"},
+            preload_content=False,
+        )
+        buffer = bytearray(30)
+        assert r.readinto(buffer) == 30
+        assert r.readinto(buffer) == 30
+        assert bytes(buffer) == b"abc" * 10
+        assert r.readinto(buffer) == 0
+
+    @pytest.mark.parametrize("encoding", ENCODINGS)
+    @pytest.mark.parametrize("decode_in_thread", [False, True])
+    def test_stream(self, encoding, decode_in_thread):
+        r = response(encoding)
+        chunks = list(r.stream(4096, decode_in_thread=decode_in_thread))
+        assert all(0 < len(chunk) <= 4096 for chunk in chunks)
+        assert b"".join(chunks) == BODY
+
+    @pytest.mark.parametrize("encoding", ENCODINGS)
+    def test_read_all(self, encoding):
+        assert response(encoding).read() == BODY
@@ -1,6 +1,12 @@
 from __future__ import annotations
 
+import errno
+import itertools
+import os
+import selectors
 import socket
+import threading
+import time
 import typing
 
 from ..exceptions import LocationParseError
@@ -10,6 +16,31 @@ _TYPE_SOCKET_OPTIONS = list[tuple[int, int, typing.Union[int, bytes]]]
 
 if typing.TYPE_CHECKING:
     from .._base_connection import BaseHTTPConnection
+    from .resolver import Resolver
+
+_TYPE_ADDRINFO = tuple[
+    socket.AddressFamily,
+    socket.SocketKind,
+    int,
+    str,
+    typing.Union[tuple[str, int], tuple[str, int, int, int]],
+]
+
+#: Seconds to wait for a connection attempt before starting the next one in
+#: parallel, when a host resolves to several addresses ("Connection Attempt
+#: Delay" of RFC 8305, Happy Eyeballs). ``None`` tries the addresses one after
+#: the other, each for the whole connect timeout.
+HAPPY_EYEBALLS_DELAY: float | None = 0.25
+
+# Address family of the last successful connection to each host, which is
+# tried first the next time. Bounded, the oldest hosts are forgotten first.
+_FAMILY_PREFERENCE_SIZE = 1024
+_family_preference: dict[str, socket.AddressFamily] = {}
+_family_preference_lock = threading.Lock()
+
+_CONNECT_IN_PROGRESS = {errno.EINPROGRESS, errno.EWOULDBLOCK, errno.EAGAIN}
+if hasattr(errno, "WSAEWOULDBLOCK"):  # Platform-specific: Windows
+    _CONNECT_IN_PROGRESS.add(errno.WSAEWOULDBLOCK)
 
 
 def is_connection_dropped(conn: BaseHTTPConnection) -> bool:  # Platform-specific
@@ -29,6 +60,8 @@ def create_connection(
     timeout: _TYPE_TIMEOUT = _DEFAULT_TIMEOUT,
     source_address: tuple[str, int] | None = None,
     socket_options: _TYPE_SOCKET_OPTIONS | None = None,
+    resolver: Resolver | None = None,
+    _timing_hook: typing.Callable[[str, float], None] | None = None,
 ) -> socket.socket:
     """Connect to *address* and return the socket object.
 
@@ -40,6 +73,16 @@ def create_connection(
     is used.  If *source_address* is set it must be a tuple of (host, port)
     for the socket to bind as a source address before making the connection.
     An host of '' or port 0 tells the OS to use the default.
+    If *resolver* is set, it looks up *host* instead of
+    :func:`socket.getaddrinfo`.
+
+    When the host resolves to several addresses, they are tried alternating
+    between the address families, starting with the family that last
+    connected to that host, and a new attempt is started every
+    :data:`HAPPY_EYEBALLS_DELAY` seconds (or as soon as one fails) while the
+    previous ones are still pending. The first to connect wins, so an
+    unreachable IPv6 (or IPv4) address costs that delay rather than the
+    connect timeout. Each attempt gives up after *timeout* seconds.
     """
 
     host, port = address
@@ -57,7 +100,30 @@ def create_connection(
     except UnicodeError:
         raise LocationParseError(f"'{host}', label empty or too long") from None
 
-    for res in socket.getaddrinfo(host, port, family, socket.SOCK_STREAM):
+    if _timing_hook is not None:
+        start = time.perf_counter()
+    if resolver is not None:
+        addresses = resolver.getaddrinfo(host, port, family, socket.SOCK_STREAM)
+    else:
+        addresses = socket.getaddrinfo(host, port, family, socket.SOCK_STREAM)
+    if _timing_hook is not None:
+        resolved = time.perf_counter()
+        _timing_hook("dns", resolved - start)
+
+    if HAPPY_EYEBALLS_DELAY is not None and len(addresses) > 1:
+        sock = _happy_eyeballs_connect(
+            host,
+            _interleave_addresses(addresses, _family_preference.get(host)),
+            timeout,
+            source_address,
+            socket_options,
+            HAPPY_EYEBALLS_DELAY,
+        )
+        if _timing_hook is not None:
+            _timing_hook("connect", time.perf_counter() - resolved)
+        return sock
+
+    for res in addresses:
         af, socktype, proto, canonname, sa = res
         sock = None
         try:
@@ -71,6 +137,8 @@ def create_connection(
             if source_address:
                 sock.bind(source_address)
             sock.connect(sa)
+            if _timing_hook is not None:
+                _timing_hook("connect", time.perf_counter() - resolved)
             # Break explicitly a reference cycle
             err = None
             return sock
@@ -90,6 +158,145 @@ def create_connection(
         raise OSError("getaddrinfo returns an empty list")
 
 
+def _interleave_addresses(
+    addresses: list[_TYPE_ADDRINFO], preferred_family: socket.AddressFamily | None
+) -> list[_TYPE_ADDRINFO]:
+    """
+    Alternates the address families of ``addresses``, keeping the order of
+    ``getaddrinfo`` within each family and starting with ``preferred_family``
+    if given, else with the family of the first address (RFC 8305, 4).
+    """
+    by_family: dict[socket.AddressFamily, list[_TYPE_ADDRINFO]] = {}
+    if preferred_family is not None:
+        by_family[preferred_family] = []
+    for res in addresses:
+        by_family.setdefault(res[0], []).append(res)
+    return [
+        res
+        for group in itertools.zip_longest(*by_family.values())
+        for res in group
+        if res is not None
+    ]
+
+
+def _remember_family(host: str, family: socket.AddressFamily) -> None:
+    with _family_preference_lock:
+        _family_preference.pop(host, None)
+        _family_preference[host] = family
+        if len(_family_preference) > _FAMILY_PREFERENCE_SIZE:
+            del _family_preference[next(iter(_family_preference))]
+
+
+def _start_connect(
+    res: _TYPE_ADDRINFO,
+    source_address: tuple[str, int] | None,
+    socket_options: _TYPE_SOCKET_OPTIONS | None,
+) -> socket.socket:
+    """Returns a non-blocking socket connecting to the address of ``res``."""
+    af, socktype, proto, canonname, sa = res
+    sock = socket.socket(af, socktype, proto)
+    try:
+        _set_socket_options(sock, socket_options)
+        if source_address:
+            sock.bind(source_address)
+        sock.setblocking(False)
+        code = sock.connect_ex(sa)
+        if code and code not in _CONNECT_IN_PROGRESS:
+            raise OSError(code, os.strerror(code))
+    except OSError:
+        sock.close()
+        raise
+    return sock
+
+
+def _happy_eyeballs_connect(
+    host: str,
+    addresses: list[_TYPE_ADDRINFO],
+    timeout: _TYPE_TIMEOUT,
+    source_address: tuple[str, int] | None,
+    socket_options: _TYPE_SOCKET_OPTIONS | None,
+    delay: float,
+) -> socket.socket:
+    """
+    Races non-blocking connections to ``addresses``, starting them ``delay``
+    seconds apart (or as soon as the previous ones have failed), and returns
+    the first connected socket, closing the others.
+    """
+    if timeout is _DEFAULT_TIMEOUT:
+        timeout = socket.getdefaulttimeout()
+    attempt_timeout = typing.cast(typing.Optional[float], timeout)
+
+    pending = iter(addresses)
+    # Socket -> deadline of the attempt.
+    attempts: dict[socket.socket, float | None] = {}
+    err: Exception | None = None
+    next_start = time.monotonic()
+
+    with selectors.DefaultSelector() as selector:
+        try:
+            while True:
+                now = time.monotonic()
+                if pending is not None and (now >= next_start or not attempts):
+                    res = next(pending, None)
+                    if res is None:
+                        pending = None
+                    else:
+                        try:
+                            sock = _start_connect(res, source_address, socket_options)
+                        except OSError as e:
+                            err = e
+                            continue
+                        attempts[sock] = (
+                            None if attempt_timeout is None else now + attempt_timeout
+                        )
+                        selector.register(sock, selectors.EVENT_WRITE)
+                        next_start = now + delay
+
+                if not attempts:
+                    if pending is None:
+                        break
+                    continue
+
+                deadlines = [d for d in attempts.values() if d is not None]
+                if pending is not None:
+                    deadlines.append(next_start)
+                wait = max(min(deadlines) - now, 0) if deadlines else None
+
+                for key, _ in selector.select(wait):
+                    sock = key.fileobj  # type: ignore[assignment]
+                    selector.unregister(sock)
+                    del attempts[sock]
+                    code = sock.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR)
+                    if code:
+                        err = OSError(code, os.strerror(code))
+                        sock.close()
+                        # Start the next attempt right away.
+                        next_start = 0
+                        continue
+                    sock.settimeout(attempt_timeout)
+                    _remember_family(host, sock.family)
+                    return sock
+
+                now = time.monotonic()
+                for sock, deadline in list(attempts.items()):
+                    if deadline is not None and now >= deadline:
+                        selector.unregister(sock)
+                        del attempts[sock]
+                        sock.close()
+                        err = socket.timeout("timed out")
+        finally:
+            for sock in attempts:
+                sock.close()
+
+    if err is not None:
+        try:
+            raise err
+        finally:
+            # Break explicitly a reference cycle
+            err = None
+    raise OSError("getaddrinfo returns an empty list")
+
+
 def _set_socket_options(
     sock: socket.socket, options: _TYPE_SOCKET_OPTIONS | None
 ) -> None:
@@ -0,0 +1,276 @@
+from __future__ import annotations
+
+import collections
+import socket
+import threading
+import time
+import typing
+
+from .connection import _TYPE_ADDRINFO
+
+__all__ = ["Resolver", "SystemResolver", "CachingResolver", "StaticResolver"]
+
+
+class Resolver:
+    """
+    Resolves the host names of new connections in place of
+    :func:`socket.getaddrinfo`. Pass one as ``resolver`` to a
+    :class:`~urllib3.PoolManager` or a connection pool, e.g.
+    ``PoolManager(resolver=CachingResolver())``, and it is used by all of
+    their connections.
+
+    Subclasses implement :meth:`getaddrinfo`, which may be called from
+    several threads at once.
+    """
+
+    def getaddrinfo(
+        self,
+        host: str,
+        port: int,
+        family: socket.AddressFamily,
+        type: socket.SocketKind,
+    ) -> list[_TYPE_ADDRINFO]:
+        """
+        Same as :func:`socket.getaddrinfo` with these arguments: returns the
+        addresses of ``host`` or raises :class:`socket.gaierror`.
+        """
+        raise NotImplementedError()
+
+
+class SystemResolver(Resolver):
+    """Uses :func:`socket.getaddrinfo`, like connections without a resolver."""
+
+    def getaddrinfo(
+        self,
+        host: str,
+        port: int,
+        family: socket.AddressFamily,
+        type: socket.SocketKind,
+    ) -> list[_TYPE_ADDRINFO]:
+        return socket.getaddrinfo(host, port, family, type)
+
+
+class _CacheEntry:
+    __slots__ = ("addresses", "error", "expires", "refresh_at", "refreshing")
+
+    def __init__(
+        self,
+        addresses: list[_TYPE_ADDRINFO] | None,
+        error: socket.gaierror | None,
+        expires: float,
+        refresh_at: float,
+    ) -> None:
+        self.addresses = addresses
+        self.error = error
+        self.expires = expires
+        self.refresh_at = refresh_at
+        self.refreshing = False
+
+
+class CachingResolver(Resolver):
+    """
+    Caches the results of another resolver (by default, the system's) in
+    memory, shared by all the threads and pools using it.
+
+    :param resolver:
+        The resolver looked up on a cache miss. Defaults to
+        :class:`SystemResolver`.
+
+    :param ttl:
+        Seconds an answer is reused for. :func:`socket.getaddrinfo` does not
+        tell the TTL of the DNS records, so this applies to every host.
+
+    :param negative_ttl:
+        Seconds a failed lookup (:class:`socket.gaierror`) is remembered for,
+        raising the same error without asking again. ``0`` to not cache
+        failures.
+
+    :param max_entries:
+        Number of answers to keep, the least recently used ones are dropped
+        first.
+
+    :param refresh_ahead:
+        Fraction of ``ttl`` after which using an answer starts looking it up
+        again in a background thread, so that hosts in use are not blocked on
+        a lookup when their entry expires. ``None`` to only look up expired
+        entries.
+
+    Concurrent misses for the same host wait for a single lookup.
+    """
+
+    def __init__(
+        self,
+        resolver: Resolver | None = None,
+        ttl: float = 60.0,
+        negative_ttl: float = 5.0,
+        max_entries: int = 1024,
+        refresh_ahead: float | None = 0.8,
+    ) -> None:
+        self.resolver = resolver if resolver is not None else SystemResolver()
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.max_entries = max_entries
+        self.refresh_ahead = refresh_ahead
+
+        #: Number of lookups answered from the cache, and passed on to
+        #: ``resolver``.
+        self.hits = 0
+        self.misses = 0
+
+        self._lock = threading.Lock()
+        self._entries: collections.OrderedDict[
+            tuple[str, int, int, int], _CacheEntry
+        ] = collections.OrderedDict()
+        self._in_flight: dict[tuple[str, int, int, int], threading.Event] = {}
+
+    def getaddrinfo(
+        self,
+        host: str,
+        port: int,
+        family: socket.AddressFamily,
+        type: socket.SocketKind,
+    ) -> list[_TYPE_ADDRINFO]:
+        key = (host, port, family, type)
+        while True:
+            with self._lock:
+                entry = self._entries.get(key)
+                now = time.monotonic()
+                if entry is not None and now < entry.expires:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    if entry.refresh_at <= now and not entry.refreshing:
+                        entry.refreshing = True
+                        threading.Thread(
+                            target=self._refresh,
+                            args=(key,),
+                            name=f"urllib3 resolver refresh {host}",
+                            daemon=True,
+                        ).start()
+                    break
+                in_flight = self._in_flight.get(key)
+                if in_flight is None:
+                    self._in_flight[key] = threading.Event()
+                    self.misses += 1
+            if in_flight is None:
+                entry = self._lookup(key)
+                break
+            # Another thread is looking the host up, then check its answer.
+            in_flight.wait()
+
+        if entry.error is not None:
+            raise socket.gaierror(*entry.error.args)
+        return list(entry.addresses)  # type: ignore[arg-type]
+
+    def _lookup(self, key: tuple[str, int, int, int]) -> _CacheEntry:
+        try:
+            try:
+                addresses = self.resolver.getaddrinfo(*key)  # type: ignore[arg-type]
+            except socket.gaierror as e:
+                expires = time.monotonic() + self.negative_ttl
+                entry = _CacheEntry(None, e, expires, refresh_at=expires)
+            else:
+                entry = self._new_entry(addresses)
+            self._store(key, entry)
+            return entry
+        finally:
+            with self._lock:
+                self._in_flight.pop(key).set()
+
+    def _refresh(self, key: tuple[str, int, int, int]) -> None:
+        try:
+            addresses = self.resolver.getaddrinfo(*key)  # type: ignore[arg-type]
+        except OSError:
+            # Keep the current answer until it expires.
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None:
+                    entry.refresh_at = entry.expires
+                    entry.refreshing = False
+        else:
+            self._store(key, self._new_entry(addresses))
+
+    def _new_entry(self, addresses: list[_TYPE_ADDRINFO]) -> _CacheEntry:
+        now = time.monotonic()
+        refresh_at = now + self.ttl
+        if self.refresh_ahead is not None:
+            refresh_at = now + self.ttl * self.refresh_ahead
+        return _CacheEntry(addresses, None, now + self.ttl, refresh_at)
+
+    def _store(self, key: tuple[str, int, int, int], entry: _CacheEntry) -> None:
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, host: str) -> None:
+        """Forget the cached answers for ``host``."""
+        with self._lock:
+            for key in [key for key in self._entries if key[0] == host]:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        """Forget all the cached answers."""
+        with self._lock:
+            self._entries.clear()
+
+
+class StaticResolver(Resolver):
+    """
+    Answers from a fixed map of host names to IP addresses, like a hosts
+    file, e.g. to point a host at a local test server:
+
+    .. code-block:: python
+
+        http = urllib3.PoolManager(
+            resolver=StaticResolver({"api.example.com": "127.0.0.1"})
+        )
+
+    :param hosts:
+        Maps host names (case-insensitive) to an IP address or a list of
+        them.
+
+    :param fallback:
+        Resolver of the hosts missing from the map. Without one, they fail
+        to resolve.
+    """
+
+    def __init__(
+        self,
+        hosts: typing.Mapping[str, str | typing.Sequence[str]],
+        fallback: Resolver | None = None,
+    ) -> None:
+        self.hosts = {
+            host.lower(): [ips] if isinstance(ips, str) else list(ips)
+            for host, ips in hosts.items()
+        }
+        self.fallback = fallback
+
+    def getaddrinfo(
+        self,
+        host: str,
+        port: int,
+        family: socket.AddressFamily,
+        type: socket.SocketKind,
+    ) -> list[_TYPE_ADDRINFO]:
+        ips = self.hosts.get(host.lower())
+        if ips is None:
+            if self.fallback is not None:
+                return self.fallback.getaddrinfo(host, port, family, type)
+            raise socket.gaierror(socket.EAI_NONAME, "Name or service not known")
+
+        addresses: list[_TYPE_ADDRINFO] = []
+        for ip in ips:
+            sockaddr: tuple[str, int] | tuple[str, int, int, int]
+            if ":" in ip:
+                af, sockaddr = socket.AF_INET6, (ip, port, 0, 0)
+            else:
+                af, sockaddr = socket.AF_INET, (ip, port)
+            if family in (socket.AF_UNSPEC, af):
+                addresses.append((af, type, socket.IPPROTO_TCP, "", sockaddr))
+        if not addresses:
+            raise socket.gaierror(
+                getattr(socket, "EAI_ADDRFAMILY", socket.EAI_NONAME),
+                "Address family for hostname not supported",
+            )
+        return addresses
@@ -467,6 +467,7 @@ class Retry:
                 raise reraise(type(error), error, _stacktrace)
             elif connect is not None:
                 connect -= 1
+            kind = "connect"
 
         elif error and self._is_read_error(error):
             # Read retry?
@@ -474,16 +475,19 @@ class Retry:
                 raise reraise(type(error), error, _stacktrace)
             elif read is not None:
                 read -= 1
+            kind = "read"
 
         elif error:
             # Other retry?
             if other is not None:
                 other -= 1
+            kind = "other"
 
         elif response and response.get_redirect_location():
             # Redirect retry?
             if redirect is not None:
                 redirect -= 1
+            kind = "redirect"
             cause = "too many redirects"
             response_redirect_location = response.get_redirect_location()
             if response_redirect_location:
@@ -493,6 +497,7 @@ class Retry:
         else:
             # Incrementing because of a server error like a 500 in
             # status_forcelist and the given method is in the allowed_methods
+            kind = "status"
             cause = ResponseError.GENERIC_ERROR
             if response and response.status:
                 if status_count is not None:
@@ -520,6 +525,10 @@ class Retry:
 
         log.debug("Incremented Retry for (url='%s'): %r", url, new_retry)
 
+        instrument = getattr(_pool, "instrument", None)
+        if instrument is not None:
+            instrument.count(_pool._instrument_host, f"retries.{kind}")  # type: ignore[union-attr]
+
         return new_retry
 
     def __repr__(self) -> str:
@@ -386,6 +386,7 @@ def ssl_wrap_socket(
     key_password: str | None = ...,
     ca_cert_data: None | str | bytes = ...,
     tls_in_tls: typing.Literal[False] = ...,
+    tls_session: ssl.SSLSession | None = ...,
 ) -> ssl.SSLSocket: ...
 
 
@@ -404,6 +405,7 @@ def ssl_wrap_socket(
     key_password: str | None = ...,
     ca_cert_data: None | str | bytes = ...,
     tls_in_tls: bool = ...,
+    tls_session: ssl.SSLSession | None = ...,
 ) -> ssl.SSLSocket | SSLTransportType: ...
 
 
@@ -421,6 +423,7 @@ def ssl_wrap_socket(
     key_password: str | None = None,
     ca_cert_data: None | str | bytes = None,
     tls_in_tls: bool = False,
+    tls_session: ssl.SSLSession | None = None,
 ) -> ssl.SSLSocket | SSLTransportType:
     """
     All arguments except for server_hostname, ssl_context, tls_in_tls, ca_cert_data and
@@ -446,6 +449,10 @@ def ssl_wrap_socket(
         passing as the cadata parameter to SSLContext.load_verify_locations()
     :param tls_in_tls:
         Use SSLTransport to wrap the existing socket.
+    :param tls_session:
+        A :class:`ssl.SSLSession` of an earlier connection made with the same
+        context, to resume instead of doing a full handshake. Not supported
+        with ``tls_in_tls``.
     """
     context = ssl_context
     if context is None:
@@ -463,6 +470,22 @@ def ssl_wrap_socket(
         # try to load OS default certs; works well on Windows.
         context.load_default_certs()
 
+    _load_cert_chain(context, certfile, keyfile, key_password)
+
+    context.set_alpn_protocols(ALPN_PROTOCOLS)
+
+    ssl_sock = _ssl_wrap_socket_impl(
+        sock, context, tls_in_tls, server_hostname, tls_session
+    )
+    return ssl_sock
+
+
+def _load_cert_chain(
+    context: ssl.SSLContext,
+    certfile: str | None,
+    keyfile: str | None,
+    key_password: str | None,
+) -> None:
     # Attempt to detect if we get the goofy behavior of the
     # keyfile being encrypted and OpenSSL asking for the
     # passphrase via the terminal and instead error out.
@@ -475,11 +498,6 @@ def ssl_wrap_socket(
         else:
             context.load_cert_chain(certfile, keyfile, key_password)
 
-    context.set_alpn_protocols(ALPN_PROTOCOLS)
-
-    ssl_sock = _ssl_wrap_socket_impl(sock, context, tls_in_tls, server_hostname)
-    return ssl_sock
-
 
 def is_ipaddress(hostname: str | bytes) -> bool:
     """Detects whether the hostname given is an IPv4 or IPv6 address.
@@ -510,6 +528,7 @@ def _ssl_wrap_socket_impl(
     ssl_context: ssl.SSLContext,
     tls_in_tls: bool,
     server_hostname: str | None = None,
+    tls_session: ssl.SSLSession | None = None,
 ) -> ssl.SSLSocket | SSLTransportType:
     if tls_in_tls:
         if not SSLTransport:
@@ -521,4 +540,8 @@ def _ssl_wrap_socket_impl(
         SSLTransport._validate_ssl_context_for_tls_in_tls(ssl_context)
         return SSLTransport(sock, ssl_context, server_hostname)
 
+    if tls_session is not None:
+        return ssl_context.wrap_socket(
+            sock, server_hostname=server_hostname, session=tls_session
+        )
     return ssl_context.wrap_socket(sock, server_hostname=server_hostname)
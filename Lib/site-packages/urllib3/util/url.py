@@ -1,11 +1,16 @@
 from __future__ import annotations
 
+import functools
 import re
 import typing
 
 from ..exceptions import LocationParseError
 from .util import to_str
 
+#: Number of URLs (and request targets) whose parsing is memoized by
+#: :func:`parse_url`, the least recently used being dropped first.
+URL_CACHE_SIZE = 1024
+
 # We only want to normalize urls with an HTTP(S) scheme.
 # urllib3 infers URLs without a scheme (None) to be http.
 _NORMALIZABLE_SCHEMES = ("http", "https", None)
@@ -346,6 +351,7 @@ def _idna_encode(name: str) -> bytes:
     return name.lower().encode("ascii")
 
 
+@functools.lru_cache(maxsize=URL_CACHE_SIZE)
 def _encode_target(target: str) -> str:
     """Percent-encodes a request target so that there are no invalid characters
 
@@ -391,7 +397,17 @@ def parse_url(url: str) -> Url:
 
         print( urllib3.util.parse_url('/foo?bar'))
         # Url(scheme=None, host=None, port=None, path='/foo', query='bar', ...)
+
+    The results are kept in a bounded LRU cache shared by all the callers,
+    so that the layers handling the same URL (and the URLs requested again
+    and again) only parse it once. :class:`.Url` is immutable, which makes
+    this safe.
     """
+    return _parse_url(url)
+
+
+@functools.lru_cache(maxsize=URL_CACHE_SIZE)
+def _parse_url(url: str) -> Url:
     if not url:
         # Empty
         return Url()